@@ -0,0 +1,245 @@
+# benchmarks/mock_gateway.py
+"""A tiny local stand-in for Discord's REST API and gateway, for exercising cluster mode and cache policies.
+
+It serves just enough for discord.py to log in, shard and become ready:
+`/gateway/bot`, the current user and application, command sync, and a
+gateway that answers IDENTIFY with READY plus GUILD_CREATE for `--guilds`
+guilds spread over the shards. Each guild has `--members` members, handed
+out in GUILD_MEMBERS_CHUNK events when the bot asks for them. After
+`--ping-after` seconds it posts `--messages` chat messages from random
+members in every guild, then `--command` (default `!ping`) in one guild per
+shard, and prints what the bot replies. Run it, then point the bot at it
+from another terminal:
+
+    python -m benchmarks.mock_gateway --shards 4 --guilds 200
+    python -m benchmarks.mock_gateway --shards 1 --guilds 20 --members 20000 --messages 2000 --command '!memory'
+    export DISCORD_API_BASE=http://127.0.0.1:8765/api/v10 DISCORD_GATEWAY_URL=ws://127.0.0.1:8765/gateway
+    TOKEN=mock python cluster.py --clusters 2
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+from datetime import datetime, timezone
+
+from aiohttp import WSMsgType, web
+
+BOT_USER = {"id": "1000", "username": "StarBot", "discriminator": "0", "avatar": None, "bot": True}
+HUMAN = {"id": "2000", "username": "tester", "discriminator": "0", "avatar": None}
+CHUNK_SIZE = 1000  # members per GUILD_MEMBERS_CHUNK, as Discord sends them
+MEMBER_ID_BASE = 5 * 10 ** 17  # snowflake-sized, so converters accept them
+APPLICATION = {
+    "id": "1000", "name": "StarBot", "description": "", "icon": None, "bot_public": True,
+    "bot_require_code_grant": False, "owner": HUMAN, "verify_key": "0", "flags": 0
+}
+
+
+def reply(data, status: int = 200) -> web.Response:
+    # discord.py only parses JSON when Content-Type is exactly application/json (no charset)
+    return web.Response(body=json.dumps(data).encode(), status=status, headers={"Content-Type": "application/json"})
+
+
+def now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def member(user: dict = None) -> dict:
+    data = {"roles": [], "joined_at": now(), "deaf": False, "mute": False, "flags": 0}
+    if user:
+        data["user"] = user
+    return data
+
+
+def guild_ids(shard_id: int, shard_count: int, guilds: int) -> list:
+    """IDs whose `(id >> 22) % shard_count` routes them to `shard_id`, as Discord's are"""
+    return [((number + shard_count) << 22) | 1 for number in range(shard_id, guilds, shard_count)]
+
+
+def user(number: int) -> dict:
+    return {"id": str(MEMBER_ID_BASE + number), "username": f"member{number}", "discriminator": "0", "avatar": None}
+
+
+def guild_payload(guild_id: int, members: int) -> dict:
+    channel_id = guild_id + 1
+    return {
+        "id": str(guild_id), "name": f"Guild {guild_id >> 22}", "icon": None, "owner_id": HUMAN["id"],
+        "unavailable": False, "member_count": members + 2, "large": members > 0, "features": [], "emojis": [], "stickers": [],
+        "verification_level": 0, "default_message_notifications": 0, "explicit_content_filter": 0,
+        "mfa_level": 0, "premium_tier": 0, "preferred_locale": "en-US", "nsfw_level": 0,
+        "roles": [{
+            "id": str(guild_id), "name": "@everyone", "permissions": "8", "position": 0, "color": 0,
+            "hoist": False, "managed": False, "mentionable": False
+        }],
+        "channels": [{
+            "id": str(channel_id), "type": 0, "name": "general", "position": 0,
+            "permission_overwrites": [], "guild_id": str(guild_id)
+        }],
+        "members": [member(BOT_USER), member(HUMAN)],
+        "voice_states": [], "presences": [], "threads": [], "stage_instances": [], "guild_scheduled_events": []
+    }
+
+
+class MockDiscord:
+    def __init__(self, host: str, port: int, shard_count: int, guilds: int, heartbeat_ms: int, members: int = 0):
+        self.host = host
+        self.port = port
+        self.shard_count = shard_count
+        self.guilds = guilds
+        self.members = members
+        self.heartbeat_ms = heartbeat_ms
+        self.sockets = {}   # shard id -> (websocket, sequence counter)
+        self.ids = itertools.count(10 ** 17)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        api = "/api/v10"
+        app.router.add_get(f"{api}/users/@me", lambda _: reply(BOT_USER))
+        app.router.add_get(f"{api}/oauth2/applications/@me", lambda _: reply(APPLICATION))
+        app.router.add_get(f"{api}/gateway/bot", self.gateway_bot)
+        app.router.add_put(f"{api}/applications/{{app_id}}/commands", lambda _: reply([]))
+        app.router.add_post(f"{api}/channels/{{channel_id}}/messages", self.create_message)
+        app.router.add_patch(f"{api}/channels/{{channel_id}}/messages/{{message_id}}", self.create_message)
+        app.router.add_get(f"{api}/guilds/{{guild_id}}/members/{{user_id}}", self.get_member)
+        app.router.add_delete(f"{api}/guilds/{{guild_id}}/members/{{user_id}}", self.kick_member)
+        app.router.add_get("/gateway", self.gateway)
+        return app
+
+    async def gateway_bot(self, request):
+        return reply({
+            "url": f"ws://{self.host}:{self.port}/gateway",
+            "shards": self.shard_count,
+            "session_start_limit": {
+                "total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": self.shard_count
+            }
+        })
+
+    async def create_message(self, request):
+        body = await request.json()
+        channel_id = request.match_info["channel_id"]
+        if body.get("content"):
+            print(f"💬 #{channel_id}: {body['content']}")
+        for embed in body.get("embeds") or []:
+            print(f"💬 #{channel_id}: {embed.get('title')} – {embed.get('description')}")
+            for field in embed.get("fields", []):
+                print(f"     {field['name']}: {field['value']!r}")
+        return reply({
+            "id": request.match_info.get("message_id") or str(next(self.ids)), "channel_id": channel_id, "author": BOT_USER,
+            "content": body.get("content") or "", "timestamp": now(), "edited_timestamp": None, "tts": False,
+            "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [],
+            "embeds": body.get("embeds") or [], "pinned": False, "type": 0
+        })
+
+    async def get_member(self, request):
+        number = int(request.match_info["user_id"]) - MEMBER_ID_BASE
+        if not 0 <= number < self.members:
+            return reply({"message": "Unknown Member", "code": 10007}, status=404)
+        return reply(member(user(number)))
+
+    async def kick_member(self, request):
+        number = int(request.match_info["user_id"]) - MEMBER_ID_BASE
+        if not 0 <= number < self.members:
+            return reply({"message": "Unknown Member", "code": 10007}, status=404)
+        return web.Response(status=204)
+
+    async def send_chunks(self, shard_id: int, request: dict):
+        """Answer REQUEST_GUILD_MEMBERS with the whole member list, as for an empty query"""
+        guild_id, nonce = request["guild_id"], request.get("nonce")
+        everyone = [member(BOT_USER), member(HUMAN), *(member(user(number)) for number in range(self.members))]
+        chunks = [everyone[start:start + CHUNK_SIZE] for start in range(0, len(everyone), CHUNK_SIZE)]
+        for index, chunk in enumerate(chunks):
+            await self.dispatch(shard_id, "GUILD_MEMBERS_CHUNK", {
+                "guild_id": guild_id, "members": chunk, "chunk_index": index, "chunk_count": len(chunks),
+                "nonce": nonce
+            })
+
+    async def dispatch(self, shard_id: int, event: str, data: dict):
+        ws, sequence = self.sockets[shard_id]
+        await ws.send_str(json.dumps({"op": 0, "t": event, "s": next(sequence), "d": data}))
+
+    async def gateway(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_str(json.dumps({"op": 10, "d": {"heartbeat_interval": self.heartbeat_ms}}))
+        shard_id = None
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            payload = json.loads(message.data)
+            if payload["op"] == 1:  # heartbeat
+                await ws.send_str(json.dumps({"op": 11}))
+            elif payload["op"] == 2:  # identify
+                shard_id, shard_count = payload["d"].get("shard", [0, 1])
+                self.sockets[shard_id] = (ws, itertools.count(1))
+                ids = guild_ids(shard_id, shard_count, self.guilds)
+                print(f"🔌 Shard {shard_id}/{shard_count} identified ({len(ids)} guilds)")
+                await self.dispatch(shard_id, "READY", {
+                    "v": 10, "user": BOT_USER, "session_id": f"session-{shard_id}",
+                    "resume_gateway_url": f"ws://{self.host}:{self.port}/gateway",
+                    "guilds": [{"id": str(guild_id), "unavailable": True} for guild_id in ids],
+                    "shard": [shard_id, shard_count], "application": {"id": APPLICATION["id"], "flags": 0}
+                })
+                for guild_id in ids:
+                    await self.dispatch(shard_id, "GUILD_CREATE", guild_payload(guild_id, self.members))
+            elif payload["op"] == 8:  # request guild members
+                await self.send_chunks(shard_id, payload["d"])
+        if shard_id is not None and self.sockets.get(shard_id, (None,))[0] is ws:
+            del self.sockets[shard_id]
+        return ws
+
+    async def send_message(self, shard_id: int, guild_id: int, author: dict, content: str):
+        await self.dispatch(shard_id, "MESSAGE_CREATE", {
+            "id": str(next(self.ids)), "channel_id": str(guild_id + 1), "guild_id": str(guild_id),
+            "author": author, "member": member(),
+            "content": content, "timestamp": now(), "edited_timestamp": None, "tts": False,
+            "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [],
+            "embeds": [], "pinned": False, "type": 0
+        })
+
+    async def send_chatter(self, messages: int):
+        """`messages` messages from random members in every guild"""
+        if not messages or not self.members:
+            return
+        for shard_id in sorted(self.sockets):
+            for guild_id in guild_ids(shard_id, self.shard_count, self.guilds):
+                for _ in range(messages):
+                    await self.send_message(shard_id, guild_id, user(random.randrange(self.members)), "hello")
+        print(f"💬 Sent {messages} messages in each of {self.guilds} guilds")
+
+    async def send_pings(self, command: str = "!ping"):
+        for shard_id in sorted(self.sockets):
+            guild_id = guild_ids(shard_id, self.shard_count, self.guilds)[0]
+            print(f"➡️ {command} in guild {guild_id} (shard {shard_id})")
+            await self.send_message(shard_id, guild_id, HUMAN, command)
+            await asyncio.sleep(0.5)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--guilds", type=int, default=200)
+    parser.add_argument("--members", type=int, default=0, help="members per guild besides the bot and the tester")
+    parser.add_argument("--messages", type=int, default=0, help="chat messages per guild before the command")
+    parser.add_argument("--command", default="!ping", help="command sent in one guild per shard")
+    parser.add_argument("--heartbeat", type=int, default=2000, help="heartbeat interval in ms")
+    parser.add_argument("--ping-after", type=float, default=15.0, help="seconds to wait before sending !ping")
+    args = parser.parse_args()
+
+    mock = MockDiscord(args.host, args.port, args.shards, args.guilds, args.heartbeat, args.members)
+    runner = web.AppRunner(mock.app())
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    print(f"🧪 Mock Discord on http://{args.host}:{args.port}/api/v10 ({args.shards} shards, {args.guilds} guilds)")
+    try:
+        await asyncio.sleep(args.ping_after)
+        await mock.send_chatter(args.messages)
+        await mock.send_pings(args.command)
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
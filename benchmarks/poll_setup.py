@@ -0,0 +1,91 @@
+# benchmarks/poll_setup.py
+"""Time-to-votable for !poll with 2 vs 10 options, against a simulated Discord.
+
+Discord isn't contacted: each request costs one simulated round trip and
+reaction adds share a token bucket shaped like Discord's per-channel
+reaction bucket. Run from the repo root:
+
+    python -m benchmarks.poll_setup [--rtt 0.12] [--bucket 4] [--reset 1.0]
+"""
+import argparse
+import asyncio
+import time
+
+from cogs.utility import Utility
+from utils.polls import POLL_EMOJIS
+
+
+class SimulatedBucket:
+    """`limit` requests per `reset` seconds; callers wait like discord.py's route limiter does"""
+
+    def __init__(self, limit: int, reset: float):
+        self.limit = limit
+        self.reset = reset
+        self.remaining = limit
+        self.window_start = time.perf_counter()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            now = time.perf_counter()
+            if now - self.window_start >= self.reset:
+                self.window_start, self.remaining = now, self.limit
+            if self.remaining == 0:
+                await asyncio.sleep(self.window_start + self.reset - now)
+                self.window_start, self.remaining = time.perf_counter(), self.limit
+            self.remaining -= 1
+
+
+class SimulatedMessage:
+    id = 1
+
+    def __init__(self, rtt: float, bucket: SimulatedBucket):
+        self.rtt = rtt
+        self.bucket = bucket
+        self.reactions = []
+
+    async def add_reaction(self, emoji):
+        await self.bucket.acquire()
+        await asyncio.sleep(self.rtt)
+        self.reactions.append(emoji)
+
+
+async def sequential(message, emojis):
+    for emoji in emojis:
+        await message.add_reaction(emoji)
+
+
+async def measure(mode: str, options: int, args) -> float:
+    cog = Utility.__new__(Utility)
+    cog.poll_seed_spacing = args.spacing
+    message = SimulatedMessage(args.rtt, SimulatedBucket(args.bucket, args.reset))
+    emojis = POLL_EMOJIS[:options]
+
+    start = time.perf_counter()
+    await asyncio.sleep(args.rtt)  # Sending the poll message itself
+    if mode == "sequential":
+        await sequential(message, emojis)
+    elif mode == "pipelined":
+        await cog.seed_reactions(message, emojis)
+    # buttons / native: votable as soon as the message exists
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt", type=float, default=0.12, help="simulated round trip (s)")
+    parser.add_argument("--bucket", type=int, default=4, help="reaction requests per bucket window")
+    parser.add_argument("--reset", type=float, default=1.0, help="reaction bucket window (s)")
+    parser.add_argument("--spacing", type=float, default=0.05, help="gap between pipelined requests (s)")
+    args = parser.parse_args()
+
+    print(f"RTT {args.rtt * 1000:.0f}ms, reaction bucket {args.bucket}/{args.reset}s")
+    print(f"{'mode':<12}{'2 options':>12}{'10 options':>12}")
+    for mode in ("sequential", "pipelined", "buttons", "native"):
+        two = await measure(mode, 2, args)
+        ten = await measure(mode, 10, args)
+        print(f"{mode:<12}{two * 1000:>10.0f}ms{ten * 1000:>10.0f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""Run the bot as several worker processes, each owning a contiguous range of shards.
+
+    python cluster.py --clusters 4            # shard count recommended by Discord
+    python cluster.py --clusters 4 --shards 16
+
+Each worker is a normal `main.py` started with CLUSTER_ID, CLUSTER_COUNT,
+SHARD_IDS and SHARD_COUNT set; workers that exit unexpectedly are restarted
+with backoff. Workers share the SQLite stores and JSON config files in the
+working directory (see utils/cluster.py).
+"""
+import argparse
+import asyncio
+import os
+import signal
+import sys
+
+import aiohttp
+from dotenv import load_dotenv
+
+load_dotenv()
+
+API_BASE = (os.getenv("DISCORD_API_BASE") or "https://discord.com/api/v10").rstrip("/")
+
+
+async def recommended_shards(token: str) -> int:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{API_BASE}/gateway/bot", headers={"Authorization": f"Bot {token}"}) as response:
+            response.raise_for_status()
+            return (await response.json())["shards"]
+
+
+def shard_ranges(shard_count: int, clusters: int) -> list:
+    """Split shards 0..shard_count-1 into `clusters` contiguous, near-equal ranges"""
+    size, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for cluster_id in range(clusters):
+        end = start + size + (cluster_id < extra)
+        ranges.append(range(start, end))
+        start = end
+    return ranges
+
+
+class Launcher:
+    def __init__(self, shard_count: int, clusters: int, *, max_backoff: float = 60.0):
+        self.shard_count = shard_count
+        self.ranges = shard_ranges(shard_count, clusters)
+        self.max_backoff = max_backoff
+        self.processes = {}   # cluster id -> asyncio subprocess
+        self.stopping = False
+
+    def _env(self, cluster_id: int) -> dict:
+        shards = self.ranges[cluster_id]
+        return {
+            **os.environ,
+            "CLUSTER_ID": str(cluster_id),
+            "CLUSTER_COUNT": str(len(self.ranges)),
+            "SHARD_IDS": f"{shards.start}-{shards.stop - 1}",
+            "SHARD_COUNT": str(self.shard_count)
+        }
+
+    async def _supervise(self, cluster_id: int):
+        backoff = 1.0
+        while not self.stopping:
+            shards = self.ranges[cluster_id]
+            print(f"🚀 Starting cluster {cluster_id} (shards {shards.start}-{shards.stop - 1})")
+            process = self.processes[cluster_id] = await asyncio.create_subprocess_exec(
+                sys.executable, "main.py", env=self._env(cluster_id)
+            )
+            started = asyncio.get_running_loop().time()
+            code = await process.wait()
+            if self.stopping or code == 0:
+                return  # shut down on purpose (or gave up, e.g. on a bad token)
+            if asyncio.get_running_loop().time() - started > 5 * self.max_backoff:
+                backoff = 1.0  # it ran for a good while; this is a fresh failure, not a crash loop
+            print(f"⚠️ Cluster {cluster_id} exited with code {code}; restarting in {backoff:.0f}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def stop(self):
+        self.stopping = True
+        for process in self.processes.values():
+            if process.returncode is None:
+                process.send_signal(signal.SIGINT)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop)
+        await asyncio.gather(*(self._supervise(cluster_id) for cluster_id in range(len(self.ranges))))
+        await asyncio.gather(*(process.wait() for process in self.processes.values()))
+        print("🛑 All clusters stopped")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run StarBot as several sharded worker processes")
+    parser.add_argument("--clusters", type=int, default=int(os.getenv("CLUSTER_COUNT", 2)))
+    parser.add_argument("--shards", type=int, default=int(os.getenv("SHARD_COUNT", 0)) or None,
+                        help="total shard count (default: Discord's recommendation)")
+    args = parser.parse_args()
+
+    shard_count = args.shards
+    if shard_count is None:
+        token = os.getenv("DISCORD_BOT_TOKEN") or os.getenv("TOKEN")
+        if not token:
+            raise SystemExit("No token found in environment variables!")
+        shard_count = await recommended_shards(token)
+    clusters = max(1, min(args.clusters, shard_count))
+    print(f"🧩 {shard_count} shards across {clusters} clusters")
+    await Launcher(shard_count, clusters).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,68 @@
 # cogs/football.py
+import asyncio
 import os
-import aiohttp
+import time
 import discord
 from discord.ext import commands
 from datetime import datetime
 
+from utils.cache import ResponseCache
+from utils.cluster import CLUSTER
+from utils.competitions import CompetitionStore
+from utils.embeds import build_embeds, message_groups, paginated_fields
+from utils.http import HTTPClient
+from utils.scheduler import BACKGROUND, INTERACTIVE, RequestScheduler
+from utils.snapshots import SnapshotStore
+from utils.teams import TeamIndex
+
+API_BASE_URL = "https://api.football-data.org/v4"
+
+# Cache lifetime (seconds) per endpoint class; the first matching prefix wins
+ENDPOINT_TTLS = (
+    ("teams/", 12 * 3600),           # Team metadata barely changes during a day
+    ("competitions/", 5 * 60),       # Standings / competition matches
+    ("matches", 30),                 # Live scores
+)
+DEFAULT_TTL = 60
+
+# Extra names fans use, keyed by the team key in `Football.team_data`
+TEAM_ALIASES = {
+    "arsenal": ["gunners", "the arsenal", "afc"],
+    "astonvilla": ["villa", "aston villa"],
+    "bournemouth": ["cherries", "afc bournemouth"],
+    "brighton": ["brighton and hove albion", "seagulls"],
+    "crystalpalace": ["palace", "crystal palace"],
+    "everton": ["toffees"],
+    "liverpool": ["lfc", "reds"],
+    "luton": ["luton town", "hatters"],
+    "mancity": ["man city", "manchester city", "city", "mcfc"],
+    "manutd": ["man utd", "man united", "manchester united", "mufc"],
+    "newcastle": ["newcastle united", "magpies", "toon"],
+    "nottingham": ["nottingham forest", "forest", "nffc"],
+    "sheffield": ["sheffield united", "blades"],
+    "tottenham": ["spurs", "tottenham hotspur", "thfc"],
+    "westham": ["west ham", "west ham united", "hammers"],
+    "wolves": ["wolverhampton", "wolverhampton wanderers"],
+    "alaves": ["deportivo alaves"],
+    "almeria": ["ud almeria"],
+    "athletic": ["athletic bilbao", "bilbao", "athletic club"],
+    "atletico": ["atletico madrid", "atleti", "atletico de madrid"],
+    "barcelona": ["barca", "fc barcelona", "blaugrana"],
+    "betis": ["real betis"],
+    "cadiz": ["cadiz cf"],
+    "celta": ["celta vigo"],
+    "granada": ["granada cf"],
+    "laspalmas": ["las palmas", "ud las palmas"],
+    "mallorca": ["rcd mallorca"],
+    "osasuna": ["ca osasuna"],
+    "rayo": ["rayo vallecano"],
+    "realmadrid": ["real madrid", "madrid", "los blancos"],
+    "realsociedad": ["real sociedad", "la real"],
+    "sevilla": ["sevilla fc", "seville"],
+    "valencia": ["valencia cf"],
+    "villarreal": ["yellow submarine"]
+}
+
 
 class Football(commands.Cog):
     """Complete football stats with all Premier League and La Liga teams"""
@@ -14,6 +72,7 @@ class Football(commands.Cog):
         self.team_data = {
             "premier_league": {
                 "name": "Premier League",
+                "code": "PL",
                 "teams": {
                     "arsenal": {"id": 57, "color": 0xEF0107},
                     "astonvilla": {"id": 58, "color": 0x670E36},
@@ -38,6 +97,7 @@ class Football(commands.Cog):
             },
             "la_liga": {
                 "name": "La Liga",
+                "code": "PD",
                 "teams": {
                     "alaves": {"id": 263, "color": 0x0055A4},
                     "almeria": {"id": 724, "color": 0xEE2A24},
@@ -62,40 +122,218 @@ class Football(commands.Cog):
                 }
             }
         }
+        self.team_index = TeamIndex(self.team_data, TEAM_ALIASES)
+        self._renders = {}  # (command, argument) -> prebuilt embeds, cleared by refresh_catalogue()
+
+    async def cog_load(self):
+        """Create the shared, pooled HTTP client for football-data.org"""
+        self.http = HTTPClient(
+            API_BASE_URL,
+            headers={
+                "X-Auth-Token": (os.getenv("FOOTBALL_API_TOKEN") or "").strip(),
+                "Content-Type": "application/json"
+            },
+            limit_per_host=int(os.getenv("FOOTBALL_API_MAX_CONNECTIONS", 10)),
+            connect_timeout=float(os.getenv("FOOTBALL_API_CONNECT_TIMEOUT", 5)),
+            total_timeout=float(os.getenv("FOOTBALL_API_TIMEOUT", 10))
+        )
+        await self.http.start()
+        self.cache = ResponseCache(
+            max_entries=int(os.getenv("FOOTBALL_CACHE_ENTRIES", 256)),
+            max_bytes=int(os.getenv("FOOTBALL_CACHE_BYTES", 4 * 1024 * 1024)),
+            should_cache=lambda data: "error" not in data
+        )
+        self.scheduler = RequestScheduler(
+            # The API key's budget is shared by every worker process
+            per_minute=max(1, int(os.getenv("FOOTBALL_API_RATE_LIMIT", 10)) // CLUSTER.cluster_count),
+            max_retries=int(os.getenv("FOOTBALL_API_MAX_RETRIES", 3))
+        )
+        self.scheduler.start()
+        self.snapshots = SnapshotStore(os.getenv("FOOTBALL_SNAPSHOT_DB", "football_snapshots.db"))
+        self.prefetch_task = asyncio.create_task(self.prefetch_roster())
+        self.competitions = CompetitionStore()
+        self.competition_refresh_interval = int(os.getenv("COMPETITION_REFRESH_INTERVAL", 600))
+        self.competition_task = asyncio.create_task(self.refresh_competitions())
+
+    async def cog_unload(self):
+        """Stop background work, persist snapshots and close pooled connections"""
+        for task in (self.prefetch_task, self.competition_task):
+            task.cancel()
+        await asyncio.gather(self.prefetch_task, self.competition_task, return_exceptions=True)
+        await self.cache.close()
+        await self.scheduler.close()
+        await self.http.close()
+        await self.snapshots.close()
+
+    @staticmethod
+    def _ttl_for(endpoint: str) -> int:
+        for prefix, ttl in ENDPOINT_TTLS:
+            if endpoint.startswith(prefix):
+                return ttl
+        return DEFAULT_TTL
 
     async def fetch_football_data(self, endpoint: str):
-        """Universal API fetcher with error handling"""
-        headers = {
-            "X-Auth-Token": os.getenv("FOOTBALL_API_TOKEN").strip(),
-            "Content-Type": "application/json"
+        """Cached API fetcher; stale entries are served while refreshing in the background"""
+        ttl = self._ttl_for(endpoint)
+        if endpoint not in self.cache:
+            # Cold cache (e.g. after a restart): answer from the on-disk snapshot and refresh behind it
+            snapshot = await self.snapshots.get(endpoint)
+            if snapshot:
+                self.cache.seed(endpoint, snapshot.payload, ttl)
+        return await self.cache.get(
+            endpoint,
+            lambda: self._request(endpoint),
+            ttl,
+            refresher=lambda: self._request(endpoint, priority=BACKGROUND)
+        )
+
+    async def poll_football_data(self, endpoint: str, validators: dict = None):
+        """Uncached background fetch for pollers using conditional request headers.
+
+        Returns `(data, validators)`; `data` is None when the API answered 304
+        Not Modified, and an `{"error": ...}` dict on failure.
+        """
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        try:
+            response = await self.scheduler.submit(
+                endpoint,
+                lambda: self.http.get_json(endpoint, headers=headers or None),
+                priority=BACKGROUND
+            )
+        except Exception as e:
+            return {"error": f"Connection failed: {str(e)}"}, validators
+        if response.status == 304:
+            return None, validators
+        if response.status != 200:
+            return {"error": f"API Error: HTTP {response.status}"}, validators
+        return response.data, {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
         }
+
+    def _staleness_note(self, endpoint: str):
+        """'Last updated' marker for payloads older than their TTL, else None"""
+        age = self.snapshots.age(endpoint)
+        if age is None or age < self._ttl_for(endpoint):
+            return None
+        if age >= 86400:
+            return f"Last updated {int(age // 86400)}d ago"
+        if age >= 3600:
+            return f"Last updated {int(age // 3600)}h ago"
+        return f"Last updated {max(1, int(age // 60))}m ago"
+
+    def _roster_endpoints(self) -> list:
+        """Every endpoint the warm-up prefetch keeps fresh"""
+        endpoints = [f"competitions/{league['code']}" for league in self.team_data.values()]
+        team_ids = {team["id"] for league in self.team_data.values() for team in league["teams"].values()}
+        endpoints.extend(f"teams/{team_id}" for team_id in sorted(team_ids))
+        return endpoints
+
+    async def prefetch_roster(self):
+        """Warm the cache from disk, then refresh stale roster entries in the background"""
+        await self.snapshots.load()
+        semaphore = asyncio.Semaphore(int(os.getenv("FOOTBALL_PREFETCH_CONCURRENCY", 2)))
+
+        async def refresh(endpoint):
+            ttl = self._ttl_for(endpoint)
+            snapshot = await self.snapshots.get(endpoint)
+            if snapshot:
+                if endpoint not in self.cache:
+                    self.cache.seed(endpoint, snapshot.payload, ttl)
+                if snapshot.age < ttl:
+                    return
+            async with semaphore:
+                data = await self._request(endpoint, priority=BACKGROUND)
+            self.cache.set(endpoint, data, ttl)
+
+        await asyncio.gather(*(refresh(endpoint) for endpoint in self._roster_endpoints()))
+
+    async def refresh_competitions(self):
+        """Keep the local standings/fixtures store current, re-fetching only matchdays that can have changed"""
+        await self.snapshots.load()
+        for league in self.team_data.values():
+            code = league["code"]
+            table = await self.snapshots.get(f"competitions/{code}/standings")
+            if table:
+                self.competitions.set_table(code, table.payload)
+            season = await self.snapshots.get(f"competitions/{code}/matches")
+            if season:
+                self.competitions.merge_matches(code, season.payload.get("matches", []))
+                self.competitions.full_refresh_at[code] = season.fetched_at
+
+        while True:
+            for league in self.team_data.values():
+                try:
+                    await self._refresh_competition(league["code"])
+                except Exception as e:
+                    print(f"⚠️ Competition refresh for {league['code']} failed: {e}")
+            await asyncio.sleep(self.competition_refresh_interval)
+
+    async def _refresh_competition(self, code: str):
+        store = self.competitions
+        season_endpoint = f"competitions/{code}/matches"
+        newly_finished = 0
+
+        if time.time() - store.full_refresh_at.get(code, 0) > 86400:
+            # Daily full pass picks up reschedules; everything else is incremental
+            data = await self._request(season_endpoint, priority=BACKGROUND)
+            if "error" in data:
+                return
+            newly_finished += store.merge_matches(code, data.get("matches", []), full=True)
+        else:
+            for matchday in sorted(md for md in store.stale_matchdays(code) if md is not None):
+                data = await self._request(f"{season_endpoint}?matchday={matchday}", priority=BACKGROUND)
+                if "error" not in data:
+                    newly_finished += store.merge_matches(code, data.get("matches", []))
+            if newly_finished:
+                self.snapshots.put(season_endpoint, {"matches": store.season_matches(code)})
+
+        if newly_finished or code not in store.tables:
+            data = await self._request(f"competitions/{code}/standings", priority=BACKGROUND)
+            if "error" not in data:
+                store.set_table(code, data)
+
+    async def _request(self, endpoint: str, priority: int = INTERACTIVE):
+        """Universal API fetcher with error handling, rate limiting and request coalescing"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                        f"https://api.football-data.org/v4/{endpoint}",
-                        headers=headers,
-                        timeout=10
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    return {"error": f"API Error: HTTP {response.status}"}
+            response = await self.scheduler.submit(
+                endpoint,
+                lambda: self.http.get_json(endpoint),
+                priority=priority
+            )
         except Exception as e:
             return {"error": f"Connection failed: {str(e)}"}
+        if response.status == 200:
+            self.snapshots.put(endpoint, response.data)
+            return response.data
+        if response.status == 429:
+            return {"error": "Football API rate limit reached, try again in a minute."}
+        return {"error": f"API Error: HTTP {response.status}"}
 
     @commands.command(name="team")
     async def team_info(self, ctx, *, team_name: str):
         """Get comprehensive team information"""
         team_info = await self._get_team_info(team_name)
         if not team_info:
+            suggestions = self.team_index.suggest(team_name)
+            if suggestions:
+                names = ", ".join(f"`{team.key}`" for team in suggestions)
+                return await ctx.send(f"⚠️ Team not found. Did you mean {names}?")
             return await ctx.send("⚠️ Team not found. Try `!teams` for options.")
 
-        data = await self.fetch_football_data(f"teams/{team_info['id']}")
+        endpoint = f"teams/{team_info.id}"
+        data = await self.fetch_football_data(endpoint)
         if "error" in data:
             return await ctx.send(f"⚠️ {data['error']}")
 
         embed = discord.Embed(
             title=f"🏟️ {data['name']} ({data['shortName']})",
-            color=team_info["color"]
+            color=team_info.color
         )
         embed.set_thumbnail(url=data['crest'])
 
@@ -116,64 +354,181 @@ class Football(commands.Cog):
         comps = "\n".join(f"• {c['name']}" for c in data['runningCompetitions'])
         embed.add_field(name="🏆 Competitions", value=comps, inline=False)
 
+        stale = self._staleness_note(endpoint)
+        if stale:
+            embed.set_footer(text=f"🕒 {stale}")
+
         await ctx.send(embed=embed)
 
     async def _get_team_info(self, team_name: str):
-        """Find team data from name"""
-        team_key = team_name.lower().replace(" ", "")
-        for league in self.team_data.values():
-            if team_key in league["teams"]:
-                return {
-                    "id": league["teams"][team_key]["id"],
-                    "color": league["teams"][team_key]["color"],
-                    "league": league["name"]
-                }
+        """Find team data from name (exact, prefix, alias or close spelling)"""
+        return self.team_index.resolve(team_name)
+
+    def _resolve_league(self, league: str):
+        """League dict by key, code or display name (e.g. `la liga`, `PD`)"""
+        league_key = league.lower().replace(" ", "_")
+        for key, data in self.team_data.items():
+            if league_key in (key, data["code"].lower(), data["name"].lower().replace(" ", "_")):
+                return data
         return None
 
+    @staticmethod
+    def _format_match(match: dict, team_id: int) -> str:
+        home, away = match["homeTeam"], match["awayTeam"]
+        kickoff = datetime.fromisoformat(match["utcDate"].replace("Z", "+00:00"))
+        if match["status"] in ("FINISHED", "AWARDED"):
+            score = match["score"]["fullTime"]
+            ours, theirs = (score["home"], score["away"]) if home["id"] == team_id else (score["away"], score["home"])
+            outcome = "✅" if ours > theirs else "❌" if ours < theirs else "➖"
+            return (
+                f"{outcome} {home.get('shortName') or home['name']} {score['home']}-{score['away']} "
+                f"{away.get('shortName') or away['name']} · {kickoff.strftime('%b %d')}"
+            )
+        return (
+            f"📅 {kickoff.strftime('%b %d %H:%M')} UTC · "
+            f"{home.get('shortName') or home['name']} vs {away.get('shortName') or away['name']}"
+        )
+
+    @commands.command(name="standings")
+    async def standings(self, ctx, *, league: str = "premier league"):
+        """Show the league table (!standings la liga)"""
+        league_data = self._resolve_league(league)
+        if not league_data:
+            return await ctx.send("⚠️ League not found. Try `!leagues`")
+
+        table = self.competitions.tables.get(league_data["code"])
+        if not table:
+            return await ctx.send("⏳ Standings are still loading, try again shortly.")
+
+        lines = ["Pos Team             P   GD  Pts"]
+        for row in table:
+            team = row["team"].get("shortName") or row["team"]["name"]
+            lines.append(
+                f"{row['position']:>3} {team[:16]:<16} {row['playedGames']:>2} {row['goalDifference']:>4} {row['points']:>4}"
+            )
+        embed = discord.Embed(
+            title=f"🏆 {league_data['name']} Table",
+            description="```\n" + "\n".join(lines) + "\n```",
+            color=0x7289DA
+        )
+        await ctx.send(embed=embed)
+
+    async def _team_matches(self, ctx, team_name: str, results: bool):
+        team = await self._get_team_info(team_name)
+        if not team:
+            return await ctx.send("⚠️ Team not found. Try `!teams` for options.")
+
+        store = self.competitions
+        matches = store.results(team.id) if results else store.fixtures(team.id)
+        if not matches:
+            if not any(store.has_matches(league["code"]) for league in self.team_data.values()):
+                return await ctx.send("⏳ Fixtures are still loading, try again shortly.")
+            return await ctx.send(f"📭 No {'results' if results else 'upcoming fixtures'} found.")
+
+        embed = discord.Embed(
+            title=f"{'📋 Results' if results else '🗓️ Fixtures'}: {team.key.title()}",
+            description="\n".join(self._format_match(match, team.id) for match in matches),
+            color=team.color
+        )
+        await ctx.send(embed=embed)
+
+    @commands.command(name="fixtures")
+    async def fixtures(self, ctx, *, team_name: str = "arsenal"):
+        """Show a team's next matches (!fixtures arsenal)"""
+        await self._team_matches(ctx, team_name, results=False)
+
+    @commands.command(name="results")
+    async def results(self, ctx, *, team_name: str = "arsenal"):
+        """Show a team's latest results (!results arsenal)"""
+        await self._team_matches(ctx, team_name, results=True)
+
+    def refresh_catalogue(self):
+        """Rebuild everything derived from `team_data`; call after editing the roster"""
+        self.team_index = TeamIndex(self.team_data, TEAM_ALIASES)
+        self._renders.clear()
+
+    def _render_teams(self, league_key: str = None):
+        """Embeds for `!teams`, or None for an unknown league"""
+        if league_key:
+            if league_key not in self.team_data:
+                return None
+            leagues = [self.team_data[league_key]]
+        else:
+            leagues = list(self.team_data.values())
+
+        fields = []
+        for league in leagues:
+            lines = [f"• {team.replace('_', ' ').title()}" for team in league["teams"]]
+            fields.extend(paginated_fields(f"🏆 {league['name']}", lines))
+        return build_embeds("Available Teams", 0x00FF00, fields)
+
+    def _render_leagues(self):
+        fields = [
+            (f"🏆 {league['name']}", f"`!teams {league['name'].lower()}` to view teams")
+            for league in self.team_data.values()
+        ]
+        return build_embeds("Available Leagues", 0x7289DA, fields)
+
     @commands.command(name="teams")
     async def list_teams(self, ctx, *, league: str = None):
         """List all teams or filter by league"""
-        embed = discord.Embed(title="Available Teams", color=0x00FF00)
-
-        if league:
-            league_key = league.lower().replace(" ", "_")
-            if league_key in self.team_data:
-                team_list = "\n".join(
-                    f"• {team.replace('_', ' ').title()}"
-                    for team in self.team_data[league_key]["teams"].keys()
-                )
-                embed.add_field(
-                    name=f"🏆 {self.team_data[league_key]['name']}",
-                    value=team_list,
-                    inline=False
-                )
-            else:
-                await ctx.send("⚠️ League not found. Try `!leagues`")
-                return
-        else:
-            for league_name, league in self.team_data.items():
-                team_list = "\n".join(
-                    f"• {team.replace('_', ' ').title()}"
-                    for team in league["teams"].keys()
-                )
-                embed.add_field(
-                    name=f"🏆 {league['name']}",
-                    value=team_list,
-                    inline=False
-                )
-
-        await ctx.send(embed=embed)
+        league_key = league.lower().replace(" ", "_") if league else None
+        render_key = ("teams", league_key)
+        if render_key not in self._renders:
+            embeds = self._render_teams(league_key)
+            if embeds is None:
+                return await ctx.send("⚠️ League not found. Try `!leagues`")
+            self._renders[render_key] = embeds
+        for group in message_groups(self._renders[render_key]):
+            await ctx.send(embeds=group)
 
     @commands.command(name="leagues")
     async def list_leagues(self, ctx):
         """List available leagues"""
-        embed = discord.Embed(title="Available Leagues", color=0x7289DA)
-        for league in self.team_data.values():
-            embed.add_field(
-                name=f"🏆 {league['name']}",
-                value=f"`!teams {league['name'].lower()}` to view teams",
-                inline=False
-            )
+        if ("leagues",) not in self._renders:
+            self._renders[("leagues",)] = self._render_leagues()
+        for group in message_groups(self._renders[("leagues",)]):
+            await ctx.send(embeds=group)
+
+    @commands.command(name="apistats")
+    @commands.has_permissions(administrator=True)
+    async def api_stats(self, ctx):
+        """Show football API latency, connection, cache and rate-limit stats (admin only)"""
+        stats = self.http.stats.summary()
+        embed = discord.Embed(title="📡 Football API Stats", color=0x7289DA)
+        embed.add_field(name="Requests", value=f"{stats['requests']} ({stats['errors']} errors)", inline=True)
+        embed.add_field(
+            name="Connections",
+            value=f"{stats['new_connections']} new | {stats['reused_connections']} reused",
+            inline=True
+        )
+        for phase, label in (("connect", "🔌 Connect"), ("ttfb", "⏱️ First byte"), ("total", "🏁 Total")):
+            p50, p95 = stats[f"{phase}_p50"], stats[f"{phase}_p95"]
+            value = f"p50 {p50}ms | p95 {p95}ms" if p50 is not None else "No data"
+            embed.add_field(name=label, value=value, inline=False)
+
+        cache = self.cache.summary()
+        hit_rate = f"{cache['hit_rate']}%" if cache["hit_rate"] is not None else "n/a"
+        embed.add_field(
+            name="🗃️ Cache",
+            value=(
+                f"{cache['entries']} entries ({cache['bytes'] / 1024:.1f} KiB) | hit rate {hit_rate}\n"
+                f"{cache['hits']} hits | {cache['stale_hits']} stale | {cache['misses']} misses | "
+                f"{cache['evictions']} evicted | {cache['refreshes']} refreshed | "
+                f"{cache['failed_refreshes']} refreshes failed"
+            ),
+            inline=False
+        )
+
+        sched = self.scheduler.summary()
+        embed.add_field(
+            name="🚦 Scheduler",
+            value=(
+                f"{sched['tokens']} tokens | {sched['queued']} queued | {sched['in_flight']} in flight\n"
+                f"{sched['coalesced']} coalesced | {sched['rate_limited']} × 429 | {sched['retries']} retries"
+            ),
+            inline=False
+        )
         await ctx.send(embed=embed)
 
 
@@ -2,45 +2,81 @@
 import discord
 from discord.ext import commands
 
+from utils.embeds import build_embeds, message_groups, paginated_fields
+
+
 class Help(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self._renders = {}         # command name (or None for the overview) -> prebuilt embeds
+        self._registry_key = None  # registry shape the cached renders were built from
+
+    def _current_registry_key(self):
+        return tuple(self.bot.cogs), len(self.bot.all_commands)
+
+    def _renders_for_registry(self) -> dict:
+        """Render cache, dropped whenever cogs or commands are added or removed"""
+        key = self._current_registry_key()
+        if key != self._registry_key:
+            self._renders.clear()
+            self._registry_key = key
+        return self._renders
+
+    @staticmethod
+    def _usage(command: commands.Command) -> str:
+        return f"!{command.qualified_name} {command.signature}".rstrip()
+
+    def _render_overview(self) -> list:
+        sections = {}
+        for command in sorted(self.bot.walk_commands(), key=lambda c: c.qualified_name):
+            if command.hidden:
+                continue
+            section = command.cog.qualified_name if command.cog else "General"
+            sections.setdefault(section, []).append(f"`{self._usage(command)}` – {command.short_doc or 'No description'}")
+
+        fields = []
+        for section in sorted(sections):
+            fields.extend(paginated_fields(f"**{section} Commands**", sections[section]))
+        return build_embeds(
+            "Bot Commands",
+            0xEF0107,
+            fields,
+            description="For more information on a specific command, type `!help [command]`."
+        )
+
+    def _render_command(self, command: commands.Command) -> list:
+        embed = discord.Embed(
+            title=f"`{self._usage(command)}`",
+            description=command.help or "No description",
+            color=0xEF0107
+        )
+        if command.aliases:
+            embed.add_field(name="Aliases", value=", ".join(f"`{alias}`" for alias in command.aliases), inline=False)
+        if isinstance(command, commands.Group):
+            subcommands = [f"`{self._usage(sub)}` – {sub.short_doc}" for sub in command.commands if not sub.hidden]
+            if subcommands:
+                embed.add_field(name="Subcommands", value="\n".join(subcommands)[:1024], inline=False)
+        return [embed]
 
     @commands.command(name="help")
-    async def help_command(self, ctx):
+    async def help_command(self, ctx, *, command_name: str = None):
         """Displays a list of all available commands for the bot"""
-        help_text = """
-        **Bot Commands:**
-        - `!teams [league]`: Lists all teams, or filters by league.
-        - `!teams`: Lists all teams in all leagues.
-        - `!teams premier league`: Lists only Premier League teams.
-        - `!teams la liga`: Lists only La Liga teams.
-        - `!leagues`: Displays a list of available leagues
-
-        **General Commands**
-        `!help` - Displays this message.
-
-        **Welcome Commands**
-        `!testwelcome` - Manually trigger the welcome message (admin only).
-        `!setup_reaction_message` - Set up the reaction role message in the server (admin only).
-        
-        **Utility Commands:**
-        - `!serverinfo`: Displays server statistics such as the server name, owner, member count, roles, and more.
-        - `!userinfo [member]`: Displays information about a specific user or the user who triggered the command.
-        - `!poll "question" "option1" "option2" ...`: Creates a poll with up to 10 options.
-        - `!remind [time] [reminder]`: Set a reminder with a specified time (e.g., `1h30m Do homework`).
-        - Time format can include days (`d`), hours (`h`), and minutes (`m`).
-        - The bot will remind you in the specified channel.
-        
-        **Moderation Commands:**
-        - `!kick [member] [reason]`: Kicks a member from the server with an optional reason. (admin only).
-        - `!ban [member] [reason]`: Bans a member from the server for a specified reason. (admin only).
-        - `!unban [user_id]`: Unbans a user from the server using their user ID. (admin only).
-        - `!mute [member] [reason]`: Mutes a member (requires the 'Muted' role to be set up in the server).
-
-        For more information on specific commands, just type `!help [command]`.
-        """
-        await ctx.send(help_text)
+        renders = self._renders_for_registry()
+
+        if command_name:
+            command = self.bot.get_command(command_name.lower())
+            if command is None or command.hidden:
+                return await ctx.send(f"⚠️ No command called `{command_name}`. Try `!help`.")
+            key = command.qualified_name
+            if key not in renders:
+                renders[key] = self._render_command(command)
+        else:
+            key = None
+            if key not in renders:
+                renders[key] = self._render_overview()
+
+        for group in message_groups(renders[key]):
+            await ctx.send(embeds=group)
 
 # Adding this cog to the bot
 async def setup(bot):
@@ -0,0 +1,254 @@
+# cogs/live.py
+import asyncio
+import os
+from datetime import datetime, timezone
+
+import discord
+from discord.ext import commands
+
+from utils.cluster import CLUSTER
+from utils.files import atomic_write_json, file_lock, load_json
+from utils.senders import ChannelSendQueue
+
+LIVE_STATUSES = {"IN_PLAY", "PAUSED"}
+UPCOMING_STATUSES = {"SCHEDULED", "TIMED"}
+CARD_EMOJIS = {"YELLOW_CARD": "🟨", "YELLOW_RED_CARD": "🟨🟥", "RED_CARD": "🟥"}
+
+
+def _team(match: dict, side: str) -> str:
+    team = match.get(f"{side}Team") or {}
+    return team.get("shortName") or team.get("name") or "TBD"
+
+
+def _score(match: dict) -> tuple:
+    full_time = (match.get("score") or {}).get("fullTime") or {}
+    return full_time.get("home") or 0, full_time.get("away") or 0
+
+
+def _scoreline(match: dict) -> str:
+    home, away = _score(match)
+    return f"{_team(match, 'home')} {home}-{away} {_team(match, 'away')}"
+
+
+def diff_matches(previous: dict, current: dict) -> list:
+    """Human-readable events between two `{match_id: match}` snapshots"""
+    events = []
+    for match_id, match in current.items():
+        before = previous.get(match_id)
+        if before is None:
+            continue
+
+        old_status, status = before.get("status"), match.get("status")
+        if old_status != status:
+            if status == "IN_PLAY" and old_status in UPCOMING_STATUSES:
+                events.append(f"🟢 Kick-off: {_team(match, 'home')} vs {_team(match, 'away')}")
+            elif status == "PAUSED":
+                events.append(f"⏸️ Half-time: {_scoreline(match)}")
+            elif status == "IN_PLAY" and old_status == "PAUSED":
+                events.append(f"▶️ Second half underway: {_scoreline(match)}")
+            elif status == "FINISHED":
+                events.append(f"🏁 Full-time: {_scoreline(match)}")
+            elif status in {"POSTPONED", "SUSPENDED", "CANCELLED"}:
+                events.append(f"⚠️ {_team(match, 'home')} vs {_team(match, 'away')} {status.lower()}")
+
+        old_goals, goals = before.get("goals") or [], match.get("goals") or []
+        if len(goals) > len(old_goals):
+            # Detailed feed (paid tiers): one line per new scorer
+            for goal in goals[len(old_goals):]:
+                scorer = (goal.get("scorer") or {}).get("name", "Unknown")
+                events.append(f"⚽ GOAL! {scorer} {goal.get('minute', '?')}' — {_scoreline(match)}")
+        elif _score(match) != _score(before):
+            (old_home, old_away), (home, away) = _score(before), _score(match)
+            if home + away > old_home + old_away:
+                events.append(f"⚽ GOAL! {_scoreline(match)}")
+            else:
+                events.append(f"❌ Goal disallowed: {_scoreline(match)}")
+
+        old_bookings, bookings = before.get("bookings") or [], match.get("bookings") or []
+        for booking in bookings[len(old_bookings):]:
+            player = (booking.get("player") or {}).get("name", "Unknown")
+            team = (booking.get("team") or {}).get("shortName", "")
+            emoji = CARD_EMOJIS.get(booking.get("card"), "🟨")
+            events.append(f"{emoji} {player} ({team}) {booking.get('minute', '?')}'")
+    return events
+
+
+class LiveMatches(commands.Cog, name="Live Matches"):
+    """Live match updates: one shared poller per competition, deltas fanned out to subscribed channels"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.subscriptions_file = "live_subscriptions.json"
+        self.live_interval = int(os.getenv("LIVE_POLL_INTERVAL", 60))
+        self.idle_interval = int(os.getenv("LIVE_IDLE_INTERVAL", 1800))
+        self.subscriptions = {}   # competition code -> set of channel IDs
+        self.pollers = {}         # competition code -> poller task
+        self.matches = {}         # competition code -> {match_id: match} from the last poll
+        self.sender = ChannelSendQueue(self._send)
+        self._save_lock = asyncio.Lock()  # keeps (un)subscriptions hitting the file in command order
+
+    async def cog_load(self):
+        data = load_json(self.subscriptions_file, {})
+        for code, channel_ids in data.items():
+            if channel_ids:
+                self.subscriptions[code] = set(channel_ids)
+                self._ensure_poller(code)
+
+    async def cog_unload(self):
+        pollers = list(self.pollers.values())
+        for task in pollers:
+            task.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
+        self.pollers.clear()
+        await self.sender.close()
+
+    async def _save(self, code: str, channel_id: int, subscribed: bool):
+        async with self._save_lock:
+            await asyncio.to_thread(self._write_subscription, code, channel_id, subscribed)
+
+    def _write_subscription(self, code: str, channel_id: int, subscribed: bool):
+        """Apply one (un)subscription to the file, which other worker processes may be updating too"""
+        with file_lock(self.subscriptions_file):
+            data = {code: set(channels) for code, channels in load_json(self.subscriptions_file, {}).items()}
+            channels = data.setdefault(code, set())
+            if subscribed:
+                channels.add(channel_id)
+            else:
+                channels.discard(channel_id)
+            atomic_write_json(
+                self.subscriptions_file,
+                {code: sorted(channels) for code, channels in data.items() if channels}
+            )
+
+    def _ensure_poller(self, code: str):
+        task = self.pollers.get(code)
+        if task is None or task.done():
+            self.pollers[code] = asyncio.create_task(self._poll(code))
+
+    def _next_delay(self, matches: dict) -> float:
+        """Poll fast while a match is live, otherwise sleep until the next kick-off (capped)"""
+        if any(m.get("status") in LIVE_STATUSES for m in matches.values()):
+            return self.live_interval
+        now = datetime.now(timezone.utc)
+        kickoffs = [
+            datetime.fromisoformat(m["utcDate"].replace("Z", "+00:00"))
+            for m in matches.values()
+            if m.get("status") in UPCOMING_STATUSES and m.get("utcDate")
+        ]
+        upcoming = [(k - now).total_seconds() for k in kickoffs if k > now]
+        if upcoming:
+            return max(self.live_interval, min(self.idle_interval, min(upcoming)))
+        return self.idle_interval
+
+    async def _poll(self, code: str):
+        """Single shared poller for one competition; exits when nobody is subscribed"""
+        await self.bot.wait_until_ready()
+        if CLUSTER.clustered:
+            # Every worker reads the whole file; only post to channels on this worker's shards
+            self.subscriptions[code] = {
+                channel_id for channel_id in self.subscriptions.get(code, ()) if self.bot.get_channel(channel_id)
+            }
+        endpoint, validators, previous = None, None, None
+
+        while self.subscriptions.get(code):
+            football = self.bot.get_cog("Football")
+            if football is None:
+                await asyncio.sleep(self.idle_interval)
+                continue
+
+            today = datetime.now(timezone.utc).date().isoformat()
+            todays_endpoint = f"competitions/{code}/matches?dateFrom={today}&dateTo={today}"
+            if todays_endpoint != endpoint:
+                endpoint, validators = todays_endpoint, None
+
+            data, validators = await football.poll_football_data(endpoint, validators)
+            if data is not None and "error" in data:
+                print(f"⚠️ Live poll for {code} failed: {data['error']}")
+            elif data is not None:
+                current = {m["id"]: m for m in data.get("matches", [])}
+                if previous is not None:
+                    events = diff_matches(previous, current)
+                    if events:
+                        self._fan_out(code, events)
+                previous = self.matches[code] = current
+
+            await asyncio.sleep(self._next_delay(previous or {}))
+        self.pollers.pop(code, None)
+
+    def _fan_out(self, code: str, events: list):
+        """Queue one message (split at Discord's 2000-char limit) per subscribed channel"""
+        messages, current = [], ""
+        for event in events:
+            if current and len(current) + len(event) + 1 > 2000:
+                messages.append(current)
+                current = ""
+            current = f"{current}\n{event}" if current else event
+        messages.append(current)
+
+        for channel_id in self.subscriptions.get(code, ()):
+            for message in messages:
+                self.sender.submit(channel_id, message)
+
+    async def _send(self, channel_id: int, content: str):
+        channel = self.bot.get_channel(channel_id)
+        if channel:
+            await channel.send(content)
+
+    def _resolve_league(self, league: str):
+        """Map a league name or code to `(code, display name)`"""
+        football = self.bot.get_cog("Football")
+        league_data = football._resolve_league(league) if football and league else None
+        if not league_data:
+            return None
+        return league_data["code"], league_data["name"]
+
+    @commands.group(name="live", invoke_without_command=True)
+    async def live(self, ctx):
+        """Show today's matches for the competitions this channel follows"""
+        codes = [code for code, channels in self.subscriptions.items() if ctx.channel.id in channels]
+        if not codes:
+            return await ctx.send("📡 This channel isn't following any league. Try `!live subscribe premier league`")
+
+        embed = discord.Embed(title="📡 Live Matches", color=0xEF0107)
+        for code in codes:
+            matches = self.matches.get(code)
+            if matches is None:
+                value = "Waiting for first update..."
+            elif not matches:
+                value = "No matches today"
+            else:
+                value = "\n".join(
+                    f"{'🔴' if m.get('status') in LIVE_STATUSES else '•'} {_scoreline(m)}"
+                    for m in matches.values()
+                )[:1024]
+            embed.add_field(name=f"🏆 {code}", value=value, inline=False)
+        await ctx.send(embed=embed)
+
+    @live.command(name="subscribe")
+    @commands.has_permissions(manage_channels=True)
+    async def live_subscribe(self, ctx, *, league: str):
+        """Post goals, cards and status changes for a league in this channel"""
+        resolved = self._resolve_league(league)
+        if not resolved:
+            return await ctx.send("⚠️ League not found. Try `!leagues`")
+        code, name = resolved
+        self.subscriptions.setdefault(code, set()).add(ctx.channel.id)
+        await self._save(code, ctx.channel.id, True)
+        self._ensure_poller(code)
+        await ctx.send(f"✅ {ctx.channel.mention} will now get live {name} updates.")
+
+    @live.command(name="unsubscribe")
+    @commands.has_permissions(manage_channels=True)
+    async def live_unsubscribe(self, ctx, *, league: str):
+        """Stop live updates for a league in this channel"""
+        resolved = self._resolve_league(league)
+        if not resolved:
+            return await ctx.send("⚠️ League not found. Try `!leagues`")
+        code, name = resolved
+        self.subscriptions.get(code, set()).discard(ctx.channel.id)
+        await self._save(code, ctx.channel.id, False)
+        await ctx.send(f"🔕 {ctx.channel.mention} will no longer get live {name} updates.")
+
+
+async def setup(bot):
+    await bot.add_cog(LiveMatches(bot))
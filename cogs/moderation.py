@@ -1,50 +1,201 @@
 # cogs/moderation.py
 import discord
 from discord.ext import commands
-from datetime import datetime
+from datetime import datetime, timedelta
 import asyncio
+import functools
+import os
+import re
+import typing
+
+from utils.bulk import BulkRunner, SkipTarget
+from utils.case_store import CaseStore
+from utils.cluster import CLUSTER
+from utils.durations import format_duration, parse_duration
+from utils.embeds import build_embeds, message_groups, paginated_fields, truncate
+from utils.expiry_store import Expiry, ExpiryStore
+from utils.log_sink import EmbedLogSink
+from utils.mod_config import ModConfigRegistry
+from utils.purge import CancelView, PurgeEngine
+from utils.timers import DeadlineScheduler
+
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "5"))
+BULK_BAN_BATCH = 200      # users per bulk-ban request (Discord's maximum)
+BULK_REPORT_LINES = 30    # entries listed per group in the final report
+CASES_PER_PAGE = 10
+EXPIRY_MAX_ATTEMPTS = 5   # failed unmute/unban attempts before an expiry is dropped
+EXPIRY_RETRY_DELAY = 60   # seconds before the first retry, doubled on each further failure
+PURGE_MAX = 10000         # most messages one !purge may delete
+PURGE_SCAN_LIMIT = 10000  # history scanned by a filtered !purge unless --scan says otherwise
+
+
+class BulkFlags(commands.FlagConverter, prefix="--", delimiter=" "):
+    joined: str = None   # members who joined within this long, e.g. 30m
+    created: str = None  # accounts younger than this, e.g. 7d
+    reason: str = "No reason provided"
+
+
+class PurgeFlags(commands.FlagConverter, prefix="--", delimiter=" "):
+    user: discord.User = None
+    match: str = None         # regular expression, matched case-insensitively
+    attachments: bool = False
+    bots: bool = False
+    older: str = None         # only messages older than this, e.g. 14d
+    newer: str = None         # only messages newer than this, e.g. 1h
+    scan: int = None
+
 
 class Moderation(commands.Cog):
     """Server moderation commands"""
 
     def __init__(self, bot):
         self.bot = bot
-        self.mute_role = None  # Set during setup
-        self.log_channel = None
+        self.config = ModConfigRegistry("moderation_config.json")
+        self.purges = {}  # channel id -> running PurgeEngine
+        self.cases = CaseStore("moderation_cases.db", cluster=CLUSTER)
+        self.expiries = ExpiryStore("moderation_expiries.db")
+        self.expiry_timers = DeadlineScheduler(self.apply_expiries)
+        self.log_sink = EmbedLogSink(
+            self._resolve_log_channel,
+            mirror_path=os.getenv("MOD_LOG_FILE", "moderation_log.jsonl") or None
+        )
 
     async def cog_load(self):
-        """Initialize mute role and log channel"""
-        if not self.bot.guilds:
-            return  # Avoid index error if not connected
+        """Load saved per-guild settings; guilds without any are set up lazily on first use"""
+        self.config.load()
+        await self.cases.open()
+        await self.expiries.open()
+        for expiry in await self.expiries.all():
+            if CLUSTER.owns_guild(expiry.guild_id):  # other worker processes handle their own guilds
+                self.expiry_timers.schedule(expiry.key, expiry.due, expiry)
+        self.expiry_timers.start()
 
-        guild = self.bot.guilds[0]
-        self.mute_role = discord.utils.get(guild.roles, name="Muted")
-        self.log_channel = discord.utils.get(guild.channels, name="mod-logs")
+    async def cog_unload(self):
+        await self.expiry_timers.close()
+        await self.expiries.close()
+        await self.log_sink.close()
+        await self.cases.close()
 
-    async def log_action(self, action: str, moderator: discord.Member, target: discord.Member, reason: str = None):
-        """Log moderation actions to a channel"""
-        if not self.log_channel:
-            return
+    async def _resolve_log_channel(self, guild_id: int):
+        guild = self.bot.get_guild(guild_id)
+        return await self.config.log_channel(guild) if guild else None
 
+    async def log_action(self, action: str, moderator: discord.Member, target: discord.abc.User = None,
+                         reason: str = None, *, record_case: bool = True):
+        """Record a case and queue the action for the guild's log channel (never waits on Discord)"""
+        now = datetime.now()
+        case = None
+        if record_case:
+            case = self.cases.add(
+                moderator.guild.id, action, target.id if target is not None else None,
+                moderator.id, reason, now.timestamp()
+            )
         embed = discord.Embed(
-            title=f"🛠️ {action}",
+            title=f"🛠️ {action}" + (f" | Case #{case.id}" if case else ""),
             color=0xFF0000,
-            timestamp=datetime.now()
+            timestamp=now
         )
         embed.add_field(name="Moderator", value=moderator.mention, inline=True)
-        embed.add_field(name="Target", value=target.mention, inline=True)
+        if target is not None:
+            embed.add_field(name="Target", value=f"<@{target.id}>", inline=True)
         if reason:
-            embed.add_field(name="Reason", value=reason, inline=False)
+            embed.add_field(name="Reason", value=truncate(reason), inline=False)
 
-        await self.log_channel.send(embed=embed)
+        self.log_sink.submit(moderator.guild.id, embed, {
+            "time": now.isoformat(),
+            "guild_id": moderator.guild.id,
+            "action": action,
+            "case_id": case.id if case else None,
+            "moderator_id": moderator.id,
+            "target_id": target.id if target is not None else None,
+            "reason": reason
+        })
+        return case
 
     def is_admin_or_owner():
-        """Custom check for admin or owner"""
+        """Custom check for admin, owner or a configured staff role"""
         async def predicate(ctx):
             # Check if the user has 'Administrator' permission or is the server owner
-            return ctx.author.guild_permissions.administrator or ctx.author.id == ctx.guild.owner_id
+            if ctx.author.guild_permissions.administrator or ctx.author.id == ctx.guild.owner_id:
+                return True
+            config = await ctx.cog.config.get(ctx.guild)
+            return any(ctx.author.get_role(role_id) for role_id in config.staff_role_ids)
         return commands.check(predicate)
 
+    # Keep the per-guild config in sync with the gateway
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        await self.config.role_created(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        await self.config.role_updated(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        await self.config.role_deleted(role)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        await self.config.channel_created(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        await self.config.channel_updated(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        await self.config.channel_deleted(channel)
+
+    @commands.group(name="modconfig", invoke_without_command=True)
+    @commands.has_permissions(administrator=True)
+    async def mod_config(self, ctx):
+        """Show this server's moderation settings"""
+        config = await self.config.get(ctx.guild)
+        staff = " ".join(f"<@&{role_id}>" for role_id in config.staff_role_ids) or "None"
+        embed = discord.Embed(title="🛠️ Moderation Settings", color=0xFF0000)
+        embed.add_field(
+            name="Mute role",
+            value=f"<@&{config.mute_role_id}>" if config.mute_role_id else "Not set",
+            inline=True
+        )
+        embed.add_field(
+            name="Log channel",
+            value=f"<#{config.log_channel_id}>" if config.log_channel_id else "Not set",
+            inline=True
+        )
+        embed.add_field(name="Staff roles", value=staff, inline=False)
+        await ctx.send(embed=embed)
+
+    @mod_config.command(name="muterole")
+    @commands.has_permissions(administrator=True)
+    async def mod_config_mute_role(self, ctx, role: discord.Role):
+        """Set the role used by !mute"""
+        await self.config.update(ctx.guild, mute_role_id=role.id)
+        await ctx.send(f"✅ Mute role set to {role.mention}.")
+
+    @mod_config.command(name="logchannel")
+    @commands.has_permissions(administrator=True)
+    async def mod_config_log_channel(self, ctx, channel: discord.TextChannel):
+        """Set where moderation actions are logged"""
+        await self.config.update(ctx.guild, log_channel_id=channel.id)
+        await ctx.send(f"✅ Moderation actions will be logged in {channel.mention}.")
+
+    @mod_config.command(name="staff")
+    @commands.has_permissions(administrator=True)
+    async def mod_config_staff(self, ctx, role: discord.Role):
+        """Toggle a role that may use moderation commands"""
+        config = await self.config.get(ctx.guild)
+        staff = list(config.staff_role_ids)
+        if role.id in staff:
+            staff.remove(role.id)
+            message = f"🗑️ {role.mention} is no longer a staff role."
+        else:
+            staff.append(role.id)
+            message = f"✅ {role.mention} can now use moderation commands."
+        await self.config.update(ctx.guild, staff_role_ids=staff)
+        await ctx.send(message)
+
     @commands.command()
     @is_admin_or_owner()
     async def kick(self, ctx, member: discord.Member, *, reason: str = "No reason provided"):
@@ -56,16 +207,55 @@ class Moderation(commands.Cog):
         except Exception as e:
             await ctx.send(f"❌ Failed to kick: {e}")
 
+    def _schedule_expiry(self, guild: discord.Guild, user_id: int, action: str, seconds, case):
+        """Schedule (or, with no duration, clear) the automatic reversal of a temporary action"""
+        key = (guild.id, user_id, action)
+        if seconds is None:
+            self._clear_expiry(key)
+            return
+        expiry = Expiry(guild.id, user_id, action, datetime.now().timestamp() + seconds, case.id if case else None)
+        self.expiries.put(expiry)
+        self.expiry_timers.schedule(key, expiry.due, expiry)
+
+    def _clear_expiry(self, key: tuple):
+        if self.expiry_timers.cancel(key):
+            self.expiries.delete(key)
+
+    @staticmethod
+    def _split_duration(text: str):
+        """`("30m spam")` -> `(1800, "spam")`; text without a leading duration -> `(None, text)`"""
+        first, _, rest = text.partition(" ")
+        seconds = parse_duration(first)
+        if seconds is None:
+            return None, text
+        return seconds, rest.strip() or "No reason provided"
+
+    async def _ban(self, ctx, user: discord.abc.User, seconds, reason: str):
+        try:
+            await ctx.guild.ban(user, reason=reason, delete_message_days=7)
+        except Exception as e:
+            return await ctx.send(f"❌ Failed to ban: {e}")
+
+        until = f" for {format_duration(seconds)}" if seconds else ""
+        await ctx.send(f"✅ {user.display_name} has been banned{until}.")
+        case = await self.log_action("Ban", ctx.author, user, reason + until)
+        self._schedule_expiry(ctx.guild, user.id, "unban", seconds, case)
+
     @commands.command()
     @is_admin_or_owner()
     async def ban(self, ctx, member: discord.Member, *, reason: str = "No reason provided"):
-        """Ban a member from the server"""
-        try:
-            await member.ban(reason=reason, delete_message_days=7)
-            await ctx.send(f"✅ {member.display_name} has been banned.")
-            await self.log_action("Ban", ctx.author, member, reason)
-        except Exception as e:
-            await ctx.send(f"❌ Failed to ban: {e}")
+        """Ban a member from the server (!ban @x [7d] [reason] for a temporary ban)"""
+        seconds, reason = self._split_duration(reason)
+        await self._ban(ctx, member, seconds, reason)
+
+    @commands.command()
+    @is_admin_or_owner()
+    async def tempban(self, ctx, user: discord.User, duration: str, *, reason: str = "No reason provided"):
+        """Ban a user for a while (!tempban @x 7d [reason])"""
+        seconds = parse_duration(duration)
+        if seconds is None:
+            return await ctx.send("❌ Invalid duration! Use like `30m`, `12h` or `7d`")
+        await self._ban(ctx, user, seconds, reason)
 
     @commands.command()
     @is_admin_or_owner()
@@ -74,6 +264,7 @@ class Moderation(commands.Cog):
         try:
             user = await self.bot.fetch_user(user_id)
             await ctx.guild.unban(user)
+            self._clear_expiry((ctx.guild.id, user.id, "unban"))
             await ctx.send(f"✅ {user.name} has been unbanned.")
             await self.log_action("Unban", ctx.author, user)
         except Exception as e:
@@ -82,44 +273,293 @@ class Moderation(commands.Cog):
     @commands.command()
     @is_admin_or_owner()
     async def mute(self, ctx, member: discord.Member, *, reason: str = "No reason provided"):
-        """Mute a member (requires 'Muted' role setup)"""
-        if not self.mute_role:
+        """Mute a member (!mute @x [30m] [reason]; requires a mute role)"""
+        mute_role = await self.config.mute_role(ctx.guild)
+        if not mute_role:
             return await ctx.send("❌ Mute role not configured!")
 
+        seconds, reason = self._split_duration(reason)
         try:
-            await member.add_roles(self.mute_role, reason=reason)
-            await ctx.send(f"🔇 {member.display_name} has been muted.")
-            await self.log_action("Mute", ctx.author, member, reason)
+            await member.add_roles(mute_role, reason=reason)
         except Exception as e:
-            await ctx.send(f"❌ Failed to mute: {e}")
+            return await ctx.send(f"❌ Failed to mute: {e}")
+
+        until = f" for {format_duration(seconds)}" if seconds else ""
+        await ctx.send(f"🔇 {member.display_name} has been muted{until}.")
+        case = await self.log_action("Mute", ctx.author, member, reason + until)
+        self._schedule_expiry(ctx.guild, member.id, "unmute", seconds, case)
 
     @commands.command()
     @is_admin_or_owner()
     async def unmute(self, ctx, member: discord.Member):
         """Unmute a member"""
-        if not self.mute_role:
+        mute_role = await self.config.mute_role(ctx.guild)
+        if not mute_role:
             return await ctx.send("❌ Mute role not configured!")
 
         try:
-            await member.remove_roles(self.mute_role)
+            await member.remove_roles(mute_role)
+            self._clear_expiry((ctx.guild.id, member.id, "unmute"))
             await ctx.send(f"🔊 {member.display_name} has been unmuted.")
             await self.log_action("Unmute", ctx.author, member)
         except Exception as e:
             await ctx.send(f"❌ Failed to unmute: {e}")
 
+    async def _expire(self, expiry: Expiry):
+        """Reverse one temporary action; raises SkipTarget when there's nothing left to undo"""
+        guild = self.bot.get_guild(expiry.guild_id)
+        if guild is None:
+            raise SkipTarget("Bot is no longer in the server")
+        reason = f"Temporary {'mute' if expiry.action == 'unmute' else 'ban'} expired" + (
+            f" (case #{expiry.case_id})" if expiry.case_id else "")
+
+        if expiry.action == "unban":
+            try:
+                await guild.unban(discord.Object(expiry.user_id), reason=reason)
+            except discord.NotFound:
+                raise SkipTarget("Already unbanned")
+            await self.log_action("Unban", guild.me, discord.Object(expiry.user_id), reason)
+        else:
+            member = await self.bot.member_cache.fetch(guild, expiry.user_id)
+            mute_role = await self.config.mute_role(guild)
+            if member is None or mute_role is None or mute_role not in member.roles:
+                raise SkipTarget("Nothing to unmute")
+            await member.remove_roles(mute_role, reason=reason)
+            await self.log_action("Unmute", guild.me, member, reason)
+
+    async def apply_expiries(self, expiries: list):
+        """Scheduler callback: reverse a batch of due actions, rescheduling failures with backoff"""
+        await self.bot.wait_until_ready()
+        report = await BulkRunner(self._expire, concurrency=BULK_CONCURRENCY).run(expiries)
+
+        for expiry in (*report.succeeded, *(expiry for expiry, _ in report.skipped)):
+            if expiry.key not in self.expiry_timers:  # unless re-issued while this attempt was running
+                self.expiries.delete(expiry.key)
+        for expiry, error in report.failed:
+            if expiry.key in self.expiry_timers:
+                continue
+            expiry.attempts += 1
+            if expiry.attempts >= EXPIRY_MAX_ATTEMPTS:
+                print(f"❌ Giving up on {expiry.action} of {expiry.user_id} in {expiry.guild_id}: {error}")
+                self.expiries.delete(expiry.key)
+                continue
+            expiry.due = datetime.now().timestamp() + EXPIRY_RETRY_DELAY * 2 ** (expiry.attempts - 1)
+            self.expiries.put(expiry)
+            self.expiry_timers.schedule(expiry.key, expiry.due, expiry)
+
+    async def _bulk_targets(self, ctx, targets: list, flags: BulkFlags):
+        """IDs picked explicitly plus every member matching the --joined/--created filters, and the members
+        among them by ID (None if a filter is invalid)"""
+        ids = dict.fromkeys(target.id for target in targets)
+        joined = parse_duration(flags.joined) if flags.joined else None
+        created = parse_duration(flags.created) if flags.created else None
+        if (flags.joined and joined is None) or (flags.created and created is None):
+            return None
+
+        members = {user_id: ctx.guild.get_member(user_id) for user_id in ids}
+        if joined or created or None in members.values():
+            # Members outside the cache (see MEMBER_CACHE) come from one member list request
+            members = {member.id: member for member in await self.bot.member_cache.members(ctx.guild)}
+        if joined or created:
+            now = discord.utils.utcnow()
+            for member in members.values():
+                if joined and (member.joined_at is None or now - member.joined_at > timedelta(seconds=joined)):
+                    continue
+                if created and now - member.created_at > timedelta(seconds=created):
+                    continue
+                ids[member.id] = None
+        return list(ids), members
+
+    def _skip_reason(self, ctx, user_id: int, member: discord.Member = None):
+        """Why `user_id` must not be actioned by the invoking moderator, or None"""
+        if user_id == ctx.author.id:
+            return "That's you"
+        if user_id == ctx.guild.me.id:
+            return "That's me"
+        if user_id == ctx.guild.owner_id:
+            return "Server owner"
+        if member is None:
+            return None
+        if member.top_role >= ctx.guild.me.top_role:
+            return "Role is above mine"
+        if ctx.author.id != ctx.guild.owner_id and member.top_role >= ctx.author.top_role:
+            return "Role is above yours"
+        return None
+
+    async def _run_bulk(self, ctx, name: str, verb: str, targets: list, flags: BulkFlags, action,
+                        batch_size: int = 1):
+        """Shared driver for the mass commands: filter, run, report progress, summarise.
+
+        `action` gets the user ID, or a batch of them, plus the members found by ID.
+        """
+        resolved = await self._bulk_targets(ctx, targets, flags)
+        if resolved is None:
+            return await ctx.send("❌ Invalid duration! Use like `30m`, `12h` or `7d`")
+        user_ids, members = resolved
+        if not user_ids:
+            return await ctx.send("⚠️ No members matched.")
+
+        skipped, eligible = [], []
+        for user_id in user_ids:
+            reason = self._skip_reason(ctx, user_id, members.get(user_id))
+            if reason:
+                skipped.append((user_id, reason))
+            else:
+                eligible.append(user_id)
+
+        status = await ctx.send(f"⏳ {verb} {len(user_ids)} members…")
+
+        async def show_progress(report):
+            await status.edit(content=f"⏳ {verb} {report.progress()}")
+
+        runner = BulkRunner(
+            functools.partial(action, members=members),
+            concurrency=BULK_CONCURRENCY,
+            batch_size=batch_size,
+            on_progress=show_progress
+        )
+        report = await runner.run(eligible, skipped=skipped)
+
+        def lines(entries, describe):
+            shown = [describe(entry) for entry in entries[:BULK_REPORT_LINES]]
+            if len(entries) > BULK_REPORT_LINES:
+                shown.append(f"…and {len(entries) - BULK_REPORT_LINES} more")
+            return shown
+
+        fields = [
+            *paginated_fields(f"✅ Succeeded ({len(report.succeeded)})", lines(report.succeeded, lambda id_: f"<@{id_}>")),
+            *paginated_fields(f"❌ Failed ({len(report.failed)})", lines(report.failed, lambda e: f"<@{e[0]}> – {e[1]}")),
+            *paginated_fields(f"⏭️ Skipped ({len(report.skipped)})", lines(report.skipped, lambda e: f"<@{e[0]}> – {e[1]}"))
+        ]
+        embeds = build_embeds(f"🛠️ {verb} finished", 0xFF0000, fields)
+        await status.edit(content=None, embeds=message_groups(embeds)[0])
+        if report.succeeded:
+            created_at = datetime.now().timestamp()
+            for user_id in report.succeeded:
+                self.cases.add(ctx.guild.id, name, user_id, ctx.author.id, flags.reason, created_at)
+            await self.log_action(
+                f"Mass {name}", ctx.author, None, f"{flags.reason} ({len(report.succeeded)} members)",
+                record_case=False
+            )
+
+    @commands.command(name="massban")
+    @is_admin_or_owner()
+    async def mass_ban(self, ctx, targets: commands.Greedy[discord.Object], *, flags: BulkFlags):
+        """Ban many users at once (!massban @a 123… --joined 30m --created 7d --reason raid)"""
+        async def ban_batch(batch, members):
+            result = await ctx.guild.bulk_ban(
+                [discord.Object(user_id) for user_id in batch],
+                reason=flags.reason,
+                delete_message_seconds=7 * 86400
+            )
+            return [user.id for user in result.banned], [user.id for user in result.failed]
+
+        await self._run_bulk(ctx, "Ban", "Banning", targets, flags, ban_batch, batch_size=BULK_BAN_BATCH)
+
+    @commands.command(name="masskick")
+    @is_admin_or_owner()
+    async def mass_kick(self, ctx, targets: commands.Greedy[discord.Object], *, flags: BulkFlags):
+        """Kick many members at once (same filters as !massban)"""
+        async def kick(user_id, members):
+            member = members.get(user_id)
+            if member is None:
+                raise SkipTarget("Not in server")
+            await member.kick(reason=flags.reason)
+
+        await self._run_bulk(ctx, "Kick", "Kicking", targets, flags, kick)
+
+    @commands.command(name="massmute")
+    @is_admin_or_owner()
+    async def mass_mute(self, ctx, targets: commands.Greedy[discord.Object], *, flags: BulkFlags):
+        """Mute many members at once (same filters as !massban)"""
+        mute_role = await self.config.mute_role(ctx.guild)
+        if not mute_role:
+            return await ctx.send("❌ Mute role not configured!")
+
+        async def mute(user_id, members):
+            member = members.get(user_id)
+            if member is None:
+                raise SkipTarget("Not in server")
+            if mute_role in member.roles:
+                raise SkipTarget("Already muted")
+            await member.add_roles(mute_role, reason=flags.reason)
+
+        await self._run_bulk(ctx, "Mute", "Muting", targets, flags, mute)
+
     @commands.command()
     @is_admin_or_owner()
-    async def purge(self, ctx, amount: int = 5):
-        """Bulk delete messages (default: 5)"""
-        if not 1 <= amount <= 100:
-            return await ctx.send("❌ Amount must be between 1-100")
+    async def purge(self, ctx, amount: typing.Optional[int] = 5, *, flags: PurgeFlags):
+        """Bulk delete messages (!purge 500 --user @x --match regex --bots yes --older 14d, or just !purge --user @x)"""
+        if not 1 <= amount <= PURGE_MAX:
+            return await ctx.send(f"❌ Amount must be between 1-{PURGE_MAX}")
+        if ctx.channel.id in self.purges:
+            return await ctx.send("⚠️ A purge is already running in this channel.")
 
         try:
-            await ctx.channel.purge(limit=amount + 1)  # +1 to include the command
-            msg = await ctx.send(f"🧹 Deleted {amount} messages.", delete_after=3)
-            await self.log_action("Purge", ctx.author, None, f"{amount} messages in {ctx.channel.mention}")
-        except Exception as e:
-            await ctx.send(f"❌ Failed to purge: {e}")
+            check = self._purge_check(flags)
+        except ValueError as e:
+            return await ctx.send(f"❌ {e}")
+
+        filtered = any((flags.user, flags.match, flags.attachments, flags.bots, flags.older, flags.newer))
+        engine = PurgeEngine(
+            ctx.channel,
+            check,
+            limit=amount,
+            scan_limit=flags.scan or (PURGE_SCAN_LIMIT if filtered else amount),
+            before=ctx.message
+        )
+        self.purges[ctx.channel.id] = engine
+        status = await ctx.send(f"🧹 Purging up to {amount} messages…", view=CancelView(ctx.author.id, engine.cancel))
+
+        async def show_progress(stats):
+            await status.edit(content=f"🧹 Purging… {stats.progress()}")
+        engine.on_progress = show_progress
+
+        try:
+            await ctx.message.delete()
+            stats = await engine.run()
+        except discord.HTTPException as e:
+            return await status.edit(content=f"❌ Failed to purge: {e}", view=None)
+        finally:
+            self.purges.pop(ctx.channel.id, None)
+
+        verb = "Cancelled after deleting" if stats.cancelled else "Deleted"
+        await status.edit(
+            content=f"🧹 {verb} {stats.deleted} messages ({stats.progress()}).",
+            view=None,
+            delete_after=10
+        )
+        if stats.deleted:
+            await self.log_action("Purge", ctx.author, None, f"{stats.deleted} messages in {ctx.channel.mention}")
+
+    @staticmethod
+    def _purge_check(flags: PurgeFlags):
+        """Build the message filter for !purge; raises ValueError on a bad pattern or duration"""
+        try:
+            pattern = re.compile(flags.match, re.IGNORECASE) if flags.match else None
+        except re.error as e:
+            raise ValueError(f"Invalid pattern: {e}")
+        older = parse_duration(flags.older) if flags.older else None
+        newer = parse_duration(flags.newer) if flags.newer else None
+        if (flags.older and older is None) or (flags.newer and newer is None):
+            raise ValueError("Invalid duration! Use like `30m`, `12h` or `7d`")
+        author_id = flags.user.id if flags.user else None
+
+        def check(message: discord.Message) -> bool:
+            if author_id and message.author.id != author_id:
+                return False
+            if flags.bots and not message.author.bot:
+                return False
+            if flags.attachments and not message.attachments:
+                return False
+            if pattern and not pattern.search(message.content):
+                return False
+            if older or newer:
+                age = (discord.utils.utcnow() - message.created_at).total_seconds()
+                if (older and age < older) or (newer and age > newer):
+                    return False
+            return True
+        return check
 
     @commands.command()
     @is_admin_or_owner()
@@ -132,6 +572,86 @@ class Moderation(commands.Cog):
         except Exception as e:
             await ctx.send(f"❌ Couldn't DM warning: {e}")
 
+    @staticmethod
+    def _case_line(case) -> str:
+        target = f" <@{case.target_id}>" if case.target_id else ""
+        reason = f" – {case.reason}" if case.reason else ""
+        return f"`#{case.id}` **{case.action}**{target} by <@{case.moderator_id}> <t:{int(case.created_at)}:R>{reason}"
+
+    async def _send_case_page(self, ctx, cases: list, title: str, empty: str, next_command: str):
+        """One page of a case listing; `cases` holds up to one more than a page to tell if there's another"""
+        if not cases:
+            return await ctx.send(empty)
+
+        page = cases[:CASES_PER_PAGE]
+        embed = discord.Embed(
+            title=title,
+            description="\n".join(self._case_line(case) for case in page)[:4096],
+            color=0xFF0000
+        )
+        if len(cases) > CASES_PER_PAGE:
+            embed.set_footer(text=f"Older cases: {next_command} {page[-1].id}")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="cases")
+    @is_admin_or_owner()
+    async def list_cases(self, ctx, user: discord.User, before: int = None):
+        """Show a user's moderation history, newest first (!cases @user [before case #])"""
+        cases = await self.cases.for_target(ctx.guild.id, user.id, before_id=before, limit=CASES_PER_PAGE + 1)
+        await self._send_case_page(
+            ctx, cases, f"📁 Cases for {user.name}",
+            f"📭 No {'older ' if before else ''}cases for {user.name}.", f"!cases {user.id}"
+        )
+
+    @commands.command(name="modcases")
+    @is_admin_or_owner()
+    async def list_moderator_cases(self, ctx, moderator: discord.User, before: int = None):
+        """Show the actions a moderator took, newest first (!modcases @mod [before case #])"""
+        cases = await self.cases.for_moderator(ctx.guild.id, moderator.id, before_id=before, limit=CASES_PER_PAGE + 1)
+        await self._send_case_page(
+            ctx, cases, f"📁 Cases by {moderator.name}",
+            f"📭 No {'older ' if before else ''}cases by {moderator.name}.", f"!modcases {moderator.id}"
+        )
+
+    @commands.command(name="case")
+    @is_admin_or_owner()
+    async def show_case(self, ctx, case_id: int):
+        """Show a single moderation case"""
+        case = await self.cases.get(ctx.guild.id, case_id)
+        if not case:
+            return await ctx.send(f"❌ No case #{case_id} in this server.")
+
+        embed = discord.Embed(
+            title=f"📁 Case #{case.id} – {case.action}",
+            color=0xFF0000,
+            timestamp=datetime.fromtimestamp(case.created_at)
+        )
+        embed.add_field(name="Moderator", value=f"<@{case.moderator_id}>", inline=True)
+        if case.target_id:
+            embed.add_field(name="Target", value=f"<@{case.target_id}>", inline=True)
+        embed.add_field(name="Reason", value=case.reason or "No reason provided", inline=False)
+        await ctx.send(embed=embed)
+
+    @commands.command(name="modstats")
+    @is_admin_or_owner()
+    async def mod_stats(self, ctx, days: int = 30):
+        """Moderation activity over the last N days (default 30)"""
+        since = (datetime.now() - timedelta(days=days)).timestamp()
+        actions, moderators = await self.cases.stats(ctx.guild.id, since)
+        embed = discord.Embed(title=f"📊 Moderation – last {days} days", color=0xFF0000)
+        embed.add_field(
+            name="Actions",
+            value="\n".join(f"{action}: **{count}**" for action, count in actions.items()) or "None",
+            inline=True
+        )
+        embed.add_field(
+            name="Top moderators",
+            value="\n".join(f"<@{moderator_id}>: **{count}**" for moderator_id, count in moderators) or "None",
+            inline=True
+        )
+        embed.set_footer(text=f"{sum(actions.values())} cases")
+        await ctx.send(embed=embed)
+
 
 async def setup(bot): #
     await bot.add_cog(Moderation(bot))
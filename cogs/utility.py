@@ -1,8 +1,19 @@
 # cogs/utility.py
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import asyncio
+import itertools
+import os
+
+from utils.cluster import CLUSTER
+from utils.durations import format_duration, parse_duration
+from utils.embeds import truncate
+from utils.polls import POLL_EMOJIS, Poll, PollButtons
+from utils.reminder_store import NO_CURSOR, Reminder, ReminderStore
+from utils.senders import ChannelSendQueue
+from utils.timers import DeadlineScheduler
 
 
 class Utility(commands.Cog):
@@ -10,8 +21,79 @@ class Utility(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.reminders = {}
-        self.poll_cache = {}
+        self.reminders = DeadlineScheduler(self.deliver_reminders)
+        self.reminder_sender = ChannelSendQueue(self._send_reminders, maxsize=0)
+        self.reminder_store = ReminderStore(os.getenv("REMINDER_DB", "reminders.db"))
+        self.reminder_window = 6 * 3600   # Only reminders due this soon are kept in memory
+        self.catchup_burst = 20           # Overdue reminders delivered per catch-up step...
+        self.catchup_interval = 2.0       # ...every this many seconds
+        self._loaded_until = 0.0
+        self._reminder_ids = None
+        self._pager = None
+        self.poll_cache = OrderedDict()  # message ID -> Poll, least recently active first
+        self.poll_timers = DeadlineScheduler(self.close_polls)
+        self._poll_edits = {}            # message ID -> pending debounced edit task
+        self._poll_views = {}            # message ID -> PollButtons, for button polls
+        self.poll_cache_size = 500
+        self.poll_duration = int(os.getenv("POLL_DURATION", 86400))
+        self.poll_edit_interval = 3.0
+        self.poll_single_vote = os.getenv("POLL_SINGLE_VOTE", "true").lower() != "false"
+        self.poll_mode = os.getenv("POLL_MODE", "reactions").lower()  # reactions | buttons | native
+        self.poll_seed_spacing = 0.05    # Gap between pipelined add_reaction calls
+        self._poll_tasks = set()         # background reaction seeding and final edits of evicted polls
+
+    async def cog_load(self):
+        """Restore reminders: overdue ones in a bounded catch-up burst, the near-term window into memory"""
+        await self.reminder_store.open()
+        # Worker processes share reminders.db; each allocates, and delivers, its own residue class of IDs
+        self._reminder_ids = itertools.count(
+            CLUSTER.first_id_after(self.reminder_store.max_id), CLUSTER.cluster_count
+        )
+
+        now = datetime.now().timestamp()
+        overdue = [
+            reminder for reminder in await self.reminder_store.due_between(float("-inf"), now, limit=-1)
+            if CLUSTER.owns_id(reminder.id)
+        ]
+        for index, reminder in enumerate(overdue):
+            step = index // self.catchup_burst
+            self.reminders.schedule(reminder.id, now + step * self.catchup_interval, reminder)
+
+        await self._page_in(now + self.reminder_window)
+        self.reminders.start()
+        self._pager = asyncio.create_task(self._page_in_loop())
+        self.poll_timers.start()
+
+    async def cog_unload(self):
+        if self._pager:
+            self._pager.cancel()
+            await asyncio.gather(self._pager, return_exceptions=True)
+        await self.reminders.close()
+        # Anything still queued after this stays in the store and is delivered on the next start
+        await self.reminder_sender.close(timeout=10)
+        await self.poll_timers.close()
+        for task in (*self._poll_edits.values(), *self._poll_tasks):
+            task.cancel()
+        await self.reminder_store.close()
+
+    async def _page_in(self, until: float):
+        """Move reminders due up to `until` from disk into the in-memory scheduler"""
+        start, self._loaded_until = self._loaded_until, until
+        after_id = NO_CURSOR
+        page_size = 10000
+        while True:
+            page = await self.reminder_store.due_between(start, until, limit=page_size, after_id=after_id)
+            for reminder in page:
+                if reminder.id not in self.reminders and CLUSTER.owns_id(reminder.id):
+                    self.reminders.schedule(reminder.id, reminder.due, reminder)
+            if len(page) < page_size:
+                return
+            start, after_id = page[-1].due, page[-1].id
+
+    async def _page_in_loop(self):
+        while True:
+            await asyncio.sleep(self.reminder_window / 2)
+            await self._page_in(datetime.now().timestamp() + self.reminder_window)
 
     @commands.command(name="serverinfo")
     async def server_info(self, ctx):
@@ -68,81 +150,234 @@ class Utility(commands.Cog):
         if len(options) < 2:
             return await ctx.send("❌ Need at least 2 options!")
 
-        emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"]
-        description = []
-
-        for idx, option in enumerate(options):
-            description.append(f"{emojis[idx]} {option}")
-
-        embed = discord.Embed(
-            title=f"📊 {question}",
-            description="\n".join(description),
-            color=0x7289DA
+        if self.poll_mode == "native":
+            return await self._send_native_poll(ctx, question, options)
+
+        poll = Poll(
+            message_id=0,
+            channel_id=ctx.channel.id,
+            question=question,
+            options=options,
+            author_name=ctx.author.display_name,
+            single_vote=self.poll_single_vote,
+            closes_at=datetime.now().timestamp() + self.poll_duration
         )
-        embed.set_footer(text=f"Poll by {ctx.author.display_name}")
+        if self.poll_mode == "buttons":
+            view = PollButtons(poll, self._poll_changed, timeout=self.poll_duration)
+            poll_msg = await ctx.send(embed=poll.to_embed(), view=view)
+        else:
+            view = None
+            poll_msg = await ctx.send(embed=poll.to_embed())
+        poll.message_id = poll_msg.id
+        self._track_poll(poll, view)
+
+        if self.poll_mode != "buttons":
+            # Seed reactions in the background so the command returns as soon as the poll is visible
+            task = asyncio.create_task(self.seed_reactions(poll_msg, POLL_EMOJIS[:len(options)]))
+            self._poll_tasks.add(task)
+            task.add_done_callback(self._poll_tasks.discard)
+
+    async def seed_reactions(self, message, emojis: list):
+        """Pipeline add_reaction calls instead of waiting a full round trip for each one.
+
+        Requests are started in order, `poll_seed_spacing` apart, so they keep
+        their display order; discord.py's per-route limiter spends the reaction
+        bucket's remaining headroom and waits out any reset.
+        """
+        async def add(index, emoji):
+            await asyncio.sleep(index * self.poll_seed_spacing)
+            await message.add_reaction(emoji)
+
+        results = await asyncio.gather(*(add(i, emoji) for i, emoji in enumerate(emojis)), return_exceptions=True)
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            print(f"⚠️ Failed to add {len(failures)} poll reaction(s) to {message.id}: {failures[0]}")
+
+    async def _send_native_poll(self, ctx, question: str, options: tuple):
+        """Discord's built-in poll: votable as soon as it is sent, tallied by Discord"""
+        hours = max(1, min(32 * 24, round(self.poll_duration / 3600)))
+        poll = discord.Poll(question=question[:300], duration=timedelta(hours=hours), multiple=not self.poll_single_vote)
+        for emoji, option in zip(POLL_EMOJIS, options):
+            poll.add_answer(text=option[:55], emoji=emoji)
+        await ctx.send(poll=poll)
+
+    def _track_poll(self, poll: Poll, view: PollButtons = None):
+        self.poll_cache[poll.message_id] = poll
+        if view is not None:
+            self._poll_views[poll.message_id] = view
+        self.poll_timers.schedule(poll.message_id, poll.closes_at, poll)
+        while len(self.poll_cache) > self.poll_cache_size:
+            _, evicted = self.poll_cache.popitem(last=False)
+            # No longer tracked, so close it with its current results rather than leave it votable
+            evicted.closed = True
+            self._forget_poll(evicted)
+            task = asyncio.create_task(self._edit_poll(evicted))
+            self._poll_tasks.add(task)
+            task.add_done_callback(self._poll_tasks.discard)
+
+    def _forget_poll(self, poll: Poll):
+        self.poll_cache.pop(poll.message_id, None)
+        self.poll_timers.cancel(poll.message_id)
+        view = self._poll_views.pop(poll.message_id, None)
+        if view:
+            view.stop()
+        edit = self._poll_edits.pop(poll.message_id, None)
+        if edit:
+            edit.cancel()
 
-        poll_msg = await ctx.send(embed=embed)
-
-        # Cache poll info
-        self.poll_cache[poll_msg.id] = {
-            "question": question,
-            "options": options,
-            "author": ctx.author.id
-        }
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        poll = self.poll_cache.get(payload.message_id)
+        if poll is None or payload.user_id == self.bot.user.id:
+            return
+        if poll.add_vote(payload.user_id, str(payload.emoji)):
+            self._poll_changed(poll)
 
-        # Add reactions
-        for i in range(len(options)):
-            await poll_msg.add_reaction(emojis[i])
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload):
+        poll = self.poll_cache.get(payload.message_id)
+        if poll is None or payload.user_id == self.bot.user.id:
+            return
+        if poll.remove_vote(payload.user_id, str(payload.emoji)):
+            self._poll_changed(poll)
+
+    def _poll_changed(self, poll: Poll):
+        """Mark a poll dirty; at most one embed edit per debounce interval"""
+        if poll.message_id not in self.poll_cache:
+            return
+        self.poll_cache.move_to_end(poll.message_id)
+        if poll.message_id not in self._poll_edits:
+            self._poll_edits[poll.message_id] = asyncio.create_task(self._edit_poll_later(poll))
+
+    async def _edit_poll_later(self, poll: Poll):
+        await asyncio.sleep(self.poll_edit_interval)
+        self._poll_edits.pop(poll.message_id, None)
+        await self._edit_poll(poll)
+
+    async def _edit_poll(self, poll: Poll):
+        channel = self.bot.get_channel(poll.channel_id)
+        if channel is None:
+            return
+        # Closing a button poll also removes its buttons
+        extra = {"view": None} if poll.closed and self.poll_mode == "buttons" else {}
+        try:
+            await channel.get_partial_message(poll.message_id).edit(embed=poll.to_embed(), **extra)
+        except discord.NotFound:
+            self._forget_poll(poll)
+        except discord.HTTPException as e:
+            print(f"❌ Failed to update poll {poll.message_id}: {e}")
+
+    async def close_polls(self, polls: list):
+        """Post final results for polls that reached their deadline"""
+        for poll in polls:
+            poll.closed = True
+            self._forget_poll(poll)
+            await self._edit_poll(poll)
 
     @commands.command(name="remind")
     async def set_reminder(self, ctx, time: str, *, reminder: str):
         """Set a reminder (!remind 1h30m Do homework)"""
-        seconds = 0
-        time = time.lower()
-
-        if "d" in time:
-            seconds += int(time.split("d")[0]) * 86400
-            time = time.split("d")[1]
-        if "h" in time:
-            seconds += int(time.split("h")[0]) * 3600
-            time = time.split("h")[1]
-        if "m" in time:
-            seconds += int(time.split("m")[0]) * 60
-
-        if seconds <= 0:
-            return await ctx.send("❌ Invalid time format! Use like `1h30m`")
-
-        reminder_time = datetime.now() + timedelta(seconds=seconds)
+        seconds = parse_duration(time)
+        if seconds is None:
+            return await ctx.send("❌ Invalid time format! Use like `30m`, `1h30m` or `2d`")
+
+        reminder = Reminder(
+            id=next(self._reminder_ids),
+            user_id=ctx.author.id,
+            channel_id=ctx.channel.id,
+            message=reminder,
+            due=datetime.now().timestamp() + seconds
+        )
+        self._add_reminder(reminder)
 
-        self.reminders[ctx.author.id] = {
-            "time": reminder_time,
-            "message": reminder,
-            "channel": ctx.channel.id
-        }
+        reminder_time = datetime.fromtimestamp(reminder.due)
+        await ctx.send(
+            f"⏰ Reminder #{reminder.id} set for {reminder_time.strftime('%b %d at %H:%M')} "
+            f"(in {format_duration(seconds)})!"
+        )
 
-        await ctx.send(f"⏰ Reminder set for {reminder_time.strftime('%b %d at %H:%M')}!")
+    def _add_reminder(self, reminder: Reminder):
+        self.reminder_store.add(reminder)
+        if reminder.due <= self._loaded_until:
+            self.reminders.schedule(reminder.id, reminder.due, reminder)
+
+    @commands.command(name="reminders")
+    async def list_reminders(self, ctx):
+        """List your pending reminders"""
+        mine = await self.reminder_store.for_user(ctx.author.id, limit=21)
+        if not mine:
+            return await ctx.send("📭 You have no pending reminders.")
+
+        lines = [
+            f"`#{r.id}` {datetime.fromtimestamp(r.due).strftime('%b %d at %H:%M')} – {r.message[:80]}"
+            for r in mine[:20]
+        ]
+        if len(mine) > 20:
+            lines.append("…and more")
+        embed = discord.Embed(title="⏰ Your Reminders", description="\n".join(lines), color=0x7289DA)
+        await ctx.send(embed=embed)
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        """Start reminder loop when bot starts"""
-        self.reminder_loop.start()
-
-    @tasks.loop(minutes=1)
-    async def reminder_loop(self):
-        """Check for due reminders"""
-        now = datetime.now()
-        to_remove = []
-
-        for user_id, reminder in self.reminders.items():
-            if now >= reminder["time"]:
-                channel = self.bot.get_channel(reminder["channel"])
-                if channel:
-                    user = await self.bot.fetch_user(user_id)
-                    await channel.send(f"⏰ Reminder for {user.mention}: {reminder['message']}")
-                to_remove.append(user_id)
-
-        for user_id in to_remove:
-            del self.reminders[user_id]
+    @commands.command(name="unremind")
+    async def cancel_reminder(self, ctx, reminder_id: int):
+        """Cancel one of your reminders (!unremind 3)"""
+        reminder = self.reminders.get(reminder_id) or await self.reminder_store.get(reminder_id)
+        if not reminder or reminder.user_id != ctx.author.id:
+            return await ctx.send("❌ You don't have a reminder with that ID. Try `!reminders`")
+
+        self.reminders.cancel(reminder.id)
+        self.reminder_store.delete(reminder.id)
+        if not CLUSTER.owns_id(reminder.id):
+            # The owning worker checks the row is still there right before delivering
+            await self.reminder_store.flush()
+        await ctx.send(f"🗑️ Reminder #{reminder.id} cancelled.")
+
+    async def deliver_reminders(self, reminders: list):
+        """Queue reminders that just came due, merged into as few messages per channel as fit"""
+        await self.bot.wait_until_ready()
+        if CLUSTER.clustered:
+            # `!unremind` on another worker only deletes the row; skip reminders cancelled that way
+            stored = await self.reminder_store.existing([reminder.id for reminder in reminders])
+            reminders = [reminder for reminder in reminders if reminder.id in stored]
+        now = datetime.now().timestamp()
+        by_channel = {}
+        for reminder in reminders:
+            late = " *(delayed while the bot was offline)*" if now - reminder.due > 60 else ""
+            # A mention only needs the ID, so no user lookup is required
+            by_channel.setdefault(reminder.channel_id, []).append((
+                f"⏰ Reminder for <@{reminder.user_id}>: {reminder.message}{late}", reminder.id
+            ))
+
+        for channel_id, entries in by_channel.items():
+            # Pack lines into messages of up to 2000 characters, remembering which reminders each one carries
+            lines, ids, size = [], [], -1
+            for line, reminder_id in entries:
+                line = truncate(line, 2000)
+                if lines and size + len(line) + 1 > 2000:
+                    self.reminder_sender.submit(channel_id, ("\n".join(lines), ids))
+                    lines, ids, size = [], [], -1
+                lines.append(line)
+                ids.append(reminder_id)
+                size += len(line) + 1
+            self.reminder_sender.submit(channel_id, ("\n".join(lines), ids))
+
+    async def _send_reminders(self, channel_id: int, item: tuple):
+        """Per-channel sender: gateway cache first, REST only on a cache miss.
+
+        Reminders are only deleted from the store once their message is sent
+        (or their channel is gone for good); a failed send leaves them there
+        to be delivered on the next start.
+        """
+        content, reminder_ids = item
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            try:
+                channel = await self.bot.fetch_channel(channel_id)
+            except (discord.NotFound, discord.Forbidden):
+                channel = None
+        if channel is not None:
+            await channel.send(content, allowed_mentions=discord.AllowedMentions(users=True))
+        for reminder_id in reminder_ids:
+            self.reminder_store.delete(reminder_id)
 
 
 async def setup(bot): #
@@ -1,64 +1,283 @@
 # cogs/welcome.py
 import discord
 from discord.ext import commands
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
+import asyncio
 import os
-import json
+import time
+
+from utils.cluster import CLUSTER
+from utils.files import load_json, merge_write_json
+from utils.reaction_roles import ReactionRole, ReactionRoleIndex
+from utils.scheduler import TokenBucket
+
+
+class JoinStats:
+    """Join-rate burst detector plus pipeline counters"""
+
+    def __init__(self, window: float = 30.0, burst_rate: float = 0.5):
+        self.window = window
+        self.burst_rate = burst_rate   # joins/sec over `window` that switches to compact mode
+        self._joins = deque()
+        self.received = 0
+        self.dropped = 0
+        self.announced = 0
+        self.announcements = 0
+        self.dms_sent = 0
+        self.dms_failed = 0
+        self.dms_dropped = 0
+        self.peak_rate = 0.0
+        self.busy_seconds = 0.0        # Time spent announcing, for sustained throughput
+
+    def record_join(self):
+        now = time.monotonic()
+        self._joins.append(now)
+        self.received += 1
+        self.peak_rate = max(self.peak_rate, self.rate)
+
+    @property
+    def rate(self) -> float:
+        cutoff = time.monotonic() - self.window
+        while self._joins and self._joins[0] < cutoff:
+            self._joins.popleft()
+        return len(self._joins) / self.window
+
+    @property
+    def bursting(self) -> bool:
+        return self.rate >= self.burst_rate
+
+    @property
+    def throughput(self):
+        """Joins announced per second of pipeline work"""
+        return self.announced / self.busy_seconds if self.busy_seconds else None
+
+
+@dataclass
+class WelcomeArtefacts:
+    """Everything a join needs, resolved once per guild"""
+    welcome_channel: discord.TextChannel
+    role_channel_id: int
+    rules_channel_id: int
+    rules_mention: str
+    reaction_message_id: int  # None when the bot may not post or read the reaction message
+    reaction_jump_url: str
 
 
 class Welcome(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.welcome_channel_id = 1370163477817196544  # Replace with your welcome channel ID
-        self.role_channel_id = 1370174300421623980     # Replace with your role channel ID
+        # Defaults for guilds without their own `!welcomeconfig`
+        self.welcome_channel_id = int(os.getenv("WELCOME_CHANNEL_ID", 1370163477817196544))
+        self.role_channel_id = int(os.getenv("ROLE_CHANNEL_ID", 1370174300421623980))
+        self.config_file = "welcome_config.json"
+        self.guild_config = {}   # guild ID (str) -> {"welcome_channel_id", "role_channel_id", "reaction_message"}
+        self._artefacts = {}     # guild ID -> WelcomeArtefacts
+        self._reaction_forbidden = set()  # guild IDs already warned about missing reaction-message permissions
         self.reaction_emoji = "🔴"
         self.reaction_role_name = "Arsenal Fan"
         self.reaction_message_file = "reaction_message.json"
+        self.reaction_roles = ReactionRoleIndex("reaction_roles.json")
+        self.join_queue = asyncio.Queue(maxsize=int(os.getenv("WELCOME_QUEUE_SIZE", 5000)))
+        self.dm_queue = asyncio.Queue(maxsize=int(os.getenv("WELCOME_DM_QUEUE_SIZE", 200)))
+        self.dm_bucket = TokenBucket(int(os.getenv("WELCOME_DMS_PER_MINUTE", 30)))
+        self.dm_worker_count = 2
+        self.batch_interval = 2.0      # Joins arriving this close together share one announcement
+        self.batch_size = 40           # Max members listed in one combined embed
+        self.join_stats = JoinStats()
+        self._workers = []
+
+    async def cog_load(self):
+        """Load the reaction-role index once, adopt the legacy welcome reaction message and start the join pipeline"""
+        self.reaction_roles.load()
+        self.guild_config = load_json(self.config_file, {})
+        legacy = load_json(self.reaction_message_file)
+        if legacy and not self.reaction_roles.get(legacy["message_id"], self.reaction_emoji):
+            await self.reaction_roles.bind(ReactionRole(
+                message_id=legacy["message_id"],
+                emoji=self.reaction_emoji,
+                channel_id=legacy.get("channel_id"),
+                role_name=self.reaction_role_name
+            ))
+        self._workers = [asyncio.create_task(self._announce_loop())]
+        self._workers += [asyncio.create_task(self._dm_worker()) for _ in range(self.dm_worker_count)]
+
+    async def cog_unload(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
-        """Send welcome embed and reaction instructions"""
-        channel = self.bot.get_channel(self.welcome_channel_id)
-        if not channel:
+        """Queue the join; announcements and DMs are handled by the pipeline workers"""
+        self.join_stats.record_join()
+        try:
+            self.join_queue.put_nowait(member)
+        except asyncio.QueueFull:
+            self.join_stats.dropped += 1
+
+    async def _announce_loop(self):
+        """Collect joins for `batch_interval` and announce each guild's batch in one message"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.join_queue.get()]
+            deadline = loop.time() + self.batch_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.join_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            started = time.monotonic()
+            by_guild = {}
+            for member in batch:
+                by_guild.setdefault(member.guild.id, []).append(member)
+            for members in by_guild.values():
+                try:
+                    await self._announce(members, compact=self.join_stats.bursting)
+                except Exception as e:
+                    print(f"❌ Failed to welcome {len(members)} member(s): {e}")
+            self.join_stats.busy_seconds += time.monotonic() - started
+
+    async def _announce(self, members: list, *, compact: bool):
+        """Send one welcome embed for the batch and queue DMs (skipped in compact mode)"""
+        guild = members[0].guild
+        artefacts = await self.get_artefacts(guild)
+        if artefacts is None:
             return
+        channel, rules, role_channel_id = artefacts.welcome_channel, artefacts.rules_mention, artefacts.role_channel_id
 
-        # Send embed in welcome channel
-        embed = discord.Embed(
-            title=f"🌟 Welcome {member.display_name}!",
-            description=(
-                f"➤ Read {member.guild.rules_channel.mention} pinned message\n"
-                f"➤ Pick roles in <#{self.role_channel_id}>\n"
-                f"➤ Enjoy your stay!"
-            ),
-            color=0xEF0107,
-            timestamp=datetime.now()
-        )
-        embed.set_thumbnail(url=member.display_avatar.url)
-        embed.set_footer(text=f"Member #{member.guild.member_count}")
-        await channel.send(embed=embed)
+        if len(members) == 1 and not compact:
+            member = members[0]
+            embed = discord.Embed(
+                title=f"🌟 Welcome {member.display_name}!",
+                description=(
+                    f"➤ Read {rules} pinned message\n"
+                    f"➤ Pick roles in <#{role_channel_id}>\n"
+                    f"➤ Enjoy your stay!"
+                ),
+                color=0xEF0107,
+                timestamp=datetime.now()
+            )
+            embed.set_thumbnail(url=member.display_avatar.url)
+        else:
+            names = ", ".join(member.mention for member in members)
+            embed = discord.Embed(
+                title=f"🌟 Welcome to our {len(members)} new members!",
+                description=f"{names}\n\n➤ Read {rules} · Pick roles in <#{role_channel_id}>"[:4096],
+                color=0xEF0107,
+                timestamp=datetime.now()
+            )
+        embed.set_footer(text=f"Member #{guild.member_count}")
+        await channel.send(embed=embed, allowed_mentions=discord.AllowedMentions.none())
+        self.join_stats.announced += len(members)
+        self.join_stats.announcements += 1
 
-        # Create or get existing reaction message
-        message = await self.get_or_create_reaction_message(channel)
+        if compact:
+            return  # During a raid, DMs are skipped entirely
 
-        # Send DM with direct link to reaction message
-        try:
-            await member.send(
-                f"**Welcome to {member.guild.name}!** ⚽\n\n"
-                f"➤ Rules: {member.guild.rules_channel.mention}\n"
-                f"➤ Roles: <#{self.role_channel_id}>\n"
-                f"➤ React with {self.reaction_emoji} to [this message]({message.jump_url}) "
+        content = (
+            f"**Welcome to {guild.name}!** ⚽\n\n"
+            f"➤ Rules: {rules}\n"
+            f"➤ Roles: <#{role_channel_id}>"
+        )
+        if artefacts.reaction_jump_url:
+            content += (
+                f"\n➤ React with {self.reaction_emoji} to [this message]({artefacts.reaction_jump_url}) "
                 f"to get the **{self.reaction_role_name}** role!"
             )
-        except discord.Forbidden:
-            pass  # DMs disabled
-
-    async def get_or_create_reaction_message(self, channel):
-        """Ensure the reaction message exists; create if not"""
-        if os.path.exists(self.reaction_message_file):
-            with open(self.reaction_message_file, "r") as f:
-                data = json.load(f)
+        for member in members:
             try:
-                return await self.bot.get_channel(data["channel_id"]).fetch_message(data["message_id"])
+                self.dm_queue.put_nowait((member, content))
+            except asyncio.QueueFull:
+                self.join_stats.dms_dropped += 1
+
+    async def _dm_worker(self):
+        """Send welcome DMs no faster than the DM token bucket allows"""
+        while True:
+            member, content = await self.dm_queue.get()
+            delay = self.dm_bucket.delay()
+            if delay:
+                await asyncio.sleep(delay)
+            self.dm_bucket.take()
+            try:
+                await member.send(content)
+                self.join_stats.dms_sent += 1
+            except discord.HTTPException:
+                self.join_stats.dms_failed += 1  # DMs disabled or rate limited
+
+    def _config_for(self, guild_id: int) -> dict:
+        config = self.guild_config.setdefault(str(guild_id), {})
+        config.setdefault("welcome_channel_id", self.welcome_channel_id)
+        config.setdefault("role_channel_id", self.role_channel_id)
+        return config
+
+    async def _save_config(self):
+        data = {key: config for key, config in self.guild_config.items() if CLUSTER.owns_guild(int(key))}
+        await asyncio.to_thread(merge_write_json, self.config_file, data, lambda key: CLUSTER.owns_guild(int(key)))
+
+    async def get_artefacts(self, guild: discord.Guild):
+        """Per-guild welcome artefacts; built once, then served without any REST calls"""
+        artefacts = self._artefacts.get(guild.id)
+        if artefacts is not None:
+            return artefacts
+
+        config = self._config_for(guild.id)
+        channel = guild.get_channel(config["welcome_channel_id"])
+        if channel is None:
+            return None
+        message_id, jump_url = await self.get_or_create_reaction_message(guild, channel, config)
+        rules = guild.rules_channel
+        artefacts = WelcomeArtefacts(
+            welcome_channel=channel,
+            role_channel_id=config["role_channel_id"],
+            rules_channel_id=rules.id if rules else None,
+            rules_mention=rules.mention if rules else "the rules channel",
+            reaction_message_id=message_id,
+            reaction_jump_url=jump_url
+        )
+        self._artefacts[guild.id] = artefacts
+        return artefacts
+
+    def _invalidate(self, guild_id: int):
+        self._artefacts.pop(guild_id, None)
+
+    async def get_or_create_reaction_message(self, guild: discord.Guild, channel, config: dict):
+        """Ensure the guild's reaction message exists (create if not); returns `(message_id, jump_url)`.
+
+        Returns `(None, None)` when the bot lacks permissions for it, so joins
+        are still welcomed, just without the reaction-role step.
+        """
+        try:
+            result = await self._get_or_create_reaction_message(guild, channel, config)
+        except discord.Forbidden as e:
+            if guild.id not in self._reaction_forbidden:
+                self._reaction_forbidden.add(guild.id)
+                print(f"⚠️ Can't set up the reaction message in {guild.name} ({guild.id}), skipping it: {e}")
+            return None, None
+        self._reaction_forbidden.discard(guild.id)
+        return result
+
+    async def _get_or_create_reaction_message(self, guild: discord.Guild, channel, config: dict):
+        ref = config.get("reaction_message")
+        if ref is None:
+            # Adopt the pre-per-guild message if it lives in this guild
+            legacy = load_json(self.reaction_message_file)
+            if legacy and guild.get_channel(legacy["channel_id"]) is not None:
+                ref = legacy
+        if ref:
+            ref_channel = guild.get_channel(ref["channel_id"])
+            try:
+                if ref_channel is not None:
+                    message = await ref_channel.fetch_message(ref["message_id"])
+                    if config.get("reaction_message") != ref:
+                        config["reaction_message"] = ref
+                        await self._save_config()
+                    return message.id, message.jump_url
             except discord.NotFound:
                 pass  # Message deleted or invalid
 
@@ -66,10 +285,69 @@ class Welcome(commands.Cog):
         msg = await channel.send(f"React with {self.reaction_emoji} to get the **{self.reaction_role_name}** role!")
         await msg.add_reaction(self.reaction_emoji)
 
-        with open(self.reaction_message_file, "w") as f:
-            json.dump({"message_id": msg.id, "channel_id": channel.id}, f)
+        config["reaction_message"] = {"message_id": msg.id, "channel_id": channel.id}
+        await self._save_config()
+        await self.reaction_roles.bind(ReactionRole(
+            message_id=msg.id,
+            emoji=self.reaction_emoji,
+            guild_id=guild.id,
+            channel_id=channel.id,
+            role_name=self.reaction_role_name
+        ))
+
+        return msg.id, msg.jump_url
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        artefacts = self._artefacts.get(after.guild.id)
+        if artefacts and after.id in (artefacts.welcome_channel.id, artefacts.rules_channel_id):
+            self._invalidate(after.guild.id)
 
-        return msg
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        artefacts = self._artefacts.get(channel.guild.id)
+        if artefacts and channel.id in (artefacts.welcome_channel.id, artefacts.rules_channel_id):
+            self._invalidate(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        # The rules channel is a guild setting, not a channel one
+        if before.rules_channel != after.rules_channel:
+            self._invalidate(after.id)
+
+    @commands.group(name="welcomeconfig", invoke_without_command=True)
+    @commands.has_permissions(administrator=True)
+    async def welcome_config(self, ctx):
+        """Show this server's welcome settings"""
+        config = self._config_for(ctx.guild.id)
+        ref = config.get("reaction_message")
+        embed = discord.Embed(title="🌟 Welcome Settings", color=0xEF0107)
+        embed.add_field(name="Welcome channel", value=f"<#{config['welcome_channel_id']}>", inline=True)
+        embed.add_field(name="Roles channel", value=f"<#{config['role_channel_id']}>", inline=True)
+        embed.add_field(
+            name="Reaction message",
+            value=f"`{ref['message_id']}` in <#{ref['channel_id']}>" if ref else "Created on the next join",
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
+    @welcome_config.command(name="channel")
+    @commands.has_permissions(administrator=True)
+    async def welcome_config_channel(self, ctx, channel: discord.TextChannel):
+        """Set where welcome messages are posted"""
+        self._config_for(ctx.guild.id)["welcome_channel_id"] = channel.id
+        await self._save_config()
+        self._invalidate(ctx.guild.id)
+        await ctx.send(f"✅ Welcome messages will be posted in {channel.mention}.")
+
+    @welcome_config.command(name="roles")
+    @commands.has_permissions(administrator=True)
+    async def welcome_config_roles(self, ctx, channel: discord.TextChannel):
+        """Set the channel new members are pointed to for roles"""
+        self._config_for(ctx.guild.id)["role_channel_id"] = channel.id
+        await self._save_config()
+        self._invalidate(ctx.guild.id)
+        await ctx.send(f"✅ New members will be pointed to {channel.mention} for roles.")
 
     @commands.command(name="testwelcome")
     @commands.has_permissions(administrator=True)
@@ -79,42 +357,174 @@ class Welcome(commands.Cog):
         await self.on_member_join(member)
         await ctx.send(f"✅ Simulated welcome for {member.mention}")
 
+    async def _resolve_role(self, guild: discord.Guild, binding: ReactionRole):
+        """Role for a binding; name-following bindings are resolved by name once, then by ID"""
+        if binding.role_id is None:
+            if not binding.role_name:
+                return None
+            role = discord.utils.get(guild.roles, name=binding.role_name)
+            if role is None:
+                return None
+            binding.role_id, binding.guild_id = role.id, guild.id
+            await self.reaction_roles.save()
+        return guild.get_role(binding.role_id)
+
+    @commands.command(name="welcomestats")
+    @commands.has_permissions(administrator=True)
+    async def welcome_stats(self, ctx):
+        """Show join pipeline throughput and queue health (admin only)"""
+        stats = self.join_stats
+        throughput = f"{stats.throughput:.1f} joins/s" if stats.throughput else "n/a"
+        embed = discord.Embed(title="🌟 Welcome Pipeline", color=0xEF0107)
+        embed.add_field(
+            name="Joins",
+            value=(
+                f"{stats.received} received | {stats.announced} announced in {stats.announcements} messages | "
+                f"{stats.dropped} dropped"
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Rate",
+            value=(
+                f"{stats.rate:.2f}/s now | {stats.peak_rate:.2f}/s peak | sustained {throughput}\n"
+                f"Mode: {'🚨 compact (burst)' if stats.bursting else 'normal'}"
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="DMs",
+            value=(
+                f"{stats.dms_sent} sent | {stats.dms_failed} failed | {stats.dms_dropped} dropped | "
+                f"{self.dm_queue.qsize()} queued"
+            ),
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
-        if payload.member and payload.member.bot:
-            return
-        if not os.path.exists(self.reaction_message_file):
+        binding = self.reaction_roles.get(payload.message_id, str(payload.emoji))
+        if binding is None or payload.guild_id is None:
             return
-
-        with open(self.reaction_message_file, "r") as f:
-            data = json.load(f)
-
-        if payload.message_id != data["message_id"] or str(payload.emoji) != self.reaction_emoji:
+        if payload.member and payload.member.bot:
             return
 
         guild = self.bot.get_guild(payload.guild_id)
         member = payload.member or guild.get_member(payload.user_id)
-        role = discord.utils.get(guild.roles, name=self.reaction_role_name)
+        role = await self._resolve_role(guild, binding)
         if role and member:
             await member.add_roles(role, reason="Reacted to gain role")
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
-        if not os.path.exists(self.reaction_message_file):
-            return
-
-        with open(self.reaction_message_file, "r") as f:
-            data = json.load(f)
-
-        if payload.message_id != data["message_id"] or str(payload.emoji) != self.reaction_emoji:
+        binding = self.reaction_roles.get(payload.message_id, str(payload.emoji))
+        if binding is None or payload.guild_id is None:
             return
 
         guild = self.bot.get_guild(payload.guild_id)
         member = guild.get_member(payload.user_id)
-        role = discord.utils.get(guild.roles, name=self.reaction_role_name)
-        if role and member:
+        if member is None:
+            try:
+                member = await guild.fetch_member(payload.user_id)
+            except discord.NotFound:
+                return
+        role = await self._resolve_role(guild, binding)
+        if role:
             await member.remove_roles(role, reason="Unreacted to remove role")
 
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        await self.reaction_roles.forget_role(role.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        await self._adopt_role_by_name(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        if before.name == after.name:
+            return
+        changed = False
+        for binding in self.reaction_roles.by_name(before.name):
+            if binding.role_id == after.id:
+                binding.role_id = None  # The role no longer carries the name this binding follows
+                changed = True
+        if changed:
+            await self.reaction_roles.save()
+        await self._adopt_role_by_name(after)
+
+    async def _adopt_role_by_name(self, role):
+        changed = False
+        for binding in self.reaction_roles.by_name(role.name):
+            if binding.role_id is None and binding.guild_id in (None, role.guild.id):
+                binding.role_id, binding.guild_id = role.id, role.guild.id
+                changed = True
+        if changed:
+            await self.reaction_roles.save()
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        await self._message_deleted(payload.guild_id, payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        for message_id in payload.message_ids:
+            await self._message_deleted(payload.guild_id, message_id)
+
+    async def _message_deleted(self, guild_id: int, message_id: int):
+        if message_id in self.reaction_roles:
+            await self.reaction_roles.forget_message(message_id)
+        artefacts = self._artefacts.get(guild_id)
+        if artefacts and artefacts.reaction_message_id == message_id:
+            self._config_for(guild_id).pop("reaction_message", None)
+            await self._save_config()
+            self._invalidate(guild_id)
+
+    @commands.group(name="reactionrole", invoke_without_command=True)
+    @commands.has_permissions(administrator=True)
+    async def reaction_role(self, ctx):
+        """List reaction roles in this server"""
+        bindings = self.reaction_roles.for_guild(ctx.guild.id)
+        if not bindings:
+            return await ctx.send("📭 No reaction roles yet. Use `!reactionrole add <message> <emoji> <role>`")
+
+        lines = []
+        for binding in bindings:
+            role = ctx.guild.get_role(binding.role_id) if binding.role_id else None
+            role_text = role.mention if role else f"`{binding.role_name or 'deleted role'}`"
+            where = f"<#{binding.channel_id}>" if binding.channel_id else "unknown channel"
+            lines.append(f"{binding.emoji} → {role_text} on `{binding.message_id}` in {where}")
+        embed = discord.Embed(title="🎭 Reaction Roles", description="\n".join(lines)[:4096], color=0xEF0107)
+        await ctx.send(embed=embed)
+
+    @reaction_role.command(name="add")
+    @commands.has_permissions(administrator=True)
+    async def reaction_role_add(self, ctx, message: discord.Message, emoji: str, *, role: discord.Role):
+        """Give a role to anyone who reacts to a message with an emoji"""
+        await self.reaction_roles.bind(ReactionRole(
+            message_id=message.id,
+            emoji=emoji,
+            role_id=role.id,
+            guild_id=ctx.guild.id,
+            channel_id=message.channel.id
+        ))
+        try:
+            await message.add_reaction(emoji)
+        except discord.HTTPException:
+            pass  # Unknown/foreign emoji: members can still react with it themselves
+        await ctx.send(f"✅ Reacting with {emoji} on that message now gives {role.mention}.")
+
+    @reaction_role.command(name="remove")
+    @commands.has_permissions(administrator=True)
+    async def reaction_role_remove(self, ctx, message_id: int, emoji: str):
+        """Stop a message/emoji pair from giving a role"""
+        binding = self.reaction_roles.get(message_id, emoji)
+        if binding is None or binding.guild_id not in (None, ctx.guild.id):
+            return await ctx.send("❌ No reaction role for that message and emoji.")
+        await self.reaction_roles.unbind(message_id, emoji)
+        await ctx.send(f"🗑️ Removed the {emoji} reaction role from `{message_id}`.")
+
 
 async def setup(bot):
     await bot.add_cog(Welcome(bot))
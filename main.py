@@ -1,47 +1,192 @@
+import asyncio
+import hashlib
+import json
 import os
+import time
 import discord
+import yarl
 from discord.ext import commands
 from dotenv import load_dotenv
 
+STARTED_AT = time.perf_counter()
+
 # Load environment variables
 load_dotenv()
 
+# Read after load_dotenv: the cluster layout comes from the environment
+from utils.cluster import CLUSTER, ClusterCoordinator
+from utils.embeds import build_embeds, message_groups, paginated_fields
+from utils.member_cache import CachePolicy, MemberCache, cache_footprint, resident_memory
+
+TREE_HASH_FILE = os.getenv("TREE_HASH_FILE", "command_tree.sha256")
+MEMORY_REPORT_GUILDS = 25  # servers listed by !memory
+
+# Point the bot at another Discord, e.g. the local mock in benchmarks/mock_gateway.py
+if os.getenv("DISCORD_API_BASE"):
+    discord.http.Route.BASE = os.getenv("DISCORD_API_BASE").rstrip("/")
+if os.getenv("DISCORD_GATEWAY_URL"):
+    discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(os.getenv("DISCORD_GATEWAY_URL"))
+
 # Initialize bot with intents
 intents = discord.Intents.default()
 intents.message_content = True  # Required for message reading
 intents.members = True  # Required for welcome messages
 
-bot = commands.Bot(
+# How many members and messages stay in memory (MEMBER_CACHE, MEMBER_RECENT_LIMIT, MESSAGE_CACHE_SIZE)
+CACHE_POLICY = CachePolicy.from_env()
+
+
+class StarBot(commands.AutoShardedBot):
+    """Bot whose one-time startup work happens in `setup_hook`, before the gateway connects.
+
+    `on_ready` fires again after every reconnect that can't resume, so nothing
+    in it may load extensions, sync commands or start tasks. Runs every shard
+    Discord recommends, or just `SHARD_IDS` of `SHARD_COUNT` when started as
+    one worker of `cluster.py`. Member and message caching follows `CACHE_POLICY`.
+    """
+
+    def __init__(self, **options):
+        super().__init__(**options, **CACHE_POLICY.client_options())
+        self.member_cache = MemberCache(CACHE_POLICY)
+        self.phase_times = {}  # startup phase -> seconds
+        self.ready_count = 0
+        self.coordinator = ClusterCoordinator(self, CLUSTER, os.getenv("CLUSTER_DB", "cluster.db"))
+
+    def record_phase(self, name: str, started: float):
+        self.phase_times[name] = time.perf_counter() - started
+        print(f"⏱️ {name}: {self.phase_times[name] * 1000:.0f}ms")
+
+    async def setup_hook(self):
+        self.record_phase("login", self._login_started)
+
+        await self.coordinator.start()
+
+        started = time.perf_counter()
+        await load_cogs()
+        self.record_phase("load cogs", started)
+
+        started = time.perf_counter()
+        await sync_tree_if_changed()
+        self.record_phase("command sync", started)
+        self._connect_started = time.perf_counter()
+
+    async def start(self, token: str, *, reconnect: bool = True):
+        self._login_started = time.perf_counter()
+        await super().start(token, reconnect=reconnect)
+
+    async def close(self):
+        await self.coordinator.close()
+        await super().close()
+
+
+bot = StarBot(
     command_prefix="!",
     intents=intents,
     help_command=None,  # Disable default help command
-    case_insensitive=True  # Makes !Ping work like !ping
+    case_insensitive=True,  # Makes !Ping work like !ping
+    shard_ids=CLUSTER.shard_ids,
+    shard_count=CLUSTER.shard_count,
+    activity=discord.Game(name="⚽ North London Is Red!")  # Sent with IDENTIFY, so reconnects keep it
 )
 
 
+async def load_extension_timed(name: str):
+    started = time.perf_counter()
+    try:
+        await bot.load_extension(name)
+        print(f"✅ Loaded cog: {name.split('.')[-1]} ({(time.perf_counter() - started) * 1000:.0f}ms)")
+    except commands.ExtensionAlreadyLoaded:
+        pass
+    except Exception as e:
+        print(f"❌ Failed to load {name}: {e}")
+
+
 async def load_cogs():
-    for filename in os.listdir("./cogs"):
-        if filename.endswith(".py") and not filename.startswith("_"):
-            try:
-                await bot.load_extension(f"cogs.{filename[:-3]}")
-                print(f"✅ Loaded cog: {filename[:-3]}")
-            except Exception as e:
-                print(f"❌ Failed to load {filename}: {e}")
+    """Load every cog concurrently, so their async `cog_load` work overlaps"""
+    names = [
+        f"cogs.{filename[:-3]}"
+        for filename in sorted(os.listdir("./cogs"))
+        if filename.endswith(".py") and not filename.startswith("_")
+    ]
+    await asyncio.gather(*(load_extension_timed(name) for name in names))
+
 
+def command_tree_hash() -> str:
+    """Stable hash of the global application-command payload that `tree.sync()` would upload"""
+    payload = sorted(
+        (command.to_dict(bot.tree) for command in bot.tree.get_commands()),
+        key=lambda command: (command.get("type", 1), command["name"])
+    )
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+async def sync_tree_if_changed():
+    """Sync application commands only when they differ from the last successful sync"""
+    digest = command_tree_hash()
+    try:
+        with open(TREE_HASH_FILE, encoding="utf-8") as f:
+            if f.read().strip() == digest:
+                print("🌳 Command tree unchanged, skipping sync")
+                return
+    except FileNotFoundError:
+        pass
+
+    try:
+        synced = await bot.tree.sync()
+    except discord.HTTPException as e:
+        print(f"❌ Command sync failed: {e}")
+        return
+    with open(TREE_HASH_FILE, "w", encoding="utf-8") as f:
+        f.write(digest)
+    print(f"🌳 Synced {len(synced)} application command(s)")
 
 
 # Bot events
 @bot.event
 async def on_ready():
+    bot.ready_count += 1
+    if bot.ready_count > 1:
+        print(f"🔁 Reconnected as {bot.user.name} ({len(bot.guilds)} guilds)")
+        return
+
+    bot.record_phase("gateway connect", bot._connect_started)
     print(f"\n🔴 StarBot is online as {bot.user.name}")
     print(f"🛠️ Guilds: {len(bot.guilds)}")
-    print(f"⌚ Discord.py version: {discord.__version__}\n")
+    print(f"🧩 Cluster {CLUSTER.cluster_id}/{CLUSTER.cluster_count}, shards {sorted(bot.shards)} of {bot.shard_count}")
+    print(f"🧠 Member cache: {CACHE_POLICY.members}, message cache: {CACHE_POLICY.messages or 'off'}")
+    print(f"⌚ Discord.py version: {discord.__version__}")
+    print(f"🚀 Cold start: {(time.perf_counter() - STARTED_AT) * 1000:.0f}ms\n")
+
+
+# Under MEMBER_CACHE=lean, whoever was just active stays cached
+@bot.listen("on_message")
+async def remember_author(message):
+    bot.member_cache.touch(message.author)
+
+
+@bot.listen("on_raw_reaction_add")
+async def remember_reactor(payload):
+    bot.member_cache.touch(payload.member)
+
+
+@bot.listen("on_interaction")
+async def remember_user(interaction):
+    bot.member_cache.touch(interaction.user)
+
 
-    await load_cogs()  # Load all cogs
-    await bot.tree.sync()  # Sync slash commands (if using)
+@bot.listen("on_member_join")
+async def remember_joiner(member):
+    bot.member_cache.touch(member)
 
-    # Set custom status
-    await bot.change_presence(activity=discord.Game(name="⚽ North London Is Red!"))
+
+@bot.listen("on_raw_member_remove")
+async def forget_member(payload):
+    bot.member_cache.forget(payload.guild_id, payload.user.id)
+
+
+@bot.listen("on_guild_remove")
+async def forget_guild(guild):
+    bot.member_cache.forget(guild.id)
 
 
 # Error handling
@@ -52,12 +197,77 @@ async def on_command_error(ctx, error):
     await ctx.send(f"❌ Error: {str(error)}", delete_after=10)
 
 
+def _shard_line(shard: dict) -> str:
+    latency = f"{shard['latency'] * 1000:.0f}ms" if shard["latency"] is not None else "connecting"
+    return f"Shard {shard['id']}: {latency} · {shard['guilds']} guilds"
+
+
 # Basic test command
 @bot.command(name="ping")
 async def ping(ctx):
-    """Check bot latency"""
-    latency = round(bot.latency * 1000)
-    await ctx.send(f"🏓 Pong! {latency}ms")
+    """Check bot latency, per shard across every cluster"""
+    shard = bot.get_shard(ctx.guild.shard_id) if ctx.guild else None
+    latency = round((shard.latency if shard else bot.latency) * 1000)
+    clusters = {cluster_id: (shards, age) for cluster_id, shards, age in await bot.coordinator.clusters()}
+    clusters[CLUSTER.cluster_id] = (bot.coordinator.shard_stats(), 0.0)  # fresher than our last heartbeat
+    if sum(len(shards) for shards, _ in clusters.values()) <= 1:
+        return await ctx.send(f"🏓 Pong! {latency}ms")
+
+    fields = []
+    for cluster_id in sorted(clusters):
+        shards, age = clusters[cluster_id]
+        name = f"Cluster {cluster_id}" + (" (this one)" if cluster_id == CLUSTER.cluster_id else "")
+        if age > 3 * bot.coordinator.interval:
+            name += f" ⚠️ silent for {age:.0f}s"
+        fields.extend(paginated_fields(name, [_shard_line(shard) for shard in shards]))
+    embeds = build_embeds(
+        "🏓 Pong!",
+        0xEF0107,
+        fields,
+        description=f"This server's shard: {latency}ms"
+    )
+    await ctx.send(embeds=message_groups(embeds)[0])
+
+
+def _megabytes(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MiB"
+
+
+@bot.command(name="memory")
+@commands.has_permissions(administrator=True)
+async def memory(ctx):
+    """Show the member and message cache footprint per server (admin only)"""
+    started = time.perf_counter()
+    rows = await cache_footprint(bot)
+    elapsed = (time.perf_counter() - started) * 1000
+    cache = bot.member_cache
+    rss = resident_memory()
+
+    lines = []
+    for row in rows[:MEMORY_REPORT_GUILDS]:
+        recent = f" ({row['recent']} recent)" if cache.lean else ""
+        lines.append(
+            f"**{row['guild'].name}**: {row['members']}/{row['member_count'] or '?'} members{recent} · "
+            f"{row['messages']} messages · ~{_megabytes(row['bytes'])}"
+        )
+    if len(rows) > MEMORY_REPORT_GUILDS:
+        lines.append(f"…and {len(rows) - MEMORY_REPORT_GUILDS} more")
+    description = (
+        f"Policy: members `{CACHE_POLICY.members}`"
+        + (f" (last {CACHE_POLICY.recent_members} active per server)" if cache.lean else "")
+        + f", messages `{CACHE_POLICY.messages or 'off'}`\n"
+        f"Resident memory: {_megabytes(rss) if rss is not None else 'n/a'} · "
+        f"caches ~{_megabytes(sum(row['bytes'] for row in rows))} (estimated in {elapsed:.0f}ms)\n"
+        f"Lookups: {cache.hits} cached · {cache.fetches} fetched · {cache.chunks} member lists · "
+        f"{cache.evictions} evicted"
+    )
+    embeds = build_embeds(
+        "🧠 Memory",
+        0xEF0107,
+        paginated_fields(f"Servers ({len(rows)}, largest first)", lines),
+        description=description
+    )
+    await ctx.send(embeds=message_groups(embeds)[0])
 
 
 if __name__ == "__main__":
@@ -71,4 +281,4 @@ if __name__ == "__main__":
     except discord.LoginFailure:
         print("⚠️ Invalid bot token! Check your environment variables.")
     except KeyboardInterrupt:
-        print("🛑 Bot shutting down...")
\ No newline at end of file
+        print("🛑 Bot shutting down...")
@@ -0,0 +1,2 @@
+# utils/__init__.py
+"""Shared helpers used by the cogs (HTTP, caching, storage, scheduling)"""
@@ -0,0 +1,120 @@
+# utils/bulk.py
+import asyncio
+from dataclasses import dataclass, field
+
+import discord
+
+
+class SkipTarget(Exception):
+    """Raised by a bulk action to skip a target without counting it as a failure"""
+
+
+@dataclass
+class BulkReport:
+    total: int
+    succeeded: list = field(default_factory=list)
+    failed: list = field(default_factory=list)   # (target, error message)
+    skipped: list = field(default_factory=list)  # (target, reason)
+
+    @property
+    def done(self) -> int:
+        return len(self.succeeded) + len(self.failed) + len(self.skipped)
+
+    def progress(self) -> str:
+        return (f"{self.done}/{self.total} "
+                f"(✅ {len(self.succeeded)} · ❌ {len(self.failed)} · ⏭️ {len(self.skipped)})")
+
+
+class BulkRunner:
+    """Run one action over many targets with a bounded worker pool.
+
+    `action(target)` succeeds by returning, skips by raising `SkipTarget`, and
+    fails by raising anything else. With `batch_size > 1` the action receives
+    lists of targets instead and returns `(succeeded, failed)` lists, for
+    endpoints that accept many targets per request. Rate-limit errors are
+    retried with backoff rather than failing the target, and `on_progress` is
+    called at most every `progress_interval` seconds and once at the end.
+    """
+
+    def __init__(self, action, *, concurrency: int = 5, batch_size: int = 1, max_retries: int = 3,
+                 on_progress=None, progress_interval: float = 2.0):
+        self.action = action
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+
+    async def _attempt(self, item):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self.action(item)
+            except discord.RateLimited as e:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(e.retry_after)
+            except discord.HTTPException as e:
+                if e.status != 429 and e.status < 500 or attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(2 ** attempt)
+
+    async def _run_one(self, item, report: BulkReport):
+        try:
+            result = await self._attempt(item)
+        except SkipTarget as e:
+            if self.batch_size > 1:
+                report.skipped.extend((target, str(e)) for target in item)
+            else:
+                report.skipped.append((item, str(e)))
+            return
+        except Exception as e:
+            if self.batch_size > 1:
+                report.failed.extend((target, str(e)) for target in item)
+            else:
+                report.failed.append((item, str(e)))
+            return
+
+        if self.batch_size > 1:
+            succeeded, failed = result
+            report.succeeded.extend(succeeded)
+            report.failed.extend((target, "Rejected by Discord") for target in failed)
+        else:
+            report.succeeded.append(item)
+
+    async def _report_progress(self, report: BulkReport):
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            await self._notify(report)
+
+    async def _notify(self, report: BulkReport):
+        try:
+            await self.on_progress(report)
+        except discord.HTTPException:
+            pass  # a missed progress update isn't worth failing the run over
+
+    async def run(self, targets: list, skipped: list = ()) -> BulkReport:
+        """Action every target; `skipped` holds `(target, reason)` pairs filtered out beforehand"""
+        report = BulkReport(total=len(targets) + len(skipped), skipped=list(skipped))
+        if self.batch_size > 1:
+            items = [targets[i:i + self.batch_size] for i in range(0, len(targets), self.batch_size)]
+        else:
+            items = list(targets)
+
+        queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        async def worker():
+            while not queue.empty():
+                await self._run_one(queue.get_nowait(), report)
+
+        progress = asyncio.create_task(self._report_progress(report)) if self.on_progress else None
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(items)) or 1)))
+        finally:
+            if progress:
+                progress.cancel()
+                await asyncio.gather(progress, return_exceptions=True)
+        if self.on_progress:
+            await self._notify(report)
+        return report
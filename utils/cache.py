@@ -0,0 +1,156 @@
+# utils/cache.py
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheEntry:
+    value: object
+    size: int
+    stored_at: float
+    ttl: float
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+class ResponseCache:
+    """Bounded TTL + LRU cache with stale-while-revalidate refreshes.
+
+    Entries are evicted least-recently-used first once either `max_entries`
+    or `max_bytes` is exceeded. An entry older than its TTL but younger than
+    TTL + `stale_ttl` is still served immediately while a single background
+    refresh replaces it.
+    """
+
+    def __init__(self, *, max_entries: int = 256, max_bytes: int = 4 * 1024 * 1024, stale_ttl: float = 3600,
+                 should_cache=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self.should_cache = should_cache or (lambda value: True)
+        self._entries = OrderedDict()
+        self._refreshing = {}
+        self.bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.failed_refreshes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @staticmethod
+    def _sizeof(value) -> int:
+        try:
+            return len(json.dumps(value, separators=(",", ":")))
+        except (TypeError, ValueError):
+            return 0
+
+    def peek(self, key):
+        """Return the cached entry without touching LRU order or counters"""
+        return self._entries.get(key)
+
+    def set(self, key, value, ttl: float) -> bool:
+        """Store `value` unless `should_cache` rejects it; returns whether it was stored"""
+        if not self.should_cache(value):
+            return False
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return False
+        self.invalidate(key)
+        self._entries[key] = CacheEntry(value, size, time.monotonic(), ttl)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= evicted.size
+            self.evictions += 1
+        return True
+
+    def seed(self, key, value, ttl: float):
+        """Insert an already-expired entry (e.g. from disk) so the next lookup serves it and refreshes"""
+        self.set(key, value, ttl)
+        entry = self._entries.get(key)
+        if entry:
+            entry.stored_at -= ttl
+
+    def invalidate(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self.bytes -= entry.size
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    async def get(self, key, loader, ttl: float, refresher=None):
+        """Serve `key` from cache, calling `loader()` on a miss.
+
+        Stale entries are refreshed in the background with `refresher()`
+        (defaults to `loader`).
+        """
+        entry = self._entries.get(key)
+        if entry:
+            self._entries.move_to_end(key)
+            if entry.age < entry.ttl:
+                self.hits += 1
+                return entry.value
+            if entry.age < entry.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._schedule_refresh(key, refresher or loader, ttl)
+                return entry.value
+            self.invalidate(key)
+
+        self.misses += 1
+        value = await loader()
+        self.set(key, value, ttl)
+        return value
+
+    def _schedule_refresh(self, key, loader, ttl: float):
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                # A failed refresh keeps serving the stale entry until it expires for good
+                if self.set(key, await loader(), ttl):
+                    self.refreshes += 1
+                else:
+                    self.failed_refreshes += 1
+            except Exception as e:
+                self.failed_refreshes += 1
+                print(f"⚠️ Background refresh of {key!r} failed: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    async def close(self):
+        """Cancel in-flight background refreshes"""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+        self._refreshing.clear()
+
+    def summary(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "refreshes": self.refreshes,
+            "failed_refreshes": self.failed_refreshes,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups * 100, 1) if lookups else None
+        }
@@ -0,0 +1,155 @@
+# utils/case_store.py
+import asyncio
+import itertools
+import sqlite3
+from dataclasses import dataclass
+
+CASE_COLUMNS = "id, guild_id, action, target_id, moderator_id, reason, created_at"
+NO_CURSOR = 2 ** 63 - 1  # above any case ID, including ones other worker processes just wrote
+
+
+@dataclass
+class Case:
+    id: int
+    guild_id: int
+    action: str
+    target_id: int      # None for actions without a single target, e.g. purge
+    moderator_id: int
+    reason: str
+    created_at: float   # epoch seconds
+
+
+class CaseStore:
+    """SQLite (WAL) moderation case log with batched write-behind.
+
+    Case IDs are handed out in memory so commands can quote them straight
+    away; `add` only queues the row and a background flusher inserts queued
+    cases in one transaction every `flush_interval` seconds or once
+    `batch_size` are waiting. Listing queries use keyset pagination on the
+    case ID (`before_id`), so every page is an index range scan however many
+    cases a guild has.
+    """
+
+    def __init__(self, path: str = "moderation_cases.db", *, flush_interval: float = 1.0, batch_size: int = 500,
+                 cluster=None):
+        self.path = path
+        self.cluster = cluster  # ClusterInfo; when several processes share the file, IDs are strided by cluster
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._pending = []
+        self._flush_now = asyncio.Event()
+        self._flusher = None
+        self.max_id = 0
+        self._ids = None
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cases ("
+            "id INTEGER PRIMARY KEY, guild_id INTEGER NOT NULL, action TEXT NOT NULL, target_id INTEGER, "
+            "moderator_id INTEGER NOT NULL, reason TEXT, created_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cases_guild ON cases (guild_id, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS cases_target ON cases (guild_id, target_id, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS cases_moderator ON cases (guild_id, moderator_id, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS cases_time ON cases (guild_id, created_at, action, moderator_id)")
+        conn.commit()
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM cases").fetchone()[0]
+        return conn, max_id
+
+    async def open(self):
+        self._conn, self.max_id = await asyncio.to_thread(self._open)
+        if self.cluster:
+            self._ids = itertools.count(self.cluster.first_id_after(self.max_id), self.cluster.cluster_count)
+        else:
+            self._ids = itertools.count(self.max_id + 1)
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+        if self._conn:
+            await asyncio.to_thread(self._conn.close)
+            self._conn = None
+
+    def add(self, guild_id: int, action: str, target_id, moderator_id: int, reason: str, created_at: float) -> Case:
+        case_id = next(self._ids)
+        self.max_id = max(self.max_id, case_id)
+        case = Case(case_id, guild_id, action, target_id, moderator_id, reason, created_at)
+        self._pending.append(case)
+        if len(self._pending) >= self.batch_size:
+            self._flush_now.set()
+        return case
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            await self.flush()
+
+    def _write(self, batch: list):
+        rows = [(c.id, c.guild_id, c.action, c.target_id, c.moderator_id, c.reason, c.created_at) for c in batch]
+        with self._conn:
+            self._conn.executemany(f"INSERT OR REPLACE INTO cases ({CASE_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending or self._conn is None:
+                return
+            batch, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except sqlite3.Error as e:
+                print(f"❌ Failed to persist moderation cases: {e}")
+                self._pending[:0] = batch
+
+    async def _query(self, sql: str, params: tuple) -> list:
+        await self.flush()
+        async with self._lock:
+            return await asyncio.to_thread(lambda: self._conn.execute(sql, params).fetchall())
+
+    async def get(self, guild_id: int, case_id: int):
+        rows = await self._query(f"SELECT {CASE_COLUMNS} FROM cases WHERE id = ? AND guild_id = ?", (case_id, guild_id))
+        return Case(*rows[0]) if rows else None
+
+    async def for_target(self, guild_id: int, target_id: int, *, before_id: int = None, limit: int = 10) -> list:
+        """A user's cases, newest first; pass the last ID seen as `before_id` for the next page"""
+        rows = await self._query(
+            f"SELECT {CASE_COLUMNS} FROM cases WHERE guild_id = ? AND target_id = ? AND id < ? "
+            "ORDER BY id DESC LIMIT ?",
+            (guild_id, target_id, before_id or NO_CURSOR, limit)
+        )
+        return [Case(*row) for row in rows]
+
+    async def for_moderator(self, guild_id: int, moderator_id: int, *, before_id: int = None, limit: int = 10) -> list:
+        """Cases a moderator opened, newest first; paged like `for_target`"""
+        rows = await self._query(
+            f"SELECT {CASE_COLUMNS} FROM cases WHERE guild_id = ? AND moderator_id = ? AND id < ? "
+            "ORDER BY id DESC LIMIT ?",
+            (guild_id, moderator_id, before_id or NO_CURSOR, limit)
+        )
+        return [Case(*row) for row in rows]
+
+    async def stats(self, guild_id: int, since: float) -> tuple:
+        """`({action: count}, [(moderator_id, count), ...])` for cases created after `since`"""
+        actions = await self._query(
+            "SELECT action, COUNT(*) FROM cases WHERE guild_id = ? AND created_at >= ? "
+            "GROUP BY action ORDER BY COUNT(*) DESC",
+            (guild_id, since)
+        )
+        moderators = await self._query(
+            "SELECT moderator_id, COUNT(*) FROM cases WHERE guild_id = ? AND created_at >= ? "
+            "GROUP BY moderator_id ORDER BY COUNT(*) DESC LIMIT 5",
+            (guild_id, since)
+        )
+        return dict(actions), moderators
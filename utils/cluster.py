@@ -0,0 +1,151 @@
+# utils/cluster.py
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+
+
+def parse_shard_ids(text: str):
+    """`"0-3,8"` -> `[0, 1, 2, 3, 8]`; empty -> None (let Discord decide)"""
+    if not text:
+        return None
+    shard_ids = []
+    for part in text.split(","):
+        start, _, end = part.strip().partition("-")
+        shard_ids.extend(range(int(start), int(end or start) + 1))
+    return shard_ids
+
+
+@dataclass
+class ClusterInfo:
+    """Where this process sits in a multi-process deployment (see cluster.py).
+
+    A single process (the default) is cluster 0 of 1 and owns everything.
+    Under the launcher, each worker owns the guilds on its shards, and the
+    IDs it allocates for shared SQLite tables (reminders, cases) are
+    congruent to its cluster ID, so workers never hand out the same ID.
+    """
+    cluster_id: int = 0
+    cluster_count: int = 1
+    shard_ids: list = None
+    shard_count: int = None
+
+    @classmethod
+    def from_env(cls) -> "ClusterInfo":
+        shard_count = os.getenv("SHARD_COUNT")
+        return cls(
+            cluster_id=int(os.getenv("CLUSTER_ID", 0)),
+            cluster_count=int(os.getenv("CLUSTER_COUNT", 1)),
+            shard_ids=parse_shard_ids(os.getenv("SHARD_IDS", "")),
+            shard_count=int(shard_count) if shard_count else None
+        )
+
+    @property
+    def clustered(self) -> bool:
+        return self.cluster_count > 1
+
+    def owns_guild(self, guild_id: int) -> bool:
+        """Whether `guild_id` is served by one of this process's shards"""
+        if self.shard_ids is None or not self.shard_count:
+            return True
+        return (guild_id >> 22) % self.shard_count in self.shard_ids
+
+    def owns_id(self, allocated_id: int) -> bool:
+        """Whether a row ID in a shared table was allocated (and so is handled) by this cluster"""
+        return allocated_id % self.cluster_count == self.cluster_id
+
+    def first_id_after(self, max_id: int) -> int:
+        """Smallest ID above `max_id` that belongs to this cluster; step by `cluster_count` from there"""
+        first = max_id + 1
+        return first + (self.cluster_id - first) % self.cluster_count
+
+
+CLUSTER = ClusterInfo.from_env()
+
+
+class ClusterCoordinator:
+    """Shared SQLite board where every worker publishes its shards' health.
+
+    Each process upserts one row every `interval` seconds with per-shard
+    latency and guild counts; `clusters()` reads every row, so any worker
+    can report on the whole deployment without talking to the others.
+    """
+
+    def __init__(self, bot, info: ClusterInfo = CLUSTER, path: str = "cluster.db", *, interval: float = 10.0):
+        self.bot = bot
+        self.info = info
+        self.path = path
+        self.interval = interval
+        self._conn = None
+        self._task = None
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS clusters ("
+            "cluster_id INTEGER PRIMARY KEY, pid INTEGER NOT NULL, shards TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.commit()
+        return conn
+
+    async def start(self):
+        self._conn = await asyncio.to_thread(self._open)
+        self._task = asyncio.create_task(self._heartbeat_loop())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._conn:
+            await asyncio.to_thread(self._delete)
+            await asyncio.to_thread(self._conn.close)
+            self._conn = None
+
+    def shard_stats(self) -> list:
+        """`[{"id", "latency", "guilds"}]` for this process's connected shards"""
+        guilds = {}
+        for guild in self.bot.guilds:
+            guilds[guild.shard_id] = guilds.get(guild.shard_id, 0) + 1
+        shards = getattr(self.bot, "shards", None) or {0: None}
+        stats = []
+        for shard_id in sorted(shards):
+            shard = shards[shard_id]
+            latency = shard.latency if shard is not None else self.bot.latency
+            stats.append({
+                "id": shard_id,
+                "latency": None if latency != latency else latency,  # NaN before the first heartbeat
+                "guilds": guilds.get(shard_id, 0)
+            })
+        return stats
+
+    def _write(self, shards: list):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO clusters VALUES (?, ?, ?, ?)",
+                (self.info.cluster_id, os.getpid(), json.dumps(shards), time.time())
+            )
+
+    def _delete(self):
+        with self._conn:
+            self._conn.execute("DELETE FROM clusters WHERE cluster_id = ?", (self.info.cluster_id,))
+
+    async def _heartbeat_loop(self):
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                await asyncio.to_thread(self._write, self.shard_stats())
+            except sqlite3.Error as e:
+                print(f"⚠️ Cluster heartbeat failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def clusters(self) -> list:
+        """`[(cluster_id, shards, age_seconds)]` for every worker that has published, this one included"""
+        rows = await asyncio.to_thread(lambda: self._conn.execute(
+            "SELECT cluster_id, shards, updated_at FROM clusters ORDER BY cluster_id"
+        ).fetchall())
+        now = time.time()
+        return [(cluster_id, json.loads(shards), now - updated_at) for cluster_id, shards, updated_at in rows]
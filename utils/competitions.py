@@ -0,0 +1,120 @@
+# utils/competitions.py
+import bisect
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+SETTLED_STATUSES = {"FINISHED", "AWARDED", "CANCELLED", "POSTPONED"}
+RESULT_STATUSES = {"FINISHED", "AWARDED"}
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class CompetitionStore:
+    """Local, indexed copy of league tables and season match lists.
+
+    Matches are indexed by ID, by (competition, matchday) and per team as a
+    date-sorted list, so fixtures/results are a bisect away instead of a
+    season scan. `stale_matchdays` tells the refresher which matchdays could
+    have changed since the last fetch.
+    """
+
+    def __init__(self):
+        self.tables = {}                       # code -> standings rows
+        self.matches = {}                      # match_id -> match
+        self.updated_at = {}                   # code -> wall-clock time of last merge
+        self.full_refresh_at = {}              # code -> wall-clock time of last full season fetch
+        self._competition_of = {}              # match_id -> code
+        self._by_matchday = defaultdict(set)   # (code, matchday) -> match IDs
+        self._by_team = defaultdict(list)      # team_id -> sorted [(utcDate, match_id)]
+
+    def has_matches(self, code: str) -> bool:
+        return code in self.full_refresh_at
+
+    def set_table(self, code: str, payload: dict):
+        """Store the TOTAL table from a `/standings` payload"""
+        for standing in payload.get("standings", []):
+            if standing.get("type") == "TOTAL":
+                self.tables[code] = standing.get("table", [])
+                return
+
+    def merge_matches(self, code: str, matches: list, *, full: bool = False) -> int:
+        """Upsert matches, keeping indexes in sync; returns how many newly reached a result"""
+        newly_finished = 0
+        for match in matches:
+            match_id = match["id"]
+            old = self.matches.get(match_id)
+            if old is not None and old.get("utcDate") != match.get("utcDate"):
+                self._unindex_date(old)
+            if old is None or old.get("utcDate") != match.get("utcDate"):
+                for side in ("homeTeam", "awayTeam"):
+                    team_id = (match.get(side) or {}).get("id")
+                    if team_id is not None:
+                        bisect.insort(self._by_team[team_id], (match.get("utcDate") or "", match_id))
+            if old is not None and old.get("matchday") != match.get("matchday"):
+                self._by_matchday[(code, old.get("matchday"))].discard(match_id)
+            self._by_matchday[(code, match.get("matchday"))].add(match_id)
+
+            if match.get("status") in RESULT_STATUSES and (old is None or old.get("status") not in RESULT_STATUSES):
+                newly_finished += 1
+            self.matches[match_id] = match
+            self._competition_of[match_id] = code
+
+        self.updated_at[code] = time.time()
+        if full:
+            self.full_refresh_at[code] = time.time()
+        return newly_finished
+
+    def _unindex_date(self, match: dict):
+        entry = (match.get("utcDate") or "", match["id"])
+        for side in ("homeTeam", "awayTeam"):
+            team_id = (match.get(side) or {}).get("id")
+            index = self._by_team.get(team_id)
+            if not index:
+                continue
+            pos = bisect.bisect_left(index, entry)
+            if pos < len(index) and index[pos] == entry:
+                index.pop(pos)
+
+    def season_matches(self, code: str) -> list:
+        return [m for match_id, m in self.matches.items() if self._competition_of.get(match_id) == code]
+
+    def stale_matchdays(self, code: str) -> set:
+        """Matchdays with a match that has kicked off but has no final result yet"""
+        now = _utc_now_iso()
+        stale = set()
+        for (competition, matchday), match_ids in self._by_matchday.items():
+            if competition != code:
+                continue
+            for match_id in match_ids:
+                match = self.matches[match_id]
+                if match.get("utcDate", "") <= now and match.get("status") not in SETTLED_STATUSES:
+                    stale.add(matchday)
+                    break
+        return stale
+
+    def fixtures(self, team_id: int, limit: int = 5) -> list:
+        """Next unplayed matches for a team, soonest first"""
+        index = self._by_team.get(team_id, [])
+        upcoming = []
+        for pos in range(bisect.bisect_left(index, (_utc_now_iso(), -1)), len(index)):
+            match = self.matches[index[pos][1]]
+            if match.get("status") not in SETTLED_STATUSES:
+                upcoming.append(match)
+                if len(upcoming) == limit:
+                    break
+        return upcoming
+
+    def results(self, team_id: int, limit: int = 5) -> list:
+        """Latest results for a team, most recent first"""
+        index = self._by_team.get(team_id, [])
+        results = []
+        for pos in range(bisect.bisect_right(index, (_utc_now_iso(), float("inf"))) - 1, -1, -1):
+            match = self.matches[index[pos][1]]
+            if match.get("status") in RESULT_STATUSES:
+                results.append(match)
+                if len(results) == limit:
+                    break
+        return results
@@ -0,0 +1,26 @@
+# utils/durations.py
+import re
+
+UNITS = {"w": 604800, "d": 86400, "h": 3600, "m": 60, "s": 1}
+_DURATION = re.compile(r"(\d+)([wdhms])")
+
+
+def parse_duration(text: str):
+    """Seconds in a compact duration such as `30m`, `1h30m` or `7d`, or None if it isn't one"""
+    text = text.strip().lower()
+    parts = _DURATION.findall(text)
+    if not parts or "".join(number + unit for number, unit in parts) != text:
+        return None
+    seconds = sum(int(number) * UNITS[unit] for number, unit in parts)
+    return seconds or None
+
+
+def format_duration(seconds: float) -> str:
+    """Inverse of `parse_duration`, e.g. 5400 -> `1h30m`"""
+    seconds = int(seconds)
+    parts = []
+    for unit, size in UNITS.items():
+        if seconds >= size:
+            parts.append(f"{seconds // size}{unit}")
+            seconds %= size
+    return "".join(parts) or "0s"
@@ -0,0 +1,72 @@
+# utils/embeds.py
+import discord
+
+FIELD_VALUE_LIMIT = 1024
+EMBED_TOTAL_LIMIT = 6000
+EMBED_FIELD_LIMIT = 25
+MESSAGE_EMBED_LIMIT = 10
+
+
+def truncate(text: str, limit: int = FIELD_VALUE_LIMIT) -> str:
+    """`text` cut to `limit` characters, ending in an ellipsis when shortened"""
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def chunk_lines(lines: list, limit: int = FIELD_VALUE_LIMIT) -> list:
+    """Join lines into newline-separated chunks no longer than `limit`"""
+    chunks, current = [], ""
+    for line in lines:
+        line = truncate(line, limit)
+        if current and len(current) + len(line) + 1 > limit:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def paginated_fields(name: str, lines: list) -> list:
+    """`(name, value)` pairs for one logical field, split to respect the 1024-char value limit"""
+    chunks = chunk_lines(lines) or ["None"]
+    return [
+        (name if index == 0 else f"{name} (cont.)", chunk)
+        for index, chunk in enumerate(chunks)
+    ]
+
+
+def build_embeds(title: str, color: int, fields: list, *, description: str = None, inline: bool = False) -> list:
+    """Pack `(name, value)` fields into as many embeds as Discord's per-embed limits require.
+
+    Discord also caps the embeds of one message at 6000 characters combined,
+    so send the result with `message_groups`, not in a single `send`.
+    """
+    embeds = []
+    embed, size = None, 0
+    for name, value in fields:
+        field_size = len(name) + len(value)
+        if embed is None or len(embed.fields) >= EMBED_FIELD_LIMIT or size + field_size > EMBED_TOTAL_LIMIT:
+            embed = discord.Embed(
+                title=title if not embeds else f"{title} (cont.)",
+                description=description if not embeds else None,
+                color=color
+            )
+            size = len(embed.title) + len(description or "")
+            embeds.append(embed)
+        embed.add_field(name=name, value=value, inline=inline)
+        size += field_size
+    if not embeds:
+        embeds.append(discord.Embed(title=title, description=description, color=color))
+    return embeds
+
+
+def message_groups(embeds: list) -> list:
+    """Split embeds into per-message groups within Discord's 10-embed and 6000-character limits"""
+    groups, size = [], 0
+    for embed in embeds:
+        if not groups or len(groups[-1]) >= MESSAGE_EMBED_LIMIT or size + len(embed) > EMBED_TOTAL_LIMIT:
+            groups.append([])
+            size = 0
+        groups[-1].append(embed)
+        size += len(embed)
+    return groups
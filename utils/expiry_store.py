@@ -0,0 +1,118 @@
+# utils/expiry_store.py
+import asyncio
+import sqlite3
+from dataclasses import dataclass
+
+
+@dataclass
+class Expiry:
+    guild_id: int
+    user_id: int
+    action: str         # what to do when it expires: "unmute" or "unban"
+    due: float          # epoch seconds
+    case_id: int = None
+    attempts: int = 0   # failed attempts so far
+
+    @property
+    def key(self) -> tuple:
+        return self.guild_id, self.user_id, self.action
+
+
+class ExpiryStore:
+    """SQLite (WAL) store of pending temporary-action expiries with batched write-behind.
+
+    There is at most one expiry per (guild, user, action); `put` replaces it.
+    Like `ReminderStore`, changes are queued and committed together every
+    `flush_interval` seconds or once `batch_size` are waiting.
+    """
+
+    def __init__(self, path: str = "moderation_expiries.db", *, flush_interval: float = 1.0,
+                 batch_size: int = 500):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._pending = {}   # key -> Expiry to upsert, or None to delete
+        self._flush_now = asyncio.Event()
+        self._flusher = None
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS expiries ("
+            "guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, action TEXT NOT NULL, due REAL NOT NULL, "
+            "case_id INTEGER, attempts INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (guild_id, user_id, action))"
+        )
+        conn.commit()
+        return conn
+
+    async def open(self):
+        self._conn = await asyncio.to_thread(self._open)
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+        if self._conn:
+            await asyncio.to_thread(self._conn.close)
+            self._conn = None
+
+    def put(self, expiry: Expiry):
+        self._queue(expiry.key, expiry)
+
+    def delete(self, key: tuple):
+        self._queue(key, None)
+
+    def _queue(self, key: tuple, expiry):
+        self._pending[key] = expiry
+        if len(self._pending) >= self.batch_size:
+            self._flush_now.set()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            await self.flush()
+
+    def _write(self, batch: dict):
+        upserts = [
+            (e.guild_id, e.user_id, e.action, e.due, e.case_id, e.attempts)
+            for e in batch.values() if e is not None
+        ]
+        deletes = [key for key, e in batch.items() if e is None]
+        with self._conn:
+            if upserts:
+                self._conn.executemany("INSERT OR REPLACE INTO expiries VALUES (?, ?, ?, ?, ?, ?)", upserts)
+            if deletes:
+                self._conn.executemany(
+                    "DELETE FROM expiries WHERE guild_id = ? AND user_id = ? AND action = ?", deletes
+                )
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending or self._conn is None:
+                return
+            batch, self._pending = self._pending, {}
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except sqlite3.Error as e:
+                print(f"❌ Failed to persist expiries: {e}")
+                for key, expiry in batch.items():
+                    self._pending.setdefault(key, expiry)
+
+    async def all(self) -> list:
+        await self.flush()
+        async with self._lock:
+            rows = await asyncio.to_thread(lambda: self._conn.execute(
+                "SELECT guild_id, user_id, action, due, case_id, attempts FROM expiries ORDER BY due"
+            ).fetchall())
+        return [Expiry(*row) for row in rows]
@@ -0,0 +1,60 @@
+# utils/files.py
+import json
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process only, so there's nobody to lock against
+    fcntl = None
+
+
+def load_json(path: str, default=None):
+    """Read a JSON file, returning `default` if it is missing or unreadable"""
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Couldn't read {path}: {e}")
+        return default
+
+
+def atomic_write_json(path: str, data):
+    """Write JSON to a temp file and swap it in, so readers never see a partial file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def file_lock(path: str):
+    """Exclusive advisory lock on `path`.lock, held across processes for the `with` block"""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def merge_write_json(path: str, entries: dict, owns):
+    """Rewrite a keyed JSON file shared by several worker processes.
+
+    On-disk entries whose key this process doesn't own (`owns(key)` is
+    false) are kept as they are; the owned ones are replaced by `entries`.
+    The read-merge-write runs under `file_lock`, so concurrent writers never
+    drop each other's changes.
+    """
+    with file_lock(path):
+        current = load_json(path, {})
+        merged = {key: value for key, value in current.items() if not owns(key)}
+        merged.update(entries)
+        atomic_write_json(path, merged)
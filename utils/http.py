@@ -0,0 +1,158 @@
+# utils/http.py
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+import aiohttp
+from multidict import CIMultiDict
+
+
+@dataclass
+class HTTPResponse:
+    """Result of a single request: status, headers, decoded JSON body and timings"""
+    status: int
+    headers: CIMultiDict
+    data: object = None
+    timing: dict = field(default_factory=dict)
+
+
+class TimingStats:
+    """Rolling window of request timings, reported in milliseconds"""
+
+    def __init__(self, window: int = 200):
+        self.connect = deque(maxlen=window)
+        self.ttfb = deque(maxlen=window)
+        self.total = deque(maxlen=window)
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.errors = 0
+
+    def record(self, timing: dict):
+        self.requests += 1
+        if "connect" in timing:
+            self.connect.append(timing["connect"])
+        if "ttfb" in timing:
+            self.ttfb.append(timing["ttfb"])
+        if "total" in timing:
+            self.total.append(timing["total"])
+
+    @staticmethod
+    def _percentile(samples, pct: float):
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 1)
+
+    def summary(self) -> dict:
+        """p50/p95 per phase plus connection reuse counters"""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            **{
+                f"{name}_{label}": self._percentile(samples, pct)
+                for name, samples in (("connect", self.connect), ("ttfb", self.ttfb), ("total", self.total))
+                for label, pct in (("p50", 0.5), ("p95", 0.95))
+            }
+        }
+
+
+class HTTPClient:
+    """Long-lived pooled aiohttp client with keep-alive, DNS cache and timing traces"""
+
+    def __init__(self, base_url: str, headers: dict = None, *, limit: int = 100, limit_per_host: int = 10,
+                 dns_ttl: int = 300, keepalive_timeout: float = 30, connect_timeout: float = 5,
+                 total_timeout: float = 10):
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers or {}
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self.stats = TimingStats()
+        self.session = None
+
+    @property
+    def closed(self) -> bool:
+        return self.session is None or self.session.closed
+
+    async def start(self):
+        """Create the pooled session (idempotent)"""
+        if not self.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=self.timeout,
+            trace_configs=[self._trace_config()]
+        )
+
+    async def close(self):
+        """Close the session and release pooled connections"""
+        if not self.closed:
+            await self.session.close()
+        self.session = None
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            ctx.trace_request_ctx.start = time.perf_counter()
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.trace_request_ctx.connect_start = time.perf_counter()
+
+        async def on_connection_create_end(session, ctx, params):
+            timing = ctx.trace_request_ctx.timing
+            timing["connect"] = time.perf_counter() - ctx.trace_request_ctx.connect_start
+            self.stats.new_connections += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.stats.reused_connections += 1
+
+        async def on_request_end(session, ctx, params):
+            # Fired once the response headers are in: time to first byte
+            ctx.trace_request_ctx.timing["ttfb"] = time.perf_counter() - ctx.trace_request_ctx.start
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_start.append(on_connection_create_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_request_end.append(on_request_end)
+        return trace
+
+    async def get_json(self, path: str, *, headers: dict = None) -> HTTPResponse:
+        """GET `path` relative to the base URL and decode the JSON body"""
+        if self.closed:
+            await self.start()
+
+        trace_ctx = SimpleNamespace(start=time.perf_counter(), connect_start=None, timing={})
+        try:
+            async with self.session.get(
+                    f"{self.base_url}/{path.lstrip('/')}",
+                    headers=headers,
+                    trace_request_ctx=trace_ctx
+            ) as response:
+                data = None
+                if response.status == 200:
+                    data = await response.json()
+                else:
+                    await response.read()
+                trace_ctx.timing["total"] = time.perf_counter() - trace_ctx.start
+                self.stats.record(trace_ctx.timing)
+                return HTTPResponse(response.status, response.headers.copy(), data, trace_ctx.timing)
+        except Exception:
+            self.stats.errors += 1
+            raise
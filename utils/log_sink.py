@@ -0,0 +1,153 @@
+# utils/log_sink.py
+import asyncio
+import json
+
+import discord
+
+from utils.embeds import EMBED_TOTAL_LIMIT
+
+_STOP = object()  # queued by `close`: flush what's in hand and exit
+
+
+class EmbedLogSink:
+    """Asynchronous, coalescing log writer.
+
+    `submit` never blocks: entries are queued per guild, and a worker packs
+    up to `batch_size` embeds (and at most Discord's 6000 characters) into
+    one message, flushing when the batch is full or `flush_interval` seconds
+    after its first entry. Rate-limited sends are retried with backoff, and
+    a batch Discord rejects outright is resent one embed at a time. With
+    `mirror_path` set, every entry is also appended to a JSON-lines file
+    before it is sent, so nothing is lost when the log channel is missing
+    or unavailable.
+    """
+
+    def __init__(self, resolve_channel, *, batch_size: int = 10, flush_interval: float = 2.0,
+                 max_queue: int = 1000, max_retries: int = 3, mirror_path: str = None, idle_timeout: float = 60):
+        self._resolve_channel = resolve_channel
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.mirror_path = mirror_path
+        self.idle_timeout = idle_timeout
+        self._queues = {}
+        self._workers = {}
+        self.sent = 0
+        self.messages = 0
+        self.dropped = 0
+        self.failed = 0
+        self._closing = False
+
+    def submit(self, guild_id: int, embed: discord.Embed, record: dict = None):
+        if self._closing:
+            self.dropped += 1
+            return
+        queue = self._queues.get(guild_id)
+        if queue is None:
+            queue = self._queues[guild_id] = asyncio.Queue(self.max_queue)
+        try:
+            queue.put_nowait((embed, record))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return
+        worker = self._workers.get(guild_id)
+        if worker is None or worker.done():
+            self._workers[guild_id] = asyncio.create_task(self._drain(guild_id, queue))
+
+    async def _drain(self, guild_id: int, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        carried = None  # entry that didn't fit in the previous batch
+        stopping = False
+        while not stopping:
+            if carried is not None:
+                entry, carried = carried, None
+            else:
+                try:
+                    entry = await asyncio.wait_for(queue.get(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    if queue.empty():
+                        self._queues.pop(guild_id, None)
+                        self._workers.pop(guild_id, None)
+                        return
+                    continue
+            if entry is _STOP:
+                return
+
+            batch, size = [entry], len(entry[0])
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is _STOP:
+                    stopping = True  # send the batch in hand before exiting
+                    break
+                if size + len(entry[0]) > EMBED_TOTAL_LIMIT:
+                    carried = entry
+                    break
+                batch.append(entry)
+                size += len(entry[0])
+            await self._flush(guild_id, batch)
+
+    def _append_mirror(self, records: list):
+        with open(self.mirror_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+
+    async def _flush(self, guild_id: int, batch: list):
+        records = [record for _, record in batch if record is not None]
+        if self.mirror_path and records:
+            try:
+                await asyncio.to_thread(self._append_mirror, records)
+            except OSError as e:
+                print(f"⚠️ Couldn't write log mirror {self.mirror_path}: {e}")
+
+        channel = await self._resolve_channel(guild_id)
+        if channel is None:
+            return
+        embeds = [embed for embed, _ in batch]
+        try:
+            await self._send(channel, embeds)
+            return
+        except discord.HTTPException as e:
+            if e.status != 400 or len(embeds) == 1:
+                self.failed += len(embeds)
+                print(f"❌ Failed to send {len(embeds)} log entries: {e}")
+                return
+        # Discord rejected the message as a whole; don't let one bad entry sink the rest
+        for embed in embeds:
+            try:
+                await self._send(channel, [embed])
+            except discord.HTTPException as e:
+                self.failed += 1
+                print(f"❌ Failed to send a log entry: {e}")
+
+    async def _send(self, channel, embeds: list):
+        """Send one message, retrying rate limits and server errors with backoff"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                await channel.send(embeds=embeds)
+                self.sent += len(embeds)
+                self.messages += 1
+                return
+            except discord.HTTPException as e:
+                if e.status != 429 and e.status < 500 or attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(2 ** attempt)
+
+    async def close(self):
+        """Stop accepting entries, let every worker send what it holds and what's queued, then return"""
+        self._closing = True
+        workers = []
+        for guild_id, worker in list(self._workers.items()):
+            if not worker.done():
+                await self._queues[guild_id].put(_STOP)  # behind everything already queued
+                workers.append(worker)
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
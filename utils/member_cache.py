@@ -0,0 +1,219 @@
+# utils/member_cache.py
+import asyncio
+import os
+import sys
+import types
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+
+import discord
+
+MEMBER_POLICIES = ("full", "lazy", "lean")
+SIZE_SAMPLE = 50  # objects measured per guild when estimating cache footprint
+_warned_private_api = False
+
+# Referenced by members and messages but owned by the guild or the client; not counted per object
+_SHARED = (
+    discord.Guild, discord.abc.GuildChannel, discord.Thread, discord.Role, discord.ClientUser,
+    discord.Emoji, discord.state.ConnectionState, type, types.ModuleType, types.FunctionType, types.MethodType
+)
+
+
+@dataclass
+class CachePolicy:
+    """How much of each guild the bot keeps in memory.
+
+    - full: discord.py's default; every member is cached and guilds are chunked at startup.
+    - lazy: every member is cached, but a guild is only chunked the first time something needs its member list.
+    - lean: only the bot, members in voice and the `recent_members` most recently active members of each
+      guild are cached; full member lists are requested when needed and not kept.
+
+    `messages` bounds discord.py's message cache (0 turns it off).
+    """
+    members: str = "full"
+    recent_members: int = 1000
+    messages: int = 1000
+
+    @classmethod
+    def from_env(cls) -> "CachePolicy":
+        members = os.getenv("MEMBER_CACHE", "full").lower()
+        if members not in MEMBER_POLICIES:
+            raise ValueError(f"MEMBER_CACHE must be one of {', '.join(MEMBER_POLICIES)}, not {members!r}")
+        return cls(
+            members=members,
+            recent_members=int(os.getenv("MEMBER_RECENT_LIMIT", 1000)),
+            messages=int(os.getenv("MESSAGE_CACHE_SIZE", 1000))
+        )
+
+    def client_options(self) -> dict:
+        """Keyword arguments for the bot's constructor"""
+        return {
+            "member_cache_flags": (
+                discord.MemberCacheFlags(voice=True, joined=False) if self.members == "lean"
+                else discord.MemberCacheFlags.all()
+            ),
+            "chunk_guilds_at_startup": self.members == "full",
+            "max_messages": self.messages or None
+        }
+
+
+def _cache_member(guild: discord.Guild, member: discord.Member, cached: bool) -> bool:
+    """Add `member` to (or drop them from) the guild's member cache; False if this discord.py can't.
+
+    discord.py has no public way to cache a single member, so this uses the
+    private methods its own voice cache uses (hence the upper bound on
+    discord.py in requirements.txt). If a release renames them, the lean
+    policy quietly stops caching active members instead of failing.
+    """
+    method = getattr(guild, "_add_member" if cached else "_remove_member", None)
+    if method is None:
+        global _warned_private_api
+        if not _warned_private_api:
+            print(f"⚠️ discord.py {discord.__version__} has no Guild._add_member/_remove_member; "
+                  "recently active members won't be cached")
+            _warned_private_api = True
+        return False
+    method(member)
+    return True
+
+
+class MemberCache:
+    """Member lookups that work under every `CachePolicy`, plus the lean policy's recently-active LRU.
+
+    Under the lean policy, members seen in a message, reaction, interaction
+    or join are added to the guild's member cache; once a guild has more
+    than `recent_members` of them, the least recently active are evicted
+    (unless they're in voice, which discord.py caches on its own). Cached
+    members are kept up to date by the gateway like any other.
+    """
+
+    def __init__(self, policy: CachePolicy):
+        self.policy = policy
+        self._recent = defaultdict(OrderedDict)  # guild ID -> member IDs, least recently active first
+        self.hits = 0
+        self.fetches = 0
+        self.chunks = 0
+        self.evictions = 0
+
+    @property
+    def lean(self) -> bool:
+        return self.policy.members == "lean"
+
+    def recent_count(self, guild_id: int) -> int:
+        return len(self._recent.get(guild_id, ()))
+
+    def touch(self, member):
+        """Note that `member` was just active; under the lean policy this caches them"""
+        if not self.lean or not isinstance(member, discord.Member):
+            return
+        guild = member.guild
+        recent = self._recent[guild.id]
+        recent[member.id] = None
+        recent.move_to_end(member.id)
+        if guild.get_member(member.id) is None:
+            _cache_member(guild, member, True)
+        while len(recent) > self.policy.recent_members:
+            user_id, _ = recent.popitem(last=False)
+            evicted = guild.get_member(user_id)
+            if evicted is not None and evicted.voice is None and evicted != guild.me:
+                if _cache_member(guild, evicted, False):
+                    self.evictions += 1
+
+    def forget(self, guild_id: int, user_id: int = None):
+        """Drop a member (or a whole guild) from the LRU after they left"""
+        if user_id is None:
+            self._recent.pop(guild_id, None)
+        elif guild_id in self._recent:
+            self._recent[guild_id].pop(user_id, None)
+
+    async def fetch(self, guild: discord.Guild, user_id: int):
+        """The cached member, else one API lookup; None if they aren't in the server"""
+        member = guild.get_member(user_id)
+        if member is not None:
+            self.hits += 1
+            return member
+        self.fetches += 1
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            return None
+        self.touch(member)
+        return member
+
+    async def members(self, guild: discord.Guild) -> list:
+        """Every member of `guild`, chunking it on first need (under the lean policy, each time and uncached)"""
+        if guild.chunked:
+            return guild.members
+        self.chunks += 1
+        return await guild.chunk(cache=not self.lean)
+
+
+def _deep_sizeof(obj, seen: set, shared: tuple) -> int:
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        children = [*obj.keys(), *obj.values()]
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        children = obj
+    else:
+        children = [getattr(obj, slot, None) for cls in type(obj).__mro__ for slot in getattr(cls, "__slots__", ())]
+        if hasattr(obj, "__dict__"):
+            children.append(vars(obj))
+    return size + sum(_deep_sizeof(child, seen, shared) for child in children if not isinstance(child, shared))
+
+
+def estimate_size(objects: list, total: int, shared: tuple = _SHARED) -> int:
+    """Approximate bytes held by `total` objects like the sample in `objects`, not counting `shared` ones"""
+    sample = objects[:SIZE_SAMPLE]
+    if not sample:
+        return 0
+    measured = sum(_deep_sizeof(obj, set(), shared) for obj in sample)
+    return measured * total // len(sample)
+
+
+async def cache_footprint(bot) -> list:
+    """Per-guild cache usage, largest first: members, recently active, messages and approximate bytes.
+
+    Each guild's measurement is bounded by `SIZE_SAMPLE`, and the event loop
+    gets a turn between guilds. The objects are live gateway state, so they
+    are measured on the loop rather than in a thread.
+    """
+    messages = defaultdict(list)
+    for message in bot.cached_messages:
+        if message.guild is not None:
+            messages[message.guild.id].append(message)
+
+    rows = []
+    for guild in bot.guilds:
+        members, found = guild.members, messages.get(guild.id, [])
+        rows.append({
+            "guild": guild,
+            "members": len(members),
+            "member_count": guild.member_count,
+            "recent": bot.member_cache.recent_count(guild.id),
+            "messages": len(found),
+            "bytes": (
+                estimate_size(members, len(members))
+                # Authors are counted with the members (or belong to the client's user cache)
+                + estimate_size(found, len(found), (*_SHARED, discord.Member, discord.User))
+            )
+        })
+        await asyncio.sleep(0)
+    rows.sort(key=lambda row: row["bytes"], reverse=True)
+    return rows
+
+
+def resident_memory():
+    """This process's resident set size in bytes (None where /proc isn't available)"""
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
@@ -0,0 +1,119 @@
+# utils/mod_config.py
+import asyncio
+from dataclasses import asdict, dataclass, field
+
+import discord
+
+from utils.cluster import CLUSTER
+from utils.files import load_json, merge_write_json
+
+
+@dataclass
+class GuildModConfig:
+    mute_role_id: int = None
+    log_channel_id: int = None
+    staff_role_ids: list = field(default_factory=list)
+
+
+class ModConfigRegistry:
+    """Per-guild moderation settings, built lazily and kept in sync from gateway events.
+
+    A guild's entry is created on first use by looking up the default role
+    and channel names once; afterwards commands only do ID lookups. Event
+    handlers fill in or clear IDs as roles and channels come and go, and
+    every change is persisted to a JSON file.
+    """
+
+    def __init__(self, path: str = "moderation_config.json", *, mute_role_name: str = "Muted",
+                 log_channel_name: str = "mod-logs"):
+        self.path = path
+        self.mute_role_name = mute_role_name
+        self.log_channel_name = log_channel_name
+        self._configs = {}
+
+    def load(self):
+        for guild_id, data in load_json(self.path, {}).items():
+            self._configs[int(guild_id)] = GuildModConfig(**data)
+
+    async def save(self):
+        data = {
+            str(guild_id): asdict(config)
+            for guild_id, config in self._configs.items() if CLUSTER.owns_guild(guild_id)
+        }
+        await asyncio.to_thread(merge_write_json, self.path, data, lambda key: CLUSTER.owns_guild(int(key)))
+
+    async def get(self, guild: discord.Guild) -> GuildModConfig:
+        config = self._configs.get(guild.id)
+        if config is None:
+            mute_role = discord.utils.get(guild.roles, name=self.mute_role_name)
+            log_channel = discord.utils.get(guild.text_channels, name=self.log_channel_name)
+            config = self._configs[guild.id] = GuildModConfig(
+                mute_role_id=mute_role.id if mute_role else None,
+                log_channel_id=log_channel.id if log_channel else None
+            )
+            await self.save()
+        return config
+
+    def peek(self, guild_id: int):
+        """Config if already built, without building it"""
+        return self._configs.get(guild_id)
+
+    async def mute_role(self, guild: discord.Guild):
+        config = await self.get(guild)
+        return guild.get_role(config.mute_role_id) if config.mute_role_id else None
+
+    async def log_channel(self, guild: discord.Guild):
+        config = await self.get(guild)
+        return guild.get_channel(config.log_channel_id) if config.log_channel_id else None
+
+    async def update(self, guild: discord.Guild, **changes):
+        config = await self.get(guild)
+        for key, value in changes.items():
+            setattr(config, key, value)
+        await self.save()
+        return config
+
+    # Gateway event hooks -------------------------------------------------
+
+    async def role_created(self, role: discord.Role):
+        config = self.peek(role.guild.id)
+        if config and config.mute_role_id is None and role.name == self.mute_role_name:
+            config.mute_role_id = role.id
+            await self.save()
+
+    async def role_updated(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name:
+            await self.role_created(after)
+
+    async def role_deleted(self, role: discord.Role):
+        config = self.peek(role.guild.id)
+        if config is None:
+            return
+        changed = False
+        if config.mute_role_id == role.id:
+            replacement = discord.utils.get(role.guild.roles, name=self.mute_role_name)
+            config.mute_role_id = replacement.id if replacement and replacement.id != role.id else None
+            changed = True
+        if role.id in config.staff_role_ids:
+            config.staff_role_ids.remove(role.id)
+            changed = True
+        if changed:
+            await self.save()
+
+    async def channel_created(self, channel):
+        config = self.peek(channel.guild.id)
+        if (config and config.log_channel_id is None and isinstance(channel, discord.TextChannel)
+                and channel.name == self.log_channel_name):
+            config.log_channel_id = channel.id
+            await self.save()
+
+    async def channel_updated(self, before, after):
+        if before.name != after.name:
+            await self.channel_created(after)
+
+    async def channel_deleted(self, channel):
+        config = self.peek(channel.guild.id)
+        if config and config.log_channel_id == channel.id:
+            replacement = discord.utils.get(channel.guild.text_channels, name=self.log_channel_name)
+            config.log_channel_id = replacement.id if replacement and replacement.id != channel.id else None
+            await self.save()
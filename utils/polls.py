@@ -0,0 +1,139 @@
+# utils/polls.py
+import discord
+
+POLL_EMOJIS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"]
+
+
+class Poll:
+    """Live vote tally for one poll message, updated in O(1) per reaction event.
+
+    In single-vote mode each user's most recent reaction is the one that
+    counts; removing it falls back to their previous, still-present reaction.
+    """
+
+    def __init__(self, message_id: int, channel_id: int, question: str, options: list, author_name: str,
+                 *, single_vote: bool = True, closes_at: float = None):
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.question = question
+        self.options = list(options)
+        self.author_name = author_name
+        self.single_vote = single_vote
+        self.closes_at = closes_at
+        self.counts = [0] * len(self.options)
+        self.reactions = {}   # user ID -> option indexes the user reacted with, oldest first
+        self.closed = False
+        self.emoji_index = {emoji: index for index, emoji in enumerate(POLL_EMOJIS[:len(self.options)])}
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def add_vote(self, user_id: int, emoji: str) -> bool:
+        """Record a reaction; returns True if the tally changed"""
+        index = self.emoji_index.get(emoji)
+        if index is None or self.closed:
+            return False
+        reacted = self.reactions.setdefault(user_id, [])
+        if index in reacted:
+            return False
+        if self.single_vote and reacted:
+            self.counts[reacted[-1]] -= 1
+        reacted.append(index)
+        self.counts[index] += 1
+        return True
+
+    def remove_vote(self, user_id: int, emoji: str) -> bool:
+        """Undo a reaction; returns True if the tally changed"""
+        index = self.emoji_index.get(emoji)
+        reacted = self.reactions.get(user_id)
+        if index is None or self.closed or not reacted or index not in reacted:
+            return False
+
+        counted = reacted[-1] == index or not self.single_vote
+        reacted.remove(index)
+        if counted:
+            self.counts[index] -= 1
+            if self.single_vote and reacted:
+                self.counts[reacted[-1]] += 1
+        if not reacted:
+            del self.reactions[user_id]
+        return counted
+
+    def click(self, user_id: int, emoji: str) -> bool:
+        """Toggle a button vote; returns True if the user now votes for the option, False if they withdrew it.
+
+        Buttons have no reaction history to fall back on: in single-vote mode
+        clicking the counted option withdraws the vote, and clicking any other
+        option moves it there.
+        """
+        index = self.emoji_index[emoji]
+        reacted = self.reactions.get(user_id, [])
+        if self.single_vote:
+            current = reacted[-1] if reacted else None
+            if current is not None:
+                self.counts[current] -= 1
+            if current == index:
+                self.reactions.pop(user_id, None)
+                return False
+            self.reactions[user_id] = [index]
+        else:
+            if index in reacted:
+                self.counts[index] -= 1
+                reacted.remove(index)
+                if not reacted:
+                    del self.reactions[user_id]
+                return False
+            self.reactions.setdefault(user_id, []).append(index)
+        self.counts[index] += 1
+        return True
+
+    def to_embed(self) -> discord.Embed:
+        total = self.total
+        lines = []
+        for index, option in enumerate(self.options):
+            share = self.counts[index] / total if total else 0
+            bar = "▰" * round(share * 10) + "▱" * (10 - round(share * 10))
+            lines.append(f"{POLL_EMOJIS[index]} {option}\n{bar} {self.counts[index]} ({share:.0%})")
+
+        embed = discord.Embed(
+            title=f"📊 {self.question}" if not self.closed else f"🔒 {self.question}",
+            description="\n".join(lines),
+            color=0x7289DA if not self.closed else 0x99AAB5
+        )
+        footer = f"Poll by {self.author_name} · {total} vote{'s' if total != 1 else ''}"
+        if self.closed:
+            footer += " · Closed"
+        elif self.single_vote:
+            footer += " · One vote per person"
+        embed.set_footer(text=footer)
+        if self.closes_at and not self.closed:
+            embed.add_field(name="Closes", value=f"<t:{int(self.closes_at)}:R>", inline=False)
+        return embed
+
+
+class PollButtons(discord.ui.View):
+    """One button per option; clicking toggles the user's vote (see `Poll.click`) without any reaction seeding"""
+
+    def __init__(self, poll: Poll, on_change, *, timeout: float = None):
+        super().__init__(timeout=timeout)
+        self.poll = poll
+        self.on_change = on_change
+        for emoji, option in zip(POLL_EMOJIS, poll.options):
+            button = discord.ui.Button(emoji=emoji, label=option[:80], style=discord.ButtonStyle.secondary)
+            button.callback = self._make_callback(emoji)
+            self.add_item(button)
+
+    def _make_callback(self, emoji: str):
+        async def callback(interaction: discord.Interaction):
+            poll = self.poll
+            if poll.closed:
+                return await interaction.response.send_message("🔒 This poll is closed.", ephemeral=True)
+            option = poll.options[poll.emoji_index[emoji]]
+            if poll.click(interaction.user.id, emoji):
+                reply = f"✅ You voted for **{option}**."
+            else:
+                reply = f"↩️ Your vote for **{option}** was removed."
+            await interaction.response.send_message(reply, ephemeral=True)
+            self.on_change(poll)
+        return callback
@@ -0,0 +1,134 @@
+# utils/purge.py
+import asyncio
+from dataclasses import dataclass
+from datetime import timedelta
+
+import discord
+
+BULK_DELETE_BATCH = 100
+# Discord refuses to bulk-delete messages older than 14 days; keep a margin for slow scans
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=10)
+
+
+@dataclass
+class PurgeStats:
+    scanned: int = 0
+    matched: int = 0
+    deleted: int = 0
+    failed: int = 0
+    cancelled: bool = False
+
+    def progress(self) -> str:
+        return f"scanned {self.scanned}, deleted {self.deleted}/{self.matched}" + (
+            f", {self.failed} failed" if self.failed else "")
+
+
+class PurgeEngine:
+    """Stream a channel's history and delete the messages `check` accepts.
+
+    History is read page by page and matches are deleted as they are found, so
+    memory stays bounded by one bulk-delete batch plus the single-delete
+    backlog however many messages are scanned. Messages younger than 14 days
+    go out in bulk-delete batches of 100; older ones are handed to a throttled
+    single-delete lane. Stops after `limit` matches, `scan_limit` scanned
+    messages, or `cancel()`.
+    """
+
+    def __init__(self, channel, check, *, limit: int, scan_limit: int, before=None,
+                 single_delete_interval: float = 1.0, on_progress=None, progress_interval: float = 2.0):
+        self.channel = channel
+        self.check = check
+        self.limit = limit
+        self.scan_limit = scan_limit
+        self.before = before
+        self.single_delete_interval = single_delete_interval
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.stats = PurgeStats()
+        self._cancelled = asyncio.Event()
+
+    def cancel(self):
+        self.stats.cancelled = True
+        self._cancelled.set()
+
+    async def _bulk_delete(self, batch: list):
+        try:
+            await self.channel.delete_messages(batch)
+            self.stats.deleted += len(batch)
+        except discord.HTTPException as e:
+            self.stats.failed += len(batch)
+            print(f"❌ Bulk delete of {len(batch)} messages failed: {e}")
+
+    async def _single_delete_lane(self, queue: asyncio.Queue):
+        while (message := await queue.get()) is not None:
+            if self._cancelled.is_set():
+                continue  # drain without deleting so the scanner never blocks on a full queue
+            try:
+                await message.delete()
+                self.stats.deleted += 1
+            except discord.NotFound:
+                self.stats.matched -= 1  # already gone
+            except discord.HTTPException:
+                self.stats.failed += 1
+            await asyncio.sleep(self.single_delete_interval)
+
+    async def _report_progress(self):
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            try:
+                await self.on_progress(self.stats)
+            except discord.HTTPException:
+                pass
+
+    async def run(self) -> PurgeStats:
+        stats = self.stats
+        old_messages = asyncio.Queue(BULK_DELETE_BATCH)
+        lane = asyncio.create_task(self._single_delete_lane(old_messages))
+        progress = asyncio.create_task(self._report_progress()) if self.on_progress else None
+        batch = []
+        try:
+            async for message in self.channel.history(limit=self.scan_limit, before=self.before):
+                if self._cancelled.is_set():
+                    break
+                stats.scanned += 1
+                if not self.check(message):
+                    continue
+                stats.matched += 1
+                if message.created_at > discord.utils.utcnow() - BULK_DELETE_MAX_AGE:
+                    batch.append(message)
+                    if len(batch) == BULK_DELETE_BATCH:
+                        await self._bulk_delete(batch)
+                        batch = []
+                else:
+                    await old_messages.put(message)
+                if stats.matched >= self.limit:
+                    break
+
+            if batch and not self._cancelled.is_set():
+                await self._bulk_delete(batch)
+            await old_messages.put(None)
+            await lane
+        finally:
+            lane.cancel()
+            if progress:
+                progress.cancel()
+                await asyncio.gather(progress, return_exceptions=True)
+        return stats
+
+
+class CancelView(discord.ui.View):
+    """A single Cancel button that only `owner_id` may press"""
+
+    def __init__(self, owner_id: int, on_cancel, *, timeout: float = None):
+        super().__init__(timeout=timeout)
+        self.owner_id = owner_id
+        self.on_cancel = on_cancel
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.owner_id
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.danger)
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.on_cancel()
+        button.disabled = True
+        await interaction.response.edit_message(view=self)
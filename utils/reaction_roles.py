@@ -0,0 +1,110 @@
+# utils/reaction_roles.py
+import asyncio
+from dataclasses import asdict, dataclass
+
+from utils.cluster import CLUSTER
+from utils.files import atomic_write_json, file_lock, load_json
+
+
+@dataclass
+class ReactionRole:
+    message_id: int
+    emoji: str
+    role_id: int = None
+    guild_id: int = None
+    channel_id: int = None
+    role_name: str = None  # Set for bindings that follow a role by name (re-resolved if it is replaced)
+
+
+class ReactionRoleIndex:
+    """In-memory `message_id -> {emoji: ReactionRole}` index with write-through JSON persistence.
+
+    Loaded once; every change is written to a temp file and atomically
+    swapped in. Events for unrelated messages are rejected by the first
+    dict lookup.
+    """
+
+    def __init__(self, path: str = "reaction_roles.json"):
+        self.path = path
+        self._by_message = {}
+        self._save_lock = asyncio.Lock()  # keeps snapshots hitting the file in the order they were taken
+
+    def __len__(self):
+        return sum(len(emojis) for emojis in self._by_message.values())
+
+    def __contains__(self, message_id: int):
+        return message_id in self._by_message
+
+    def bindings(self):
+        for emojis in self._by_message.values():
+            yield from emojis.values()
+
+    def load(self):
+        data = load_json(self.path, {})
+        for entry in data.get("bindings", []):
+            binding = ReactionRole(**entry)
+            self._by_message.setdefault(binding.message_id, {})[binding.emoji] = binding
+
+    def _write(self, mine: list):
+        # Other worker processes own the bindings of guilds on their shards; keep theirs as on disk
+        with file_lock(self.path):
+            on_disk = load_json(self.path, {}).get("bindings", [])
+            kept = [entry for entry in on_disk if not self._owns(entry.get("guild_id"))]
+            atomic_write_json(self.path, {"bindings": kept + mine})
+
+    @staticmethod
+    def _owns(guild_id) -> bool:
+        return guild_id is None or CLUSTER.owns_guild(guild_id)
+
+    async def save(self):
+        async with self._save_lock:
+            # Snapshot on the event loop; the index keeps changing while the thread writes
+            mine = [asdict(b) for b in self.bindings() if self._owns(b.guild_id)]
+            await asyncio.to_thread(self._write, mine)
+
+    def get(self, message_id: int, emoji: str):
+        emojis = self._by_message.get(message_id)
+        return emojis.get(emoji) if emojis else None
+
+    def for_guild(self, guild_id: int) -> list:
+        return [b for b in self.bindings() if b.guild_id == guild_id]
+
+    def by_name(self, role_name: str) -> list:
+        return [b for b in self.bindings() if b.role_name == role_name]
+
+    async def bind(self, binding: ReactionRole):
+        self._by_message.setdefault(binding.message_id, {})[binding.emoji] = binding
+        await self.save()
+
+    async def unbind(self, message_id: int, emoji: str) -> bool:
+        emojis = self._by_message.get(message_id)
+        if not emojis or emojis.pop(emoji, None) is None:
+            return False
+        if not emojis:
+            del self._by_message[message_id]
+        await self.save()
+        return True
+
+    async def forget_message(self, message_id: int) -> int:
+        emojis = self._by_message.pop(message_id, None)
+        if emojis:
+            await self.save()
+        return len(emojis or ())
+
+    async def forget_role(self, role_id: int) -> int:
+        """Drop bindings to a deleted role; name-following bindings just lose their resolved ID"""
+        changed = 0
+        for message_id, emojis in list(self._by_message.items()):
+            for emoji, binding in list(emojis.items()):
+                if binding.role_id != role_id:
+                    continue
+                if binding.role_name:
+                    binding.role_id = None
+                else:
+                    del emojis[emoji]
+                changed += 1
+            if not emojis:
+                del self._by_message[message_id]
+        if changed:
+            await self.save()
+        return changed
@@ -0,0 +1,151 @@
+# utils/reminder_store.py
+import asyncio
+import sqlite3
+from dataclasses import dataclass
+
+NO_CURSOR = 2 ** 63 - 1  # larger than any reminder ID: `(start, NO_CURSOR)` means "due after start"
+
+
+@dataclass
+class Reminder:
+    id: int
+    user_id: int
+    channel_id: int
+    message: str
+    due: float  # epoch seconds
+
+
+class ReminderStore:
+    """SQLite (WAL) reminder store with batched write-behind.
+
+    `add`/`delete` only queue the change; a background flusher commits queued
+    changes in one transaction every `flush_interval` seconds or once
+    `batch_size` changes are waiting. Reads flush first so they see
+    everything the bot has accepted.
+    """
+
+    def __init__(self, path: str = "reminders.db", *, flush_interval: float = 1.0, batch_size: int = 500):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._pending = {}   # reminder ID -> Reminder to upsert, or None to delete
+        self._flush_now = asyncio.Event()
+        self._flusher = None
+        self.max_id = 0
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS reminders ("
+            "id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, channel_id INTEGER NOT NULL, "
+            "message TEXT NOT NULL, due REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS reminders_due ON reminders (due)")
+        conn.execute("CREATE INDEX IF NOT EXISTS reminders_user ON reminders (user_id, due)")
+        conn.commit()
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM reminders").fetchone()[0]
+        return conn, max_id
+
+    async def open(self):
+        self._conn, self.max_id = await asyncio.to_thread(self._open)
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+        if self._conn:
+            await asyncio.to_thread(self._conn.close)
+            self._conn = None
+
+    def add(self, reminder: Reminder):
+        self.max_id = max(self.max_id, reminder.id)
+        self._queue(reminder.id, reminder)
+
+    def delete(self, reminder_id: int):
+        self._queue(reminder_id, None)
+
+    def _queue(self, reminder_id: int, reminder):
+        self._pending[reminder_id] = reminder
+        if len(self._pending) >= self.batch_size:
+            self._flush_now.set()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            await self.flush()
+
+    def _write(self, batch: dict):
+        upserts = [(r.id, r.user_id, r.channel_id, r.message, r.due) for r in batch.values() if r is not None]
+        deletes = [(reminder_id,) for reminder_id, r in batch.items() if r is None]
+        with self._conn:
+            if upserts:
+                self._conn.executemany("INSERT OR REPLACE INTO reminders VALUES (?, ?, ?, ?, ?)", upserts)
+            if deletes:
+                self._conn.executemany("DELETE FROM reminders WHERE id = ?", deletes)
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending or self._conn is None:
+                return
+            batch, self._pending = self._pending, {}
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except sqlite3.Error as e:
+                print(f"❌ Failed to persist reminders: {e}")
+                for reminder_id, reminder in batch.items():
+                    self._pending.setdefault(reminder_id, reminder)
+
+    async def _query(self, sql: str, params: tuple) -> list:
+        await self.flush()
+        async with self._lock:
+            rows = await asyncio.to_thread(lambda: self._conn.execute(sql, params).fetchall())
+        return [Reminder(*row) for row in rows]
+
+    async def due_between(self, start: float, end: float, limit: int = 10000, after_id: int = NO_CURSOR) -> list:
+        """Reminders with (start, after_id) < (due, id) and due <= end, soonest first.
+
+        Pass the last row's `(due, id)` as `(start, after_id)` to fetch the
+        next page; reminders sharing a due time with it aren't skipped.
+        """
+        return await self._query(
+            "SELECT id, user_id, channel_id, message, due FROM reminders "
+            "WHERE (due, id) > (?, ?) AND due <= ? ORDER BY due, id LIMIT ?",
+            (start, after_id, end, limit)
+        )
+
+    async def for_user(self, user_id: int, limit: int = 21) -> list:
+        return await self._query(
+            "SELECT id, user_id, channel_id, message, due FROM reminders "
+            "WHERE user_id = ? ORDER BY due LIMIT ?",
+            (user_id, limit)
+        )
+
+    async def existing(self, reminder_ids: list) -> set:
+        """Which of `reminder_ids` are still stored (another worker process may have deleted some)"""
+        await self.flush()
+        found = set()
+        async with self._lock:
+            for start in range(0, len(reminder_ids), 500):
+                chunk = reminder_ids[start:start + 500]
+                sql = f"SELECT id FROM reminders WHERE id IN ({', '.join('?' * len(chunk))})"
+                rows = await asyncio.to_thread(lambda: self._conn.execute(sql, chunk).fetchall())
+                found.update(row[0] for row in rows)
+        return found
+
+    async def get(self, reminder_id: int):
+        rows = await self._query(
+            "SELECT id, user_id, channel_id, message, due FROM reminders WHERE id = ?",
+            (reminder_id,)
+        )
+        return rows[0] if rows else None
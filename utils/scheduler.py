@@ -0,0 +1,219 @@
+# utils/scheduler.py
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+
+INTERACTIVE = 0   # A user is waiting on the answer
+BACKGROUND = 10   # Cache refreshes, prefetches, pollers
+
+
+class TokenBucket:
+    """Per-minute request budget, corrected from the API's own quota headers"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = max(1, per_minute)
+        self.tokens = float(self.capacity)
+        self.refill_rate = self.capacity / 60
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token can be taken (0 if one is available now)"""
+        self._refill()
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.refill_rate
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return 0.0 if time.monotonic() < self.blocked_until else self.tokens
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+    def update(self, available: int = None, reset: float = None):
+        """Sync with `X-Requests-Available-Minute` / `X-RequestCounter-Reset`"""
+        self._refill()
+        if available is not None:
+            self.tokens = min(self.tokens, float(available))
+            if available <= 0 and reset is not None:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + reset)
+
+    def block(self, seconds: float):
+        """Stop issuing requests for `seconds` (e.g. after a 429)"""
+        self._refill()
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+@dataclass
+class _Job:
+    call: object
+    priority: int
+    future: asyncio.Future
+    attempts: int = 0
+    queued: bool = True
+
+
+@dataclass(order=True)
+class _QueueItem:
+    priority: int
+    seq: int
+    key: str = field(compare=False)
+
+
+class RequestScheduler:
+    """Singleflight + token bucket + priority queue in front of an HTTP client.
+
+    Concurrent `submit` calls with the same key share one upstream request.
+    Queued jobs are dispatched in priority order as the token bucket allows,
+    and HTTP 429 responses are retried with exponential backoff.
+    """
+
+    def __init__(self, *, per_minute: int = 10, max_retries: int = 3, base_backoff: float = 2.0,
+                 max_backoff: float = 60.0):
+        self.bucket = TokenBucket(per_minute)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._jobs = {}
+        self._queue = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._dispatcher = None
+        self._running = set()
+        self.coalesced = 0
+        self.retries = 0
+        self.rate_limited = 0
+
+    def start(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def close(self):
+        tasks = [t for t in (self._dispatcher, *self._running) if t]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self._jobs.values():
+            if not job.future.done():
+                job.future.cancel()
+        self._jobs.clear()
+        self._queue.clear()
+        self._dispatcher = None
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.queued)
+
+    async def submit(self, key: str, call, *, priority: int = INTERACTIVE):
+        """Run `call()` for `key`, sharing the result with identical in-flight submissions"""
+        self.start()
+        job = self._jobs.get(key)
+        if job:
+            self.coalesced += 1
+            if job.queued and priority < job.priority:
+                job.priority = priority
+                self._enqueue(key, job)
+        else:
+            job = _Job(call, priority, asyncio.get_running_loop().create_future())
+            self._jobs[key] = job
+            self._enqueue(key, job)
+        # Shield so one cancelled waiter doesn't cancel the shared request
+        return await asyncio.shield(job.future)
+
+    def _enqueue(self, key: str, job: _Job):
+        job.queued = True
+        heapq.heappush(self._queue, _QueueItem(job.priority, next(self._seq), key))
+        self._wakeup.set()
+
+    def _pop(self):
+        """Pop the best live queue item, skipping entries superseded by a priority bump"""
+        while self._queue:
+            item = heapq.heappop(self._queue)
+            job = self._jobs.get(item.key)
+            if job and job.queued and job.priority == item.priority:
+                return item.key, job
+        return None, None
+
+    async def _dispatch(self):
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            delay = self.bucket.delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            key, job = self._pop()
+            if job is None:
+                continue
+            job.queued = False
+            self.bucket.take()
+            task = asyncio.create_task(self._execute(key, job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _execute(self, key: str, job: _Job):
+        try:
+            response = await job.call()
+        except Exception as e:
+            self._finish(key, job, exception=e)
+            return
+
+        headers = response.headers
+        available = headers.get("X-Requests-Available-Minute")
+        reset = headers.get("X-RequestCounter-Reset")
+        self.bucket.update(
+            int(available) if available is not None and available.isdigit() else None,
+            float(reset) if reset is not None and reset.isdigit() else None
+        )
+
+        if response.status == 429:
+            self.rate_limited += 1
+            if job.attempts < self.max_retries:
+                job.attempts += 1
+                self.retries += 1
+                retry_after = headers.get("Retry-After") or reset
+                backoff = min(self.max_backoff, self.base_backoff * 2 ** (job.attempts - 1))
+                if retry_after is not None and retry_after.isdigit():
+                    backoff = max(backoff, float(retry_after))
+                self.bucket.block(backoff)
+                self._enqueue(key, job)
+                return
+        self._finish(key, job, result=response)
+
+    def _finish(self, key: str, job: _Job, result=None, exception=None):
+        if self._jobs.get(key) is job:
+            del self._jobs[key]
+        if job.future.done():
+            return
+        if exception is not None:
+            job.future.set_exception(exception)
+            # Mark retrieved so a job with no remaining waiters doesn't log a warning
+            job.future.exception()
+        else:
+            job.future.set_result(result)
+
+    def summary(self) -> dict:
+        return {
+            "queued": self.pending,
+            "in_flight": len(self._running),
+            "tokens": round(self.bucket.available, 1),
+            "coalesced": self.coalesced,
+            "rate_limited": self.rate_limited,
+            "retries": self.retries
+        }
@@ -0,0 +1,73 @@
+# utils/senders.py
+import asyncio
+
+_STOP = object()  # queued by `close`: exit once everything ahead of it is sent
+
+
+class ChannelSendQueue:
+    """Per-channel FIFO send queues drained by one worker per channel.
+
+    Channels are served in parallel, messages within a channel in order.
+    Workers exit after `idle_timeout` seconds without work and are
+    recreated on the next `submit`.
+    """
+
+    def __init__(self, send, *, maxsize: int = 100, idle_timeout: float = 60):
+        self._send = send
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._queues = {}
+        self._workers = {}
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, channel_id: int, item) -> bool:
+        """Queue `item` for `channel_id`; returns False (and drops it) if that channel is backed up"""
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = self._queues[channel_id] = asyncio.Queue(self.maxsize)
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        worker = self._workers.get(channel_id)
+        if worker is None or worker.done():
+            self._workers[channel_id] = asyncio.create_task(self._drain(channel_id, queue))
+        return True
+
+    async def _drain(self, channel_id: int, queue: asyncio.Queue):
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                if queue.empty():
+                    self._queues.pop(channel_id, None)
+                    self._workers.pop(channel_id, None)
+                    return
+                continue
+            if item is _STOP:
+                return
+            try:
+                await self._send(channel_id, item)
+                self.sent += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"❌ Failed to send to channel {channel_id}: {e}")
+
+    async def close(self, timeout: float = 0):
+        """Stop every worker, first giving them up to `timeout` seconds to send what's already queued"""
+        workers = [worker for worker in self._workers.values() if not worker.done()]
+        if timeout > 0 and workers:
+            for channel_id, queue in self._queues.items():
+                try:
+                    queue.put_nowait(_STOP)
+                except asyncio.QueueFull:
+                    pass  # a backed-up channel is cut off at the timeout like any other
+            await asyncio.wait(workers, timeout=timeout)
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
@@ -0,0 +1,106 @@
+# utils/snapshots.py
+import asyncio
+import json
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+
+
+@dataclass
+class Snapshot:
+    payload: object
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+
+class SnapshotStore:
+    """Last good API payload per endpoint, persisted to SQLite.
+
+    Rows are read lazily into memory on first access; writes update memory
+    immediately and are flushed to disk in batches by a background task.
+    """
+
+    def __init__(self, path: str = "football_snapshots.db", flush_interval: float = 5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._snapshots = {}
+        self._dirty = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._flusher = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "endpoint TEXT PRIMARY KEY, payload TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        return conn
+
+    # sqlite3's own context manager only commits or rolls back; `closing` releases the connection too
+    def _read_all(self) -> dict:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT endpoint, payload, fetched_at FROM snapshots").fetchall()
+        return {endpoint: Snapshot(json.loads(payload), fetched_at) for endpoint, payload, fetched_at in rows}
+
+    def _write(self, rows: list):
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO snapshots (endpoint, payload, fetched_at) VALUES (?, ?, ?)",
+                rows
+            )
+
+    async def load(self):
+        """Read every snapshot from disk once (idempotent)"""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            loaded = await asyncio.to_thread(self._read_all)
+            # Anything written before the load finished is newer than disk
+            loaded.update(self._snapshots)
+            self._snapshots = loaded
+            self._loaded = True
+
+    async def get(self, endpoint: str):
+        if not self._loaded:
+            await self.load()
+        return self._snapshots.get(endpoint)
+
+    def age(self, endpoint: str):
+        """Age in seconds of the stored payload, or None if there is none"""
+        snapshot = self._snapshots.get(endpoint)
+        return snapshot.age if snapshot else None
+
+    def put(self, endpoint: str, payload):
+        """Record a good payload; the disk write happens in the next batch"""
+        snapshot = Snapshot(payload, time.time())
+        self._snapshots[endpoint] = snapshot
+        self._dirty[endpoint] = snapshot
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self):
+        if not self._dirty:
+            return
+        batch, self._dirty = self._dirty, {}
+        rows = [(endpoint, json.dumps(s.payload), s.fetched_at) for endpoint, s in batch.items()]
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except sqlite3.Error as e:
+            print(f"❌ Failed to persist football snapshots: {e}")
+            for endpoint, snapshot in batch.items():
+                self._dirty.setdefault(endpoint, snapshot)
+
+    async def close(self):
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        await self.flush()
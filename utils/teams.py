@@ -0,0 +1,141 @@
+# utils/teams.py
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+# Club-type words that carry no identity ("Real Madrid CF" == "Real Madrid")
+STOPWORDS = {"fc", "cf", "afc", "sc", "cd", "ud", "sd", "rcd", "club", "de", "the"}
+
+
+def normalize(name: str) -> str:
+    """Lowercase, strip accents, punctuation, spaces and club-type suffixes"""
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    words = re.sub(r"[^a-z0-9]+", " ", name.lower()).split()
+    kept = [w for w in words if w not in STOPWORDS]
+    return "".join(kept or words)
+
+
+def trigrams(name: str) -> set:
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class TeamRecord:
+    key: str
+    id: int
+    color: int
+    league: str
+
+
+class TeamIndex:
+    """Prebuilt team-name index: exact hash map, prefix trie and trigram index.
+
+    Built once from the cog's `team_data` plus an alias table mapping a team
+    key to extra names. `resolve` tries exact, then unambiguous prefix, then
+    a confident trigram match; `suggest` ranks the closest names.
+    """
+
+    def __init__(self, team_data: dict, aliases: dict = None, *, min_similarity: float = 0.55):
+        self.min_similarity = min_similarity
+        self.teams = {}
+        self.names = {}
+        self.duplicate_ids = {}
+        self._trie = {}
+        self._trigrams = defaultdict(set)
+        self._trigram_counts = {}
+
+        ids = defaultdict(list)
+        for league in team_data.values():
+            for key, team in league["teams"].items():
+                self.teams[key] = TeamRecord(key, team["id"], team["color"], league["name"])
+                ids[team["id"]].append(key)
+                self._add_name(key, key)
+        for key, names in (aliases or {}).items():
+            if key not in self.teams:
+                print(f"⚠️ Alias table references unknown team: {key}")
+                continue
+            for name in names:
+                self._add_name(name, key)
+
+        self.duplicate_ids = {team_id: keys for team_id, keys in ids.items() if len(keys) > 1}
+        for team_id, keys in self.duplicate_ids.items():
+            print(f"⚠️ Duplicate team ID {team_id}: {', '.join(keys)}")
+
+    def __len__(self):
+        return len(self.teams)
+
+    def _add_name(self, name: str, key: str):
+        name = normalize(name)
+        if not name:
+            return
+        existing = self.names.get(name)
+        if existing and existing != key:
+            print(f"⚠️ Team name '{name}' is ambiguous: {existing}, {key}")
+            return
+        self.names[name] = key
+
+        node = self._trie
+        for char in name:
+            node = node.setdefault(char, {})
+            node.setdefault("", set()).add(key)
+
+        grams = trigrams(name)
+        self._trigram_counts[name] = len(grams)
+        for gram in grams:
+            self._trigrams[gram].add(name)
+
+    def _prefix_matches(self, name: str) -> set:
+        node = self._trie
+        for char in name:
+            node = node.get(char)
+            if node is None:
+                return set()
+        return node.get("", set())
+
+    def _ranked(self, name: str) -> list:
+        """(score, team key) pairs ordered best first, one per team"""
+        grams = trigrams(name)
+        overlap = Counter()
+        for gram in grams:
+            for candidate in self._trigrams.get(gram, ()):
+                overlap[candidate] += 1
+
+        best = {}
+        for candidate, shared in overlap.items():
+            score = 2 * shared / (len(grams) + self._trigram_counts[candidate])
+            key = self.names[candidate]
+            if score > best.get(key, 0):
+                best[key] = score
+        return sorted(((score, key) for key, score in best.items()), reverse=True)
+
+    def resolve(self, name: str):
+        """Return the TeamRecord for `name`, or None if it isn't confidently one team"""
+        name = normalize(name)
+        if not name:
+            return None
+
+        key = self.names.get(name)
+        if key:
+            return self.teams[key]
+
+        prefixed = self._prefix_matches(name)
+        if len(prefixed) == 1:
+            return self.teams[next(iter(prefixed))]
+
+        ranked = self._ranked(name)
+        if ranked and ranked[0][0] >= self.min_similarity:
+            runner_up = ranked[1][0] if len(ranked) > 1 else 0
+            if ranked[0][0] - runner_up >= 0.1:
+                return self.teams[ranked[0][1]]
+        return None
+
+    def suggest(self, name: str, limit: int = 3) -> list:
+        """Closest team records for a name that didn't resolve"""
+        name = normalize(name)
+        if not name:
+            return []
+        prefixed = sorted(self._prefix_matches(name))
+        ranked = [key for score, key in self._ranked(name) if key not in prefixed]
+        return [self.teams[key] for key in (prefixed + ranked)[:limit]]
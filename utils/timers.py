@@ -0,0 +1,115 @@
+# utils/timers.py
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class DeadlineScheduler:
+    """Min-heap of deadlines with a single sleeper task.
+
+    `schedule`/`cancel` are O(log n) / O(1) (cancelled heap entries are
+    skipped lazily and compacted when they pile up). The sleeper wakes
+    exactly at the earliest deadline, or early when something sooner is
+    scheduled, and hands every item due at that moment to `callback` as
+    one batch.
+    """
+
+    def __init__(self, callback, *, max_batch: int = 1000, clock=time.time):
+        self._callback = callback
+        self.max_batch = max_batch
+        self._clock = clock
+        self._heap = []
+        self._entries = {}   # key -> (due, seq, item)
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._sleeper = None
+        self._deliveries = set()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        return entry[2] if entry else None
+
+    def next_due(self):
+        """Earliest pending deadline, or None"""
+        self._discard_cancelled()
+        return self._heap[0][0] if self._heap else None
+
+    def schedule(self, key, due: float, item):
+        """Add or reschedule `key` to fire at `due` (epoch seconds)"""
+        seq = next(self._seq)
+        self._entries[key] = (due, seq, item)
+        heapq.heappush(self._heap, (due, seq, key))
+        if self._heap[0][1] == seq:
+            self._wakeup.set()
+
+    def cancel(self, key) -> bool:
+        if self._entries.pop(key, None) is None:
+            return False
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(due, seq, k) for k, (due, seq, _) in self._entries.items()]
+            heapq.heapify(self._heap)
+        return True
+
+    def _discard_cancelled(self):
+        heap = self._heap
+        while heap:
+            due, seq, key = heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == seq:
+                return
+            heapq.heappop(heap)
+
+    def start(self):
+        if self._sleeper is None or self._sleeper.done():
+            self._sleeper = asyncio.create_task(self._run())
+
+    async def close(self):
+        tasks = [t for t in (self._sleeper, *self._deliveries) if t]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._sleeper = None
+
+    async def _run(self):
+        while True:
+            self._discard_cancelled()
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - self._clock()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = self._clock()
+            batch = []
+            while self._heap and len(batch) < self.max_batch:
+                self._discard_cancelled()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, _, key = heapq.heappop(self._heap)
+                batch.append(self._entries.pop(key)[2])
+            if batch:
+                task = asyncio.create_task(self._deliver(batch))
+                self._deliveries.add(task)
+                task.add_done_callback(self._deliveries.discard)
+            # Let deliveries start before draining the next batch
+            await asyncio.sleep(0)
+
+    async def _deliver(self, batch: list):
+        try:
+            await self._callback(batch)
+        except Exception as e:
+            print(f"❌ Failed to deliver {len(batch)} scheduled item(s): {e}")